@@ -9,19 +9,32 @@ Workflow:
 
 import argparse
 import asyncio
+import hashlib
+import json
 import os
+import re
 import shutil
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 
 from dotenv import load_dotenv
 
-# Local imports
-from src.scrapers.base_scraper import ResearchAgent
+# Local imports (ResearchAgent/VectorStore pull in crawl4ai, chromadb and torch, so they are
+# imported inside the commands that need them to keep `search` via the daemon fast)
 from src.storage.db import DatabaseManager
-from src.processors.preprocess import build_document_for_embedding
-from src.vector_store.vector_store import VectorStore
+from src.storage.timestamps import utc_epoch
+from src.storage.watermarks import advance_watermarks, watermarks_to_save
+from src.processors.preprocess import build_document_for_embedding, document_hash, iter_document_chunks
+from src.processors.chunker import DEFAULT_MAX_TOKENS, DEFAULT_OVERLAP_TOKENS
+from src.vector_store.search_service import SearchDaemon, query_daemon, DEFAULT_HOST, DEFAULT_PORT
+from src.vector_store.hybrid import reciprocal_rank_fusion
+from src.vector_store.filters import build_where
+from src.vector_store.encoders import ENGINES as ENCODER_ENGINES
 from src.scrapers.social_scrapers import SocialScraper
+from src.storage.response_cache import ResponseCache
 from src.processors.validator import MarketValidator
 from src.utils.emailer import EmailClient
 
@@ -33,70 +46,194 @@ def ensure_directories(base_dir: Path) -> None:
 
 
 def cmd_ingest(args: argparse.Namespace) -> None:
+    from src.scrapers.base_scraper import ResearchAgent
+    from src.vector_store.vector_store import VectorStore, MODEL_NAME
+    from src.vector_store.batching import word_token_counter
+
     base_dir = Path(__file__).parent
     ensure_directories(base_dir)
 
     db_path = base_dir / "data" / "research.db"
     db = DatabaseManager(db_path=str(db_path))
-    agent = ResearchAgent(data_dir=str(base_dir / "data"))
-
-    print(f"\n=== INGEST: topic='{args.topic}' days={args.days} include_content={args.include_content} ===")
+    agent = ResearchAgent(data_dir=str(base_dir / "data"), crawl_concurrency=args.crawl_concurrency,
+                          crawl_timeout=args.crawl_timeout, use_feed_cache=not args.no_feed_cache)
+
+    print(f"\n=== INGEST: topic='{args.topic}' days={args.days} include_content={args.include_content} "
+          f"backfill={args.backfill} incremental={args.incremental} ===")
+    # High-water marks always advance on success; they only filter the scrape with --incremental
+    stored_watermarks = db.get_watermarks(args.topic)
+    scrape_watermarks = stored_watermarks if args.incremental else None
+    # In backfill mode HN is paged exhaustively below and streamed into the DB instead
+    sources = [s for s in agent.SOURCES if s != 'hackernews'] if args.backfill else None
     if args.include_content:
-        results = asyncio.run(agent.scrape_all_with_content(args.topic, args.days))
+        results = asyncio.run(agent.scrape_all_with_content(args.topic, args.days, parallel=args.parallel,
+                                                            source_timeout=args.source_timeout, sources=sources,
+                                                            watermarks=scrape_watermarks))
     else:
-        results = agent.scrape_all(args.topic, args.days)
-
-    # Persist metadata first
-    article_id_map = {}  # url -> article_id
-    for article in results.get('hackernews', []):
-        article_id_map[article['url']] = db.upsert_article(article, topic=args.topic)
+        results = agent.scrape_all(args.topic, args.days, parallel=args.parallel, source_timeout=args.source_timeout,
+                                   sources=sources, watermarks=scrape_watermarks)
+
+    run_stats = agent.feed_cache_stats(run_only=True)
+    if run_stats:
+        lifetime = agent.feed_cache_stats()
+        hits = sum(f['not_modified'] for f in run_stats)
+        saved = sum(f['bytes_saved'] for f in run_stats)
+        print(f"🗄️  Feed cache this run: {hits}/{sum(f['requests'] for f in run_stats)} not-modified hits "
+              f"across {len(run_stats)} feeds, {saved / 1024:.1f} KiB saved "
+              f"(cumulative: {sum(f['not_modified'] for f in lifetime)}/{sum(f['requests'] for f in lifetime)} hits, "
+              f"{sum(f['bytes_saved'] for f in lifetime) / 1024:.1f} KiB saved)")
+
+    # Persist metadata first (bulk upserts: one connection and transaction per batch)
+    pending_watermarks = dict(stored_watermarks)
+    # Watermark keys whose fetch failed or was partial this run: they keep their stored marks
+    incomplete_sources = set(results['metadata'].get('incomplete_sources', []))
+    article_id_map = db.bulk_upsert_articles(results.get('hackernews', []), topic=args.topic)  # url -> article_id
+    if args.backfill:
+        backfilled = 0
+        for batch in agent.iter_hackernews_backfill(args.topic, args.days, slice_hours=args.slice_hours,
+                                                    max_workers=args.backfill_workers,
+                                                    watermark=(scrape_watermarks or {}).get('hackernews'),
+                                                    incomplete_sources=incomplete_sources):
+            article_id_map.update(db.bulk_upsert_articles(batch, topic=args.topic))
+            pending_watermarks.update(advance_watermarks(pending_watermarks, batch))
+            backfilled += len(batch)
+        results['metadata']['total_articles'] += backfilled
+        print(f"💾 Streamed {backfilled} backfilled HN stories into the DB")
     for article in results.get('arxiv', []):
         # Use arxiv_url as canonical link if available
-        canonical = article.get('arxiv_url') or article.get('url')
-        article['url'] = canonical
-        article_id_map[article['url']] = db.upsert_article(article, topic=args.topic)
-    for article in results.get('rss', []):
-        article_id_map[article['url']] = db.upsert_article(article, topic=args.topic)
+        article['url'] = article.get('arxiv_url') or article.get('url')
+    article_id_map.update(db.bulk_upsert_articles(results.get('arxiv', []) + results.get('rss', []), topic=args.topic))
+    for key in ('hackernews', 'arxiv', 'rss'):
+        pending_watermarks.update(advance_watermarks(pending_watermarks, results.get(key, [])))
 
     # Persist crawled content if available
     crawled = results.get('crawled_content', {})
-    for url, content in crawled.items():
-        if not content.get('success'):
-            continue
-        article_id = article_id_map.get(url)
-        if article_id:
-            db.upsert_crawled_content(article_id=article_id, url=url, markdown=content.get('markdown_content', ''),
-                                      word_count=int(content.get('word_count', 0)),
-                                      crawled_at=content.get('crawled_at'))
-
-    # Build embeddings and index into Chroma
-    vs = VectorStore(persist_directory=str(base_dir / "vector_store"))
-    docs_to_index = []
-    metas_to_index = []
-    ids_to_index = []
-
-    rows = db.fetch_articles_for_embedding()
-    for row in rows:
-        doc_text = build_document_for_embedding(
-            title=row['title'] or '',
-            summary=row['description'] or row['abstract'] or '',
-            full_content=row['markdown_content'] or ''
-        )
-        if not doc_text.strip():
-            continue
-        docs_to_index.append(doc_text)
-        metas_to_index.append({
+    db.bulk_upsert_crawled_content(
+        {'article_id': article_id_map[url], 'url': url, 'markdown': content.get('markdown_content', ''),
+         'word_count': int(content.get('word_count', 0)), 'crawled_at': content.get('crawled_at')}
+        for url, content in crawled.items()
+        if content.get('success') and article_id_map.get(url)
+    )
+
+    # Build embeddings and index into Chroma (only new or changed documents unless --reindex)
+    vs = VectorStore(persist_directory=str(base_dir / "vector_store"),
+                     embedding_cache_dir=None if args.no_embedding_cache else str(base_dir / "data" / "embedding_cache"),
+                     backend=args.vector_backend, numpy_dtype=args.vector_dtype,
+                     token_budget=args.embed_token_budget,
+                     engine=args.encoder, encoder_dir=str(base_dir / "data" / "onnx"))
+    if args.reindex:
+        vs.reset()
+        db.reset_embedding_state()
+        print("♻️  Reindex requested: rebuilding vector store from scratch")
+    try:
+        # Chunk sizes are measured in the encoder's own word pieces
+        count_tokens = word_token_counter(vs.tokenizer)
+    except (ImportError, OSError) as e:
+        print(f"⚠️ Encoder tokenizer unavailable ({e}); estimating chunk sizes")
+        count_tokens = None
+
+    def parent_metadata(row):
+        # Filterable fields copied onto every chunk; part of the content hash so changes re-index
+        return {
             'url': row['url'],
             'title': row['title'] or '',
-            'source': row['source'] or ''
-        })
-        ids_to_index.append(row['url'])
-
-    if docs_to_index:
-        vs.add_documents(ids=ids_to_index, documents=docs_to_index, metadatas=metas_to_index)
-        print(f"🔎 Indexed {len(docs_to_index)} documents into vector store")
+            'source': row['source'] or '',
+            'topic': row['topic'] or '',
+            'published_ts': row['published_ts'] or 0,
+        }
+
+    def iter_chunk_items(changed_rows):
+        # Long articles are split into heading-aware chunks; each chunk carries its parent article
+        for row in changed_rows:
+            for chunk in iter_document_chunks(
+                title=row['title'] or '',
+                summary=row['description'] or row['abstract'] or '',
+                full_content=row['markdown_content'] or '',
+                max_tokens=args.chunk_tokens,
+                overlap_tokens=args.chunk_overlap,
+                count_tokens=count_tokens,
+            ):
+                yield (f"{row['url']}#{chunk['index']}", chunk['text'], {
+                    **parent_metadata(row),
+                    'chunk_index': chunk['index'],
+                    'heading': chunk['heading'],
+                })
+
+    # Stream pending articles a page at a time (keyset pagination) and embed + index + mark each
+    # page before reading the next, so memory stays bounded by --embed-page-size articles
+    changed_total = unchanged = chunk_count = 0
+    empty_hash = document_hash('')
+    embed_pool = None
+    started = time.perf_counter()
+    try:
+        for rows in db.iter_articles_for_embedding(pending_only=True, batch_size=args.embed_page_size):
+            changed_rows = []
+            emptied_urls = []
+            embedded_markers = []  # (article_id, content_hash)
+            for row in rows:
+                doc_text = build_document_for_embedding(
+                    title=row['title'] or '',
+                    summary=row['description'] or row['abstract'] or '',
+                    full_content=row['markdown_content'] or ''
+                )
+                if not doc_text.strip():
+                    # Nothing to embed: mark it done (so it isn't pending forever) and drop
+                    # vectors left from earlier text
+                    if row['content_hash'] and row['content_hash'] != empty_hash:
+                        emptied_urls.append(row['url'])
+                    embedded_markers.append((row['id'], empty_hash))
+                    continue
+                content_hash = document_hash(doc_text, parent_metadata(row))
+                embedded_markers.append((row['id'], content_hash))
+                if content_hash == row['content_hash']:
+                    # Touched by an upsert but the embedded text and metadata are identical; just refresh the marker
+                    unchanged += 1
+                    continue
+                changed_rows.append(row)
+
+            if changed_rows:
+                if embed_pool is None and args.embed_workers > 1:
+                    from src.vector_store.embed_pool import EmbeddingPool
+                    embed_pool = EmbeddingPool(MODEL_NAME, workers=args.embed_workers,
+                                               token_budget=args.embed_token_budget,
+                                               engine=args.encoder, encoder_dir=vs.encoder_dir)
+                    print(f"🧵 Embedding with {embed_pool.workers} worker processes "
+                          f"({embed_pool.threads_per_worker} torch threads each)")
+                # Drop previous chunks first: a changed article may now have fewer of them
+                vs.delete_parents([row['url'] for row in changed_rows])
+                chunk_count += vs.index_documents(iter_chunk_items(changed_rows), batch_size=args.embed_batch_size,
+                                                  embed_pool=embed_pool)
+                changed_total += len(changed_rows)
+            if emptied_urls:
+                vs.delete_parents(emptied_urls)
+            # Vectors for this page are written; only now record them as embedded
+            db.mark_embedded(embedded_markers)
+    finally:
+        if embed_pool is not None:
+            embed_pool.close()
+            vs.encode_stats.merge(embed_pool.stats.as_dict())
+
+    if changed_total:
+        elapsed = max(time.perf_counter() - started, 1e-9)
+        print(f"🔎 Indexed {changed_total} new/changed documents as {chunk_count} chunks "
+              f"({unchanged} unchanged skipped, {chunk_count / elapsed:.1f} chunks/s)")
+        if vs.encode_stats.texts:
+            print(f"⚡ Encoded {vs.encode_stats.summary()}")
     else:
-        print("ℹ️ No new documents to index")
+        print(f"ℹ️ No new documents to index ({unchanged} unchanged skipped)")
+    if vs.embedding_cache is not None:
+        cache_stats = vs.embedding_cache.stats()
+        print(f"🧠 Embedding cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses, "
+              f"{cache_stats['entries']} entries ({cache_stats['bytes_on_disk'] / 1e6:.1f} MB)")
+
+    # Everything is persisted and indexed: move the high-water marks forward in one transaction,
+    # except for sources that did not complete cleanly (their unseen items must be refetched)
+    moved, held = watermarks_to_save(stored_watermarks, pending_watermarks, incomplete_sources)
+    db.save_watermarks(args.topic, moved)
+    if moved:
+        print(f"🔖 Advanced watermarks: {', '.join(sorted(moved))}")
+    if held:
+        print(f"⏸️  Watermarks held back (incomplete fetch): {', '.join(sorted(held))}")
 
     # Optional export of raw results
     if args.save_json or args.save_md:
@@ -120,14 +257,19 @@ def cmd_validate(args: argparse.Namespace) -> None:
     db_path = base_dir / "data" / "research.db"
     db = DatabaseManager(db_path=str(db_path))
 
+    if args.topics_file:
+        _validate_batch(args, db, base_dir)
+        return
+
     print("\n=== VALIDATE: social signals + market scores ===")
-    social = SocialScraper()
+    social = _make_social_scraper(args, base_dir)
     social_items = social.fetch_social_signals(topic=args.topic, days=args.days)
+    _print_social_summary(social, [social_items])
 
     validator = MarketValidator()
     report_md, summary = validator.generate_report(db=db, social_items=social_items, topic=args.topic, days=args.days)
 
-    report_name = f"market_report_{args.topic.replace(' ', '_')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md"
+    report_name = _report_name(args.topic, datetime.now().strftime('%Y%m%d_%H%M%S'))
     report_path = base_dir / "data" / "reports" / report_name
     report_path.write_text(report_md, encoding='utf-8')
     print(f"📝 Report written to {report_path}")
@@ -144,13 +286,223 @@ def cmd_validate(args: argparse.Namespace) -> None:
             print(f"✉️  Report emailed to {email_to}")
 
 
+def _make_social_scraper(args: argparse.Namespace, base_dir: Path) -> SocialScraper:
+    cache = None
+    if not args.no_social_cache:
+        cache = ResponseCache(str(base_dir / "data" / "social_cache.db"), ttl_seconds=args.social_ttl)
+        cache.purge_expired()
+    subreddits = [s.strip() for s in args.subreddits.split(',') if s.strip()] if args.subreddits else None
+    return SocialScraper(subreddits=subreddits, cache=cache, max_pages=args.social_pages,
+                         concurrency=args.social_concurrency)
+
+
+def _print_social_summary(social: SocialScraper, item_lists) -> None:
+    line = f"💬 Social signals: {sum(len(items) for items in item_lists)} items, {social.requests_made} requests"
+    if social.cache is not None:
+        line += f", cache {social.cache.hits} hits / {social.cache.misses} misses"
+    if social.errors:
+        line += f", {len(social.errors)} failed"
+    print(line)
+
+
+def _report_name(topic: str, stamp: str) -> str:
+    """
+    Filename-safe report name; the short hash of the exact topic keeps topics that slug the
+    same ("AI agents" / "AI_agents") from overwriting each other
+    """
+    slug = re.sub(r'[^A-Za-z0-9_.-]+', '_', topic).strip('_') or 'topic'
+    digest = hashlib.sha1(topic.encode('utf-8')).hexdigest()[:8]
+    return f"market_report_{slug}_{digest}_{stamp}.md"
+
+
+def _validate_batch(args: argparse.Namespace, db: DatabaseManager, base_dir: Path) -> None:
+    """
+    Validate every topic in --topics-file: metrics for all topics in one GROUP BY over the
+    daily rollup, trends in one vectorized pass, social signals for all topics collected in
+    one event loop (--social-concurrency requests in flight), reports rendered in parallel,
+    plus a combined leaderboard
+    """
+    topics = list(dict.fromkeys(_read_queries(args.topics_file)))
+    if not topics:
+        print(f"⚠️ No topics in {args.topics_file}")
+        return
+    print(f"\n=== VALIDATE: {len(topics)} topics from {args.topics_file} ===")
+    started = time.perf_counter()
+    validator = MarketValidator()
+    metrics = db.aggregate_signals_by_topic(topics, days=args.days)
+    trends = validator.trends.score_topics(db, topics)
+    print(f"📊 Metrics and trends for {len(topics)} topics in {time.perf_counter() - started:.2f}s")
+
+    social = _make_social_scraper(args, base_dir)
+    social_items = social.fetch_many(topics, days=args.days)
+    _print_social_summary(social, social_items.values())
+
+    stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    reports_dir = base_dir / "data" / "reports"
+
+    def render(topic: str):
+        report_md, summary = validator.generate_report(db=db, social_items=social_items[topic], topic=topic,
+                                                       days=args.days, metrics=metrics[topic], trend=trends[topic])
+        name = _report_name(topic, stamp)
+        (reports_dir / name).write_text(report_md, encoding='utf-8')
+        return topic, name, summary
+
+    with ThreadPoolExecutor(max_workers=max(1, args.report_workers), thread_name_prefix='report') as executor:
+        rendered = list(executor.map(render, topics))
+
+    leaderboard_md = validator.generate_leaderboard({topic: summary for topic, _, summary in rendered}, days=args.days,
+                                                    report_names={topic: name for topic, name, _ in rendered})
+    leaderboard_path = reports_dir / f"market_leaderboard_{stamp}.md"
+    leaderboard_path.write_text(leaderboard_md, encoding='utf-8')
+    print(f"📝 {len(rendered)} reports + leaderboard written to {reports_dir} in {time.perf_counter() - started:.1f}s")
+    print(f"🏆 Leaderboard: {leaderboard_path}")
+
+    if args.email:
+        email_to = os.getenv('EMAIL_TO')
+        if not email_to:
+            print("⚠️ EMAIL_TO not set; skipping email")
+        else:
+            client = EmailClient()
+            subject = f"Research Agent Market Leaderboard - {len(topics)} topics"
+            client.send_email(subject=subject, body=leaderboard_md, attachments=[str(leaderboard_path)])
+            print(f"✉️  Leaderboard emailed to {email_to}")
+
+
+def _load_vector_store(base_dir: Path, args: argparse.Namespace):
+    from src.vector_store.vector_store import VectorStore
+    return VectorStore(persist_directory=str(base_dir / "vector_store"),
+                       embedding_cache_dir=str(base_dir / "data" / "embedding_cache"),
+                       backend=args.vector_backend, numpy_dtype=args.vector_dtype,
+                       engine=args.encoder, encoder_dir=str(base_dir / "data" / "onnx"))
+
+
+def _since_epoch(value: str) -> int:
+    """
+    argparse type for --since: UTC epoch seconds of an ISO date/datetime
+    """
+    try:
+        return utc_epoch(datetime.fromisoformat(value.strip()))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid date {value!r} (expected YYYY-MM-DD or an ISO timestamp)")
+
+
+def _make_searcher(args: argparse.Namespace, base_dir: Path):
+    """
+    Return search(queries) -> per-query hit lists for --mode vector | keyword | hybrid.
+
+    Dense retrieval uses the warm daemon when one answers, otherwise loads the model and
+    Chroma in-process once and reuses them. Keyword mode never loads the model.
+    """
+    state = {'vs': None, 'use_daemon': not args.no_daemon}
+    filters = {'source': args.source, 'topic': args.topic, 'since_ts': args.since}
+    has_filters = any(v is not None for v in filters.values())
+    db = DatabaseManager(db_path=str(base_dir / "data" / "research.db")) if args.mode != 'vector' or has_filters else None
+    candidates = args.k * 4  # per-retriever depth fed into rank fusion
+
+    where = None
+    if has_filters and args.mode != 'keyword':
+        # Very selective filters: resolve matching articles in SQLite and hand Chroma the ids;
+        # otherwise filter on the chunk metadata inside Chroma
+        candidate_urls = db.filter_article_urls(**filters, limit=args.prefilter_limit)
+        if candidate_urls == []:
+            return lambda queries: [[] for _ in queries]
+        where = build_where(urls=candidate_urls) if candidate_urls is not None else build_where(**filters)
+
+    def vector_search(queries, k):
+        if state['use_daemon']:
+            results = query_daemon(queries, k=k, port=args.port, where=where)
+            if results is not None:
+                return results
+            state['use_daemon'] = False
+        if state['vs'] is None:
+            # No daemon running: load the model and Chroma in-process
+            state['vs'] = _load_vector_store(base_dir, args)
+        return state['vs'].search(query_texts=queries, k=k, where=where)
+
+    def search(queries):
+        if args.mode == 'vector':
+            return vector_search(queries, args.k)
+        if args.mode == 'keyword':
+            return [db.keyword_search(query, limit=args.k, **filters) for query in queries]
+        dense = vector_search(queries, candidates)
+        return [
+            reciprocal_rank_fusion([db.keyword_search(query, limit=candidates, match_all=False, **filters), dense_hits],
+                                   limit=args.k)
+            for query, dense_hits in zip(queries, dense)
+        ]
+
+    return search
+
+
+def _format_score(hit) -> str:
+    if 'rrf' in hit:
+        return f"rrf: {hit['rrf']:.4f} (bm25 rank {hit['ranks'][0] or '-'}, vector rank {hit['ranks'][1] or '-'})"
+    if 'bm25' in hit:
+        return f"bm25: {hit['bm25']:.4f}"
+    return f"score: {hit['distance']:.4f}"
+
+
+def _read_queries(path: str):
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                yield line
+
+
 def cmd_search(args: argparse.Namespace) -> None:
     base_dir = Path(__file__).parent
-    vs = VectorStore(persist_directory=str(base_dir / "vector_store"))
-    results = vs.query(query_texts=[args.query], n_results=args.k)
-    for i, (doc, meta, score) in enumerate(zip(results['documents'][0], results['metadatas'][0], results['distances'][0])):
-        print(f"[{i+1}] {meta.get('title', '')} | {meta.get('source', '')} | {meta.get('url', '')}")
-        print(f"     score: {score:.4f}")
+    search = _make_searcher(args, base_dir)
+
+    if args.queries_file:
+        _search_batch(args, search)
+        return
+
+    hits = search([args.query])[0]
+    for i, hit in enumerate(hits):
+        print(f"[{i+1}] {hit['title']} | {hit['source']} | {hit['url']}")
+        section = f" | section: {hit['heading']}" if hit.get('heading') else ''
+        print(f"     {_format_score(hit)}{section}")
+
+
+def _search_batch(args: argparse.Namespace, search) -> None:
+    """
+    Run every query in --queries-file in batches (one encode + one Chroma query per batch)
+    and stream one NDJSON line per query to --output (or stdout).
+    """
+    out = open(args.output, 'w', encoding='utf-8') if args.output and args.output != '-' else sys.stdout
+    total = 0
+    started = time.perf_counter()
+    try:
+        batch = []
+        for query in _read_queries(args.queries_file):
+            batch.append(query)
+            if len(batch) >= args.batch_size:
+                total += _write_batch_results(out, batch, search(batch))
+                batch = []
+        if batch:
+            total += _write_batch_results(out, batch, search(batch))
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    elapsed = time.perf_counter() - started
+    qps = total / elapsed if elapsed > 0 else 0.0
+    print(f"⚡ {total} queries in {elapsed:.2f}s ({qps:.1f} queries/sec)", file=sys.stderr)
+
+
+def _write_batch_results(out, queries, results) -> int:
+    for query, hits in zip(queries, results):
+        out.write(json.dumps({'query': query, 'hits': hits}, ensure_ascii=False) + "\n")
+    out.flush()
+    return len(queries)
+
+
+def cmd_serve(args: argparse.Namespace) -> None:
+    base_dir = Path(__file__).parent
+    print("\n=== SERVE: warm search daemon ===")
+    vs = _load_vector_store(base_dir, args)
+    SearchDaemon(vs, host=args.host, port=args.port, max_batch=args.max_batch, max_wait_ms=args.max_wait_ms,
+                 refresh_seconds=args.refresh_seconds).serve_forever()
 
 
 def _remove_dir_contents(path: Path) -> int:
@@ -176,13 +528,19 @@ def cmd_clean(args: argparse.Namespace) -> None:
     raw_dir = data_dir / "raw"
     processed_dir = data_dir / "processed"
     db_file = data_dir / "research.db"
+    feed_cache_file = data_dir / "feed_cache.db"
+    social_cache_file = data_dir / "social_cache.db"
+    embedding_cache_dir = data_dir / "embedding_cache"
     vectors_dir = base_dir / "vector_store"
 
     if args.all:
-        args.db = args.reports = args.raw = args.processed = args.vectors = True
+        args.db = args.reports = args.raw = args.processed = args.vectors = args.feed_cache = args.embedding_cache = True
+        args.social_cache = True
 
-    if not any([args.db, args.reports, args.raw, args.processed, args.vectors]):
-        print("Nothing to clean. Specify one or more of --db --reports --raw --processed --vectors, or use --all.")
+    if not any([args.db, args.reports, args.raw, args.processed, args.vectors, args.feed_cache, args.embedding_cache,
+                args.social_cache]):
+        print("Nothing to clean. Specify one or more of --db --reports --raw --processed --vectors --feed-cache "
+              "--social-cache --embedding-cache, or use --all.")
         return
 
     print("\n=== CLEAN: removing generated artifacts ===")
@@ -196,6 +554,34 @@ def cmd_clean(args: argparse.Namespace) -> None:
         except Exception as e:
             print(f"⚠️  Failed to delete DB: {e}")
 
+    if args.feed_cache:
+        try:
+            if feed_cache_file.exists():
+                feed_cache_file.unlink()
+                print(f"🗑️  Deleted feed cache: {feed_cache_file}")
+            else:
+                print("ℹ️  Feed cache not found; skipping")
+        except Exception as e:
+            print(f"⚠️  Failed to delete feed cache: {e}")
+
+    if args.social_cache:
+        try:
+            if social_cache_file.exists():
+                social_cache_file.unlink()
+                print(f"🗑️  Deleted social cache: {social_cache_file}")
+            else:
+                print("ℹ️  Social cache not found; skipping")
+        except Exception as e:
+            print(f"⚠️  Failed to delete social cache: {e}")
+
+    if args.embedding_cache:
+        try:
+            if embedding_cache_dir.exists():
+                shutil.rmtree(embedding_cache_dir, ignore_errors=True)
+            print(f"🗑️  Cleared embedding cache: {embedding_cache_dir}")
+        except Exception as e:
+            print(f"⚠️  Failed to clear embedding cache: {e}")
+
     if args.reports:
         removed = _remove_dir_contents(reports_dir)
         print(f"🗑️  Cleared reports ({removed} items): {reports_dir}")
@@ -218,6 +604,16 @@ def cmd_clean(args: argparse.Namespace) -> None:
             print(f"⚠️  Failed to clear vector store: {e}")
 
 
+def _add_vector_store_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument('--vector-backend', choices=['chroma', 'numpy'], default='chroma',
+                        help='Vector index: Chroma HNSW, or exact scan over a memory-mapped NumPy matrix')
+    parser.add_argument('--vector-dtype', choices=['float16', 'int8'], default='float16',
+                        help='Storage precision of the numpy backend matrix')
+    parser.add_argument('--encoder', choices=list(ENCODER_ENGINES), default='torch',
+                        help='Embedding engine: PyTorch SentenceTransformer, or ONNX Runtime on CPU '
+                             '(fp32 / int8 dynamic quantized; exported to data/onnx/ on first use)')
+
+
 def main():
     parser = argparse.ArgumentParser(description="Research Agent CLI")
     subparsers = parser.add_subparsers(dest='command', required=True)
@@ -227,23 +623,81 @@ def main():
     p_ingest.add_argument('--topic', required=True, help='Topic keywords, e.g. "AI"')
     p_ingest.add_argument('--days', type=int, default=7, help='Lookback window in days')
     p_ingest.add_argument('--include-content', action='store_true', help='Crawl full content with crawl4ai')
+    p_ingest.add_argument('--parallel', action='store_true', help='Fetch all sources and feeds concurrently')
+    p_ingest.add_argument('--source-timeout', type=float, default=30.0, help='Per-source/feed timeout in seconds (with --parallel)')
+    p_ingest.add_argument('--backfill', action='store_true', help='Page through every HN story in the window (time-sliced) and stream into the DB')
+    p_ingest.add_argument('--slice-hours', type=int, default=24, help='HN backfill slice size in hours (auto-split when a slice exceeds 1000 hits)')
+    p_ingest.add_argument('--backfill-workers', type=int, default=4, help='Concurrent HN backfill requests')
+    p_ingest.add_argument('--incremental', action='store_true', help='Only fetch items newer than the per-source watermarks from previous runs')
+    p_ingest.add_argument('--reindex', action='store_true', help='Rebuild the vector store from every article instead of only new/changed ones')
+    p_ingest.add_argument('--chunk-tokens', type=int, default=DEFAULT_MAX_TOKENS,
+                          help='Max encoder word pieces per embedding chunk, Title/Section prefix and [CLS]/[SEP] '
+                               'included (default: the model\'s 256 limit)')
+    p_ingest.add_argument('--chunk-overlap', type=int, default=DEFAULT_OVERLAP_TOKENS,
+                          help='Word pieces repeated between consecutive chunks of a section')
+    p_ingest.add_argument('--embed-batch-size', type=int, default=64, help='Chunks encoded and upserted per batch')
+    p_ingest.add_argument('--embed-page-size', type=int, default=200,
+                          help='Articles read from the DB, embedded and marked per page (bounds memory)')
+    p_ingest.add_argument('--embed-token-budget', type=int, default=8192,
+                          help='Max padded tokens (rows x longest row) per model batch; texts are length-sorted')
+    p_ingest.add_argument('--embed-workers', type=int, default=1,
+                          help='Embedding processes (each loads its own model and gets cores/N torch threads)')
+    _add_vector_store_args(p_ingest)
+    p_ingest.add_argument('--no-embedding-cache', action='store_true', help='Always recompute embeddings (skip data/embedding_cache)')
+    p_ingest.add_argument('--no-feed-cache', action='store_true', help='Bypass the conditional-GET feed cache (data/feed_cache.db)')
+    p_ingest.add_argument('--crawl-concurrency', type=int, default=8, help='Max concurrent crawls (per-host politeness still applies)')
+    p_ingest.add_argument('--crawl-timeout', type=float, default=60.0, help='Per-URL crawl timeout in seconds')
     p_ingest.add_argument('--save-json', action='store_true', help='Also save raw JSON results to data/')
     p_ingest.add_argument('--save-md', action='store_true', help='Also save markdown report to data/')
     p_ingest.set_defaults(func=cmd_ingest)
 
     # validate
     p_validate = subparsers.add_parser('validate', help='Scrape socials and compute market validation; write report; optional email')
-    p_validate.add_argument('--topic', required=True, help='Topic keywords, e.g. "AI"')
+    validate_input = p_validate.add_mutually_exclusive_group(required=True)
+    validate_input.add_argument('--topic', help='Topic keywords, e.g. "AI"')
+    validate_input.add_argument('--topics-file', help='One topic per line; per-topic reports plus a combined leaderboard')
     p_validate.add_argument('--days', type=int, default=7, help='Lookback window in days for validation')
-    p_validate.add_argument('--email', action='store_true', help='Email the generated report')
+    p_validate.add_argument('--email', action='store_true', help='Email the generated report (the leaderboard with --topics-file)')
+    p_validate.add_argument('--social-concurrency', type=int, default=8, help='Concurrent Reddit requests')
+    p_validate.add_argument('--subreddits', help='Comma-separated subreddits to search (default: all of Reddit)')
+    p_validate.add_argument('--social-pages', type=int, default=4, help='Max result pages per subreddit (100 posts each)')
+    p_validate.add_argument('--social-ttl', type=int, default=3600,
+                            help='Seconds Reddit responses stay cached in data/social_cache.db')
+    p_validate.add_argument('--no-social-cache', action='store_true', help='Bypass the Reddit response cache')
+    p_validate.add_argument('--report-workers', type=int, default=4, help='Parallel report renderers with --topics-file')
     p_validate.set_defaults(func=cmd_validate)
 
     # search
     p_search = subparsers.add_parser('search', help='Semantic search over embedded corpus')
-    p_search.add_argument('--query', required=True)
+    search_input = p_search.add_mutually_exclusive_group(required=True)
+    search_input.add_argument('--query')
+    search_input.add_argument('--queries-file', help='One query per line; results streamed as NDJSON')
+    p_search.add_argument('--output', help='NDJSON output path for --queries-file (default: stdout)')
+    p_search.add_argument('--batch-size', type=int, default=64, help='Queries embedded/queried per batch')
     p_search.add_argument('-k', type=int, default=5)
+    p_search.add_argument('--mode', choices=['vector', 'keyword', 'hybrid'], default='vector',
+                          help='vector (dense), keyword (SQLite FTS5 BM25, no model load) or hybrid (RRF of both)')
+    p_search.add_argument('--source', help='Only this source, e.g. hackernews, arxiv, techcrunch')
+    p_search.add_argument('--topic', help='Only articles ingested under this topic')
+    p_search.add_argument('--since', type=_since_epoch, help='Only articles published on/after this date (YYYY-MM-DD, UTC)')
+    p_search.add_argument('--prefilter-limit', type=int, default=1000,
+                          help='Use SQLite-prefiltered candidate ids when at most this many articles match the filters')
+    p_search.add_argument('--port', type=int, default=DEFAULT_PORT, help='Port of a running `serve` daemon')
+    p_search.add_argument('--no-daemon', action='store_true', help='Always search in-process')
+    _add_vector_store_args(p_search)
     p_search.set_defaults(func=cmd_search)
 
+    # serve
+    p_serve = subparsers.add_parser('serve', help='Run a warm local search daemon (keeps model + Chroma loaded)')
+    p_serve.add_argument('--host', default=DEFAULT_HOST)
+    p_serve.add_argument('--port', type=int, default=DEFAULT_PORT)
+    p_serve.add_argument('--max-batch', type=int, default=64, help='Max queries embedded per micro-batch')
+    p_serve.add_argument('--max-wait-ms', type=float, default=5.0, help='How long to gather concurrent queries into one batch')
+    p_serve.add_argument('--refresh-seconds', type=float, default=60.0,
+                         help='Reopen the vector index this often to see new ingests/reindexes (0 = only after errors)')
+    _add_vector_store_args(p_serve)
+    p_serve.set_defaults(func=cmd_serve)
+
     # clean
     p_clean = subparsers.add_parser('clean', help='Remove generated artifacts (non-interactive)')
     p_clean.add_argument('--db', action='store_true', help='Delete data/research.db')
@@ -251,6 +705,9 @@ def main():
     p_clean.add_argument('--raw', action='store_true', help='Delete files in data/raw/')
     p_clean.add_argument('--processed', action='store_true', help='Delete files in data/processed/')
     p_clean.add_argument('--vectors', action='store_true', help='Delete vector_store contents')
+    p_clean.add_argument('--feed-cache', action='store_true', help='Delete data/feed_cache.db')
+    p_clean.add_argument('--social-cache', action='store_true', help='Delete data/social_cache.db')
+    p_clean.add_argument('--embedding-cache', action='store_true', help='Delete data/embedding_cache/')
     p_clean.add_argument('--all', action='store_true', help='Delete all of the above')
     p_clean.set_defaults(func=cmd_clean)
 
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Parity check and benchmark for the embedding engines (torch vs ONNX fp32 vs ONNX int8).
+
+- parity: per-document cosine between each engine and the torch reference; exits non-zero
+  when any document falls below --min-cosine (default 0.99)
+- throughput: docs/sec and tokens/sec through the same length-bucketed batching ingest uses
+- startup: fresh process importing the engine, loading the model and encoding one text
+
+Documents are real embedding chunks from --db (default data/research.db, opened
+read-only, so no migrations run against it) when it exists, otherwise synthetic text of
+mixed lengths. ONNX models are exported to --encoder-dir on first use.
+
+Usage (from research_agent/):
+  python scripts/bench_encoders.py --docs 1000
+"""
+
+import argparse
+import json
+import random
+import sqlite3
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from src.processors.preprocess import iter_document_chunks  # noqa: E402
+from src.storage.content_store import decompress_text  # noqa: E402
+from src.vector_store.batching import EncodeStats, encode_length_bucketed  # noqa: E402
+from src.vector_store.encoders import MODEL_NAME, load_encoder  # noqa: E402
+
+
+def read_articles(db_path: Path):
+    """
+    Embedding inputs from a research DB, opened read-only (never migrated or written)
+    """
+    conn = sqlite3.connect(f"{db_path.resolve().as_uri()}?mode=ro", uri=True)
+    conn.row_factory = sqlite3.Row
+    conn.create_function('decompress_content', 2, decompress_text)
+    try:
+        # DBs not yet opened by this version still keep bodies inline only
+        has_blobs = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'content_blobs'"
+        ).fetchone() is not None
+        content_sql = ("COALESCE(decompress_content(b.codec, b.data), cc.markdown_content, '')" if has_blobs
+                       else "COALESCE(cc.markdown_content, '')")
+        blob_join = "LEFT JOIN content_blobs b ON b.hash = cc.content_hash" if has_blobs else ""
+        return conn.execute(
+            f"""
+            SELECT a.title, a.description, a.abstract, {content_sql} AS markdown_content
+            FROM articles a
+            LEFT JOIN crawled_content cc ON cc.article_id = a.id
+            {blob_join}
+            ORDER BY a.id
+            """
+        ).fetchall()
+    finally:
+        conn.close()
+
+
+def sample_documents(limit: int, seed: int, db_path: Path):
+    docs = []
+    if db_path.exists():
+        try:
+            rows = read_articles(db_path)
+        except sqlite3.Error as e:
+            print(f"⚠️ Could not read {db_path} ({e}); using synthetic documents", file=sys.stderr)
+            rows = []
+        for row in rows:
+            for chunk in iter_document_chunks(title=row['title'] or '',
+                                              summary=row['description'] or row['abstract'] or '',
+                                              full_content=row['markdown_content'] or ''):
+                docs.append(chunk['text'])
+    if not docs:
+        rng = random.Random(seed)
+        vocab = ['model', 'agent', 'vector', 'search', 'latency', 'market', 'startup', 'robotics',
+                 'dataset', 'benchmark', 'inference', 'privacy', 'open', 'source', 'paper', 'release']
+        docs = [' '.join(rng.choice(vocab) for _ in range(rng.choice([6, 12, 40, 120, 180]))) for _ in range(limit)]
+    random.Random(seed).shuffle(docs)
+    return docs[:limit]
+
+
+def startup_seconds(engine: str, encoder_dir: str) -> float:
+    code = (
+        "import sys, time; t0 = time.perf_counter(); "
+        f"sys.path.insert(0, {str(BASE_DIR)!r}); "
+        "from src.vector_store.encoders import load_encoder; "
+        f"m = load_encoder({MODEL_NAME!r}, engine={engine!r}, encoder_dir={encoder_dir!r}); "
+        "m.encode(['warm up'], batch_size=1); print(time.perf_counter() - t0)"
+    )
+    out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Embedding engine parity check and benchmark')
+    parser.add_argument('--engines', default='torch,onnx,onnx-int8', help='Comma-separated engines; torch is the parity reference')
+    parser.add_argument('--docs', type=int, default=500)
+    parser.add_argument('--db', default=str(BASE_DIR / 'data' / 'research.db'),
+                        help='Research DB to sample documents from (opened read-only)')
+    parser.add_argument('--token-budget', type=int, default=8192)
+    parser.add_argument('--encoder-dir', default=str(BASE_DIR / 'data' / 'onnx'))
+    parser.add_argument('--min-cosine', type=float, default=0.99)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    engines = [e.strip() for e in args.engines.split(',') if e.strip()]
+    if 'torch' not in engines:
+        engines.insert(0, 'torch')
+    docs = sample_documents(args.docs, args.seed, Path(args.db))
+    print(f"📄 {len(docs)} documents", file=sys.stderr)
+
+    reference = None
+    failed = False
+    for engine in engines:
+        model = load_encoder(MODEL_NAME, engine=engine, encoder_dir=args.encoder_dir)  # exports ONNX if needed
+        encode_length_bucketed(model, docs[:8], token_budget=args.token_budget)  # warm-up
+        stats = EncodeStats()
+        started = time.perf_counter()
+        vectors = encode_length_bucketed(model, docs, token_budget=args.token_budget, stats=stats)
+        elapsed = time.perf_counter() - started
+        vectors = vectors / np.clip(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12, None)
+        result = {
+            'engine': engine,
+            'docs_per_s': round(len(docs) / elapsed, 1),
+            'tokens_per_s': round(stats.tokens / elapsed, 1),
+            'startup_s': round(startup_seconds(engine, args.encoder_dir), 2),
+        }
+        if reference is None:
+            reference = vectors
+        else:
+            cosines = np.sum(vectors * reference, axis=1)
+            result.update({'cosine_min': round(float(cosines.min()), 5), 'cosine_mean': round(float(cosines.mean()), 5)})
+            result['parity_ok'] = bool(cosines.min() >= args.min_cosine)
+            failed = failed or not result['parity_ok']
+        print(json.dumps(result))
+        del model
+
+    if failed:
+        print(f"❌ Parity check failed: some embeddings below cosine {args.min_cosine} vs torch", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmark for windowed signal aggregation on a synthetic articles table.
+
+Fills a throwaway DB with --rows articles spread over a year across a handful of topics
+and sources, then times DatabaseManager.aggregate_signals (daily_signals rollup) against
+the same totals from the articles table: an integer published_ts range on the covering
+indexes, and the old ISO-string predicate `COALESCE(published_date, created_at) >= ?`.
+Prints each query plan.
+
+Usage (from research_agent/):
+  python scripts/bench_signal_queries.py --rows 1000000
+"""
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from src.storage.db import DatabaseManager  # noqa: E402
+
+TOPICS = ['AI', 'robotics', 'crypto', 'biotech', 'climate', 'security', 'space', 'fintech']
+SOURCES = ['hackernews', 'arxiv', 'techcrunch', 'wired', 'mit_tech_review']
+
+
+def populate(db: DatabaseManager, rows: int, seed: int) -> None:
+    rng = random.Random(seed)
+    now = int(time.time())
+    batch = []
+
+    def flush(cur):
+        # Direct insert: the benchmark is about the aggregate, not FTS/upsert cost
+        cur.executemany(
+            """
+            INSERT INTO articles (url, source, topic, created_at, published_date, published_ts, points, comments_count)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            batch,
+        )
+
+    for i in range(rows):
+        ts = now - rng.randrange(365 * 86400)
+        iso = datetime.utcfromtimestamp(ts).isoformat()
+        source = rng.choice(SOURCES)
+        batch.append((f'https://example.com/{i}', source, rng.choice(TOPICS),
+                      iso if source == 'hackernews' else None, None if source == 'hackernews' else iso,
+                      ts, rng.randrange(500), rng.randrange(200)))
+        if len(batch) == 50000:
+            db._write(flush)
+            batch = []
+    if batch:
+        db._write(flush)
+    db._write(lambda cur: cur.execute("ANALYZE"))
+    db.rebuild_daily_signals()
+
+
+def best_ms(fn, repeat: int) -> float:
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        elapsed = (time.perf_counter() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return round(best, 2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Windowed aggregation benchmark')
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--days', type=int, default=7)
+    parser.add_argument('--topic', default='AI')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(str(Path(tmp) / 'bench.db'))
+        started = time.perf_counter()
+        populate(db, args.rows, args.seed)
+        print(f"📄 {args.rows} rows in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+
+        conn = db._connect()
+        cutoff_iso = datetime.utcfromtimestamp(int(time.time()) - args.days * 86400).isoformat()
+        legacy_sql = ("SELECT COUNT(*), SUM(points), SUM(comments_count) FROM articles "
+                      "WHERE topic = ? AND COALESCE(published_date, created_at) >= ?")
+        indexed_sql = ("SELECT COUNT(*), SUM(points), SUM(comments_count) FROM articles "
+                       "WHERE topic = ? AND published_ts >= ?")
+        cutoff_ts = int(time.time()) - args.days * 86400
+        for name, sql, params, call in (
+            ('iso_string', legacy_sql, (args.topic, cutoff_iso),
+             lambda: conn.execute(legacy_sql, (args.topic, cutoff_iso)).fetchone()),
+            ('published_ts', indexed_sql, (args.topic, cutoff_ts),
+             lambda: conn.execute(indexed_sql, (args.topic, cutoff_ts)).fetchone()),
+            ('rollup', None, None,
+             lambda: db.aggregate_signals(topic=args.topic, days=args.days)),
+            ('rollup_all_topics', None, None,
+             lambda: db.aggregate_signals(days=args.days)),
+        ):
+            plan = None
+            if sql:
+                plan = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+            print(json.dumps({'query': name, 'ms': best_ms(call, args.repeat), 'plan': plan}))
+        db.close()
+
+
+if __name__ == '__main__':
+    main()
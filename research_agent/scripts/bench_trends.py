@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark for TrendEngine: load and score many topics from a synthetic daily_signals rollup.
+
+Writes --topics topics x --sources sources x the engine's span of days into a throwaway
+DB (a mix of flat, rising and fading series), then times the rollup load and the
+vectorized scoring separately and prints the label counts.
+
+Usage (from research_agent/):
+  python scripts/bench_trends.py --topics 1000
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from src.processors.trends import TrendEngine  # noqa: E402
+from src.storage.db import DatabaseManager  # noqa: E402
+
+
+def populate(db: DatabaseManager, engine: TrendEngine, topics: int, sources: int, end_day: int, seed: int) -> None:
+    rng = np.random.default_rng(seed)
+    days = np.arange(end_day - engine.span_days + 1, end_day + 1)
+    shape = np.linspace(0, 1, len(days))
+    rows = []
+    for t in range(topics):
+        kind = t % 3  # flat, rising, fading
+        rate = 5 * (1 + (kind == 1) * 4 * shape ** 4 - (kind == 2) * shape)
+        for source in range(sources):
+            articles = rng.poisson(np.clip(rate, 0, None))
+            for day, count in zip(days, articles):
+                if count:
+                    rows.append((f'topic-{t}', f'source-{source}', int(day), int(count),
+                                 int(count * rng.integers(0, 20)), int(count * rng.integers(0, 8)), int(rng.integers(0, count + 1))))
+    db._write(lambda cur: cur.executemany(
+        "INSERT INTO daily_signals (topic, source, day, articles, points, comments, crawled) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        rows,
+    ))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='TrendEngine load + scoring benchmark')
+    parser.add_argument('--topics', type=int, default=1000)
+    parser.add_argument('--sources', type=int, default=5)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    engine = TrendEngine()
+    end_day = int(time.time()) // 86400
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(str(Path(tmp) / 'bench.db'))
+        populate(db, engine, args.topics, args.sources, end_day, args.seed)
+        load_s = score_s = None
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            series = engine.load(db, end_day=end_day)
+            loaded = time.perf_counter()
+            scores = engine.score(series)
+            done = time.perf_counter()
+            load_s = min(load_s or loaded - started, loaded - started)
+            score_s = min(score_s or done - loaded, done - loaded)
+        print(json.dumps({
+            'topics': len(scores),
+            'days': engine.span_days,
+            'load_ms': round(load_s * 1000, 1),
+            'score_ms': round(score_s * 1000, 1),
+            'labels': dict(Counter(trend['label'] for trend in scores.values())),
+        }))
+        db.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Benchmark vector backends (Chroma HNSW vs exact NumPy scan) on synthetic clustered
+embeddings shaped like the corpus (384-d MiniLM vectors):
+
+- recall@k against exact float32 cosine top-k
+- query latency (single query, p50/p95) and batch throughput
+- cold start: fresh process opening the on-disk index and answering one query
+- build time
+
+Usage (from research_agent/):
+  python scripts/bench_vector_backends.py --rows 50000 --queries 200 -k 10
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.vector_store.backends import make_backend  # noqa: E402
+
+
+def synthetic_corpus(rows: int, queries: int, dim: int, clusters: int, seed: int):
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dim)).astype(np.float32)
+    labels = rng.integers(0, clusters, rows)
+    data = centers[labels] + 0.6 * rng.standard_normal((rows, dim)).astype(np.float32)
+    data /= np.linalg.norm(data, axis=1, keepdims=True)
+    q_labels = rng.integers(0, clusters, queries)
+    q = centers[q_labels] + 0.6 * rng.standard_normal((queries, dim)).astype(np.float32)
+    q /= np.linalg.norm(q, axis=1, keepdims=True)
+    return data, q
+
+
+def exact_topk(data: np.ndarray, queries: np.ndarray, k: int) -> np.ndarray:
+    scores = queries @ data.T
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    return np.take_along_axis(top, np.argsort(-np.take_along_axis(scores, top, axis=1), axis=1), axis=1)
+
+
+def open_backend(spec: str, directory: str, dim: int):
+    name, _, dtype = spec.partition(':')
+    return make_backend(name, directory, dim=dim, numpy_dtype=dtype or 'float16')
+
+
+def cold_start(spec: str, directory: str, dim: int) -> float:
+    """
+    Time opening the persisted index and answering one query in a fresh interpreter
+    """
+    code = (
+        "import sys, time; t0 = time.perf_counter(); "
+        f"sys.path.insert(0, {str(Path(__file__).resolve().parent)!r}); "
+        "import numpy as np; from bench_vector_backends import open_backend; "
+        f"b = open_backend({spec!r}, {directory!r}, {dim}); "
+        f"b.query(np.ones((1, {dim}), dtype=np.float32), n_results=10); "
+        "print(time.perf_counter() - t0)"
+    )
+    out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def bench(spec: str, data: np.ndarray, queries: np.ndarray, truth: np.ndarray, k: int, batch: int, workdir: str):
+    directory = str(Path(workdir) / spec.replace(':', '_'))
+    backend = open_backend(spec, directory, data.shape[1])
+    ids = [str(i) for i in range(len(data))]
+
+    t0 = time.perf_counter()
+    for start in range(0, len(data), 5000):
+        stop = start + 5000
+        backend.upsert(ids[start:stop], data[start:stop], [{'url': i} for i in ids[start:stop]])
+    build_s = time.perf_counter() - t0
+
+    latencies = []
+    found = []
+    for q in queries:
+        t0 = time.perf_counter()
+        res = backend.query(q[None, :], n_results=k)
+        latencies.append(time.perf_counter() - t0)
+        found.append([int(i) for i in res['ids'][0]])
+    recall = float(np.mean([len(set(f) & set(t.tolist())) / k for f, t in zip(found, truth)]))
+
+    t0 = time.perf_counter()
+    for start in range(0, len(queries), batch):
+        backend.query(queries[start:start + batch], n_results=k)
+    batch_qps = len(queries) / (time.perf_counter() - t0)
+    del backend
+
+    return {
+        'backend': spec,
+        'rows': len(data),
+        f'recall@{k}': round(recall, 4),
+        'p50_ms': round(float(np.percentile(latencies, 50)) * 1000, 3),
+        'p95_ms': round(float(np.percentile(latencies, 95)) * 1000, 3),
+        'batch_qps': round(batch_qps, 1),
+        'cold_start_s': round(cold_start(spec, directory, data.shape[1]), 3),
+        'build_s': round(build_s, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare vector backends on recall, latency and cold start')
+    parser.add_argument('--rows', type=int, default=50000)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--dim', type=int, default=384)
+    parser.add_argument('--clusters', type=int, default=200)
+    parser.add_argument('-k', type=int, default=10)
+    parser.add_argument('--batch', type=int, default=64, help='Queries per call for the throughput run')
+    parser.add_argument('--backends', default='numpy:float16,numpy:int8,chroma',
+                        help='Comma-separated backend specs (name[:dtype])')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    data, queries = synthetic_corpus(args.rows, args.queries, args.dim, args.clusters, args.seed)
+    truth = exact_topk(data, queries, args.k)
+    print(f"📐 {args.rows} x {args.dim} vectors, {args.queries} queries, k={args.k}", file=sys.stderr)
+
+    with tempfile.TemporaryDirectory(prefix='bench_vectors_') as workdir:
+        for spec in [s.strip() for s in args.backends.split(',') if s.strip()]:
+            try:
+                print(json.dumps(bench(spec, data, queries, truth, args.k, args.batch, workdir)))
+            except ImportError as e:
+                print(f"⚠️  Skipping {spec}: {e}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Local fake of Reddit's JSON search API, for exercising the social collector offline.
+
+Serves /search.json and /r/<subreddit>/search.json with deterministic synthetic posts per
+(subreddit, query): --posts posts spread over the last 60 days, filtered by the `t=`
+window, paged with `limit`/`after` like Reddit. /r/missing/... returns 404, every
+--fail-every'th request returns 429 (to exercise retries), and /_stats reports how many
+requests were served.
+
+Usage (from research_agent/):
+  python scripts/fake_reddit_server.py --port 8765
+  REDDIT_BASE_URL=http://127.0.0.1:8765 python cli.py validate --topic "AI" --subreddits all,MachineLearning
+
+  python scripts/fake_reddit_server.py --selfcheck   # run the collector against it and verify
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+WINDOW_DAYS = {'hour': 1 / 24, 'day': 1, 'week': 7, 'month': 31, 'year': 365, 'all': 10 ** 6}
+SPAN_DAYS = 60
+
+
+def synthetic_posts(subreddit: str, query: str, count: int, now: float):
+    seed = int(hashlib.sha256(f"{subreddit}|{query}".encode('utf-8')).hexdigest()[:8], 16)
+    posts = []
+    for i in range(count):
+        mix = (seed + i * 2654435761) % 2 ** 32
+        posts.append({
+            'id': f"{seed % 100000:05d}{i:04d}",
+            'title': f"{query} post {i} in r/{subreddit}",
+            'subreddit': subreddit,
+            'permalink': f"/r/{subreddit}/comments/{seed % 100000:05d}{i:04d}/",
+            'score': mix % 5000,
+            'num_comments': mix % 700,
+            'created_utc': now - (mix % (SPAN_DAYS * 86400)),
+        })
+    posts.sort(key=lambda post: post['score'], reverse=True)
+    return posts
+
+
+class FakeRedditServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, posts: int = 250, fail_every: int = 0):
+        super().__init__(address, FakeRedditHandler)
+        self.posts = posts
+        self.fail_every = fail_every
+        self.requests = 0
+        self.lock = threading.Lock()
+        self.started = time.time()
+
+
+class FakeRedditHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, payload) -> None:
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if status == 429:
+            self.send_header('Retry-After', '0')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        server = self.server
+        parsed = urlparse(self.path)
+        if parsed.path == '/_stats':
+            self._send_json(200, {'requests': server.requests})
+            return
+        with server.lock:
+            server.requests += 1
+            count = server.requests
+        if server.fail_every and count % server.fail_every == 0:
+            self._send_json(429, {'message': 'Too Many Requests'})
+            return
+
+        parts = parsed.path.strip('/').split('/')
+        if parts == ['search.json']:
+            subreddit = 'all'
+        elif len(parts) == 3 and parts[0] == 'r' and parts[2] == 'search.json' and parts[1] != 'missing':
+            subreddit = parts[1]
+        else:
+            self._send_json(404, {'message': 'Not Found', 'error': 404})
+            return
+
+        params = {key: values[-1] for key, values in parse_qs(parsed.query).items()}
+        window = WINDOW_DAYS.get(params.get('t', 'all'), WINDOW_DAYS['all'])
+        now = time.time()
+        posts = [post for post in synthetic_posts(subreddit, params.get('q', ''), server.posts, server.started)
+                 if post['created_utc'] >= now - window * 86400]
+        limit = min(int(params.get('limit', 25)), 100)
+        start = 0
+        if params.get('after'):
+            ids = [f"t3_{post['id']}" for post in posts]
+            start = ids.index(params['after']) + 1 if params['after'] in ids else len(posts)
+        page = posts[start:start + limit]
+        after = f"t3_{page[-1]['id']}" if page and start + limit < len(posts) else None
+        self._send_json(200, {'kind': 'Listing', 'data': {
+            'after': after,
+            'children': [{'kind': 't3', 'data': post} for post in page],
+        }})
+
+
+def start_server(port: int = 0, posts: int = 250, fail_every: int = 0) -> FakeRedditServer:
+    server = FakeRedditServer(('127.0.0.1', port), posts=posts, fail_every=fail_every)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def selfcheck(posts: int) -> bool:
+    from src.scrapers.social_scrapers import SocialScraper
+    from src.storage.response_cache import ResponseCache
+
+    server = start_server(posts=posts, fail_every=7)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    subreddits = ['all', 'MachineLearning', 'startups']
+    topics = [f"topic {i}" for i in range(5)]
+    with tempfile.TemporaryDirectory() as tmp:
+        # Same collection twice against one cache: the second run must not touch the network
+        runs = []
+        for _ in range(2):
+            cache = ResponseCache(str(Path(tmp) / 'social_cache.db'), ttl_seconds=3600)
+            scraper = SocialScraper(subreddits=subreddits, base_url=base_url, cache=cache, max_pages=10,
+                                    per_host_delay=0, retries=3)
+            before = server.requests
+            started = time.perf_counter()
+            results = scraper.fetch_many(topics, days=7)
+            runs.append({
+                'items': sum(len(items) for items in results.values()),
+                'requests': server.requests - before,
+                'cache_hits': cache.hits,
+                'errors': len(scraper.errors),
+                'seconds': round(time.perf_counter() - started, 3),
+            })
+        print(json.dumps({'runs': runs}))
+
+        # A subreddit that 404s is reported once per topic, without retries
+        server.fail_every = 0
+        before = server.requests
+        failing = SocialScraper(subreddits=['missing'], base_url=base_url, per_host_delay=0, retries=3)
+        failing.fetch_many(topics, days=7)
+        missing_requests = server.requests - before
+
+    # Every in-window post of every subreddit, across all pages
+    expected = 0
+    for topic in topics:
+        for subreddit in subreddits:
+            expected += sum(1 for post in synthetic_posts(subreddit, topic, posts, server.started)
+                            if post['created_utc'] >= time.time() - 7 * 86400)
+    checks = {
+        'all_pages_collected': runs[0]['items'] == expected and runs[0]['errors'] == 0,
+        'second_run_no_network': runs[1]['requests'] == 0 and runs[1]['items'] == expected,
+        'errors_reported_not_retried': len(failing.errors) == len(topics) and missing_requests == len(topics),
+    }
+    print(json.dumps({'expected_items': expected, 'checks': checks}))
+    server.shutdown()
+    return all(checks.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local fake Reddit search API')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--posts', type=int, default=250, help='Synthetic posts per (subreddit, query)')
+    parser.add_argument('--fail-every', type=int, default=0, help='Answer every Nth request with 429 (0 = never)')
+    parser.add_argument('--selfcheck', action='store_true', help='Run the collector against a private instance and verify')
+    args = parser.parse_args()
+
+    if args.selfcheck:
+        if not selfcheck(args.posts):
+            print("❌ Social collector self-check failed", file=sys.stderr)
+            sys.exit(1)
+        print("✅ Social collector self-check passed", file=sys.stderr)
+        return
+
+    server = FakeRedditServer(('127.0.0.1', args.port), posts=args.posts, fail_every=args.fail_every)
+    print(f"🧪 Fake Reddit API on http://127.0.0.1:{args.port} (REDDIT_BASE_URL=http://127.0.0.1:{args.port})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
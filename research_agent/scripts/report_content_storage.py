@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Bytes-on-disk and read-throughput report for compressed, content-addressed crawled bodies.
+
+- storage: logical bytes (one copy per crawled row), unique bytes after dedup, stored
+  (compressed) bytes, and the database file size / free pages
+- --vacuum: VACUUM and report the file size before and after (reclaims pages freed by the
+  migration from inline markdown)
+- read throughput: MB/s of decompressed markdown read through the blob join, against the
+  same bodies copied inline into a TEMP table (what the pre-blob schema read)
+
+Opening the database runs the migration of any inline rows, so point --db at a copy to
+compare against the original file.
+
+Usage (from research_agent/):
+  python scripts/report_content_storage.py --db data/research.db
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from src.storage.db import DatabaseManager  # noqa: E402
+
+
+def read_seconds(conn, sql: str, repeat: int):
+    best, total = None, 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        total = sum(len(row[0].encode('utf-8')) for row in conn.execute(sql))
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, total
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Crawled content storage and read-throughput report')
+    parser.add_argument('--db', default=str(BASE_DIR / 'data' / 'research.db'))
+    parser.add_argument('--vacuum', action='store_true', help='VACUUM and report file size before/after')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    db = DatabaseManager(args.db)
+    stats = db.content_storage_stats()
+    if stats['unique_bytes']:
+        stats['dedup_factor'] = round(stats['logical_bytes'] / stats['unique_bytes'], 2)
+        stats['compression_ratio'] = round(stats['unique_bytes'] / max(stats['stored_bytes'], 1), 2)
+        stats['reduction'] = round(1 - stats['stored_bytes'] / max(stats['logical_bytes'], 1), 4)
+    print(json.dumps({'storage': stats}))
+
+    if args.vacuum:
+        before = stats['db_bytes']
+        db._write(lambda cur: None)  # drain pending writes
+        db._connect().execute("VACUUM")
+        after = db.content_storage_stats()['db_bytes']
+        print(json.dumps({'vacuum': {'db_bytes_before': before, 'db_bytes_after': after}}))
+
+    conn = db._connect()
+    blob_sql = """
+        SELECT decompress_content(b.codec, b.data)
+        FROM crawled_content cc JOIN content_blobs b ON b.hash = cc.content_hash
+    """
+    conn.execute("DROP TABLE IF EXISTS temp.inline_content")
+    conn.execute(f"CREATE TEMP TABLE inline_content AS {blob_sql.replace(')', ') AS markdown_content', 1)}")
+    blob_s, blob_bytes = read_seconds(conn, blob_sql, args.repeat)
+    inline_s, inline_bytes = read_seconds(conn, "SELECT markdown_content FROM temp.inline_content", args.repeat)
+    conn.execute("DROP TABLE temp.inline_content")
+    mb = 1024 * 1024
+    print(json.dumps({'read_throughput': {
+        'bytes': blob_bytes,
+        'compressed_mb_per_s': round(blob_bytes / mb / blob_s, 1) if blob_s else None,
+        'inline_mb_per_s': round(inline_bytes / mb / inline_s, 1) if inline_s else None,
+    }}))
+    db.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Streaming markdown chunker for long-document embedding.
+
+all-MiniLM-L6-v2 only sees its first 256 word pieces, so long crawled articles are split
+into heading-aware chunks under a word-piece budget, with overlap between consecutive
+chunks of the same section.
+
+Sizes are measured with a `count_tokens(words) -> [word pieces per word]` callable. BERT
+tokenizers split on whitespace before word-piecing, so per-word counts add up exactly to
+the count of the joined text; build one from the encoder's tokenizer with
+batching.word_token_counter. Without a tokenizer, approx_token_counts gives a
+conservative estimate.
+"""
+
+import io
+import math
+import re
+from typing import Callable, Iterator, Dict, Any, List, Optional, Sequence, Tuple
+
+HEADING_RE = re.compile(r'^(#{1,6})\s+(.*?)\s*#*\s*$')
+PIECE_RE = re.compile(r'[A-Za-z]+|[0-9]+|[^\sA-Za-z0-9]')
+
+MODEL_MAX_TOKENS = 256  # all-MiniLM-L6-v2 max_seq_length
+SPECIAL_TOKENS = 2  # [CLS] + [SEP]
+DEFAULT_MAX_TOKENS = MODEL_MAX_TOKENS
+DEFAULT_OVERLAP_TOKENS = 32
+
+TokenCounter = Callable[[Sequence[str]], List[int]]
+
+
+def approx_token_counts(words: Sequence[str]) -> List[int]:
+    """
+    Word-piece estimate per word without a tokenizer: every punctuation mark is its own
+    piece, letter runs cost one piece per 4 characters and digit runs one per 2 (word-piece
+    vocabularies split rare words and long numbers much more than common words)
+    """
+    counts = []
+    for word in words:
+        total = 0
+        for piece in PIECE_RE.findall(word):
+            if piece[0].isalpha():
+                total += math.ceil(len(piece) / 4)
+            elif piece[0].isdigit():
+                total += math.ceil(len(piece) / 2)
+            else:
+                total += 1
+        counts.append(max(1, total))
+    return counts
+
+
+def count_text_tokens(text: str, count_tokens: Optional[TokenCounter] = None) -> int:
+    """
+    Word pieces in `text` (without special tokens)
+    """
+    return sum((count_tokens or approx_token_counts)(text.split()))
+
+
+def iter_markdown_sections(markdown: str) -> Iterator[Tuple[str, List[str]]]:
+    """
+    Yield (heading path, words) per markdown section, reading the text line by line
+    """
+    path: List[str] = []
+    words: List[str] = []
+    for line in io.StringIO(markdown or ''):
+        match = HEADING_RE.match(line.strip())
+        if match:
+            if words:
+                yield ' > '.join(path), words
+                words = []
+            level = len(match.group(1))
+            path = path[:level - 1] + [match.group(2)]
+            continue
+        words.extend(line.split())
+    if words:
+        yield ' > '.join(path), words
+
+
+def iter_windows(words: List[str], counts: List[int], budget: int, overlap_tokens: int) -> Iterator[List[str]]:
+    """
+    Cut words into windows of at most `budget` word pieces, repeating up to
+    `overlap_tokens` pieces between consecutive windows. A single word over the budget
+    becomes a window of its own (the encoder truncates it).
+    """
+    budget = max(1, int(budget))
+    start = 0
+    while start < len(words):
+        end, used = start, 0
+        while end < len(words) and (end == start or used + counts[end] <= budget):
+            used += counts[end]
+            end += 1
+        yield words[start:end]
+        if end >= len(words):
+            return
+        # Step back over whole words for the overlap, always moving forward by at least one
+        next_start, kept = end, 0
+        while next_start - 1 > start and kept + counts[next_start - 1] <= overlap_tokens:
+            next_start -= 1
+            kept += counts[next_start]
+        start = next_start
+
+
+def iter_markdown_chunks(markdown: str, max_tokens: int = DEFAULT_MAX_TOKENS,
+                         overlap_tokens: int = DEFAULT_OVERLAP_TOKENS,
+                         count_tokens: Optional[TokenCounter] = None,
+                         reserve_tokens: Optional[Callable[[str], int]] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Yield {'heading', 'text'} chunks whose text is at most `max_tokens` word pieces, minus
+    `reserve_tokens(heading)` held back for whatever the caller prepends to that chunk.
+
+    Small adjacent sections are packed together; a section longer than the budget is cut
+    with a sliding window that repeats about `overlap_tokens` word pieces between
+    consecutive chunks.
+    """
+    count_tokens = count_tokens or approx_token_counts
+    max_tokens = max(1, int(max_tokens))
+
+    def budget_for(heading: str) -> int:
+        return max(1, max_tokens - (reserve_tokens(heading) if reserve_tokens else 0))
+
+    pending_heading = ''
+    pending: List[str] = []
+    pending_tokens = 0
+    for heading, words in iter_markdown_sections(markdown):
+        counts = count_tokens(words)
+        size = sum(counts)
+        budget = budget_for(heading)
+        if size > budget:
+            if pending:
+                yield {'heading': pending_heading, 'text': ' '.join(pending)}
+                pending, pending_tokens = [], 0
+            overlap = max(0, min(int(overlap_tokens), budget - 1))
+            for window in iter_windows(words, counts, budget, overlap):
+                yield {'heading': heading, 'text': ' '.join(window)}
+            continue
+        if pending and pending_tokens + size > budget_for(pending_heading):
+            yield {'heading': pending_heading, 'text': ' '.join(pending)}
+            pending, pending_tokens = [], 0
+        if not pending:
+            pending_heading = heading
+        pending.extend(words)
+        pending_tokens += size
+    if pending:
+        yield {'heading': pending_heading, 'text': ' '.join(pending)}
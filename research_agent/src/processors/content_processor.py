@@ -9,19 +9,28 @@ import aiohttp
 import base64
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple, AsyncIterator
 from urllib.parse import urlparse
 from fake_useragent import UserAgent
 
 # crawl4ai imports
 from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig
 
+from ..utils.politeness import AsyncHostThrottle
+
 
 class ContentProcessor:
-    def __init__(self):
+    def __init__(self, max_concurrency: int = 8, per_host_concurrency: int = 2,
+                 per_host_delay: float = 1.0, url_timeout: float = 60.0):
         self.ua = UserAgent()
         self.headers = {'User-Agent': self.ua.random}
         self.aio_session = None
+        
+        # Crawl scheduling: global cap, per-host politeness, per-URL time budget
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.per_host_concurrency = max(1, int(per_host_concurrency))
+        self.per_host_delay = per_host_delay
+        self.url_timeout = url_timeout
     
     async def _get_aio_session(self):
         if self.aio_session is None or self.aio_session.closed:
@@ -65,47 +74,48 @@ class ContentProcessor:
             print(f"    ❌ GitHub API Error: {e}")
             return {'success': False, 'error': str(e)}
 
-    async def crawl_content_from_urls(self, results: Dict[str, List[Dict[str, Any]]]) -> Dict[str, str]:
+    async def crawl_content_from_urls(self, results: Dict[str, List[Dict[str, Any]]]) -> Dict[str, Dict[str, Any]]:
         """
         Crawl actual content from collected URLs using crawl4ai
         """
         print(f"\n🕷️  Starting content crawling with crawl4ai...")
         print("=" * 60)
         
-        # Collect all URLs from different sources
-        all_urls = []
-        url_source_map = {}
+        unique_urls, url_source_map = self._collect_crawl_targets(results)
         
-        # Add Hacker News URLs
-        for article in results['hackernews']:
-            if article.get('url') and self._is_valid_url(article['url']):
-                all_urls.append(article['url'])
-                url_source_map[article['url']] = {
-                    'source': 'hackernews',
-                    'title': article['title'],
-                    'points': article.get('points', 0)
-                }
+        print(f"📊 Found {len(unique_urls)} unique URLs to crawl "
+              f"(concurrency={self.max_concurrency}, per-host={self.per_host_concurrency}, "
+              f"delay={self.per_host_delay}s, timeout={self.url_timeout}s)")
         
-        # Add RSS URLs
-        for article in results['rss']:
-            if article.get('url') and self._is_valid_url(article['url']):
-                all_urls.append(article['url'])
-                url_source_map[article['url']] = {
-                    'source': article['source'],
-                    'title': article['title'],
-                    'author': article.get('author', 'Unknown')
-                }
+        if not unique_urls:
+            print("❌ No valid URLs found for crawling")
+            return {}
         
-        # Note: ArXiv papers are PDFs, so we skip them for content crawling
+        finished = {}
+        async for result_data in self.iter_crawl_results(unique_urls, url_source_map):
+            finished[result_data['url']] = result_data
+            status = (f"✅ {result_data.get('word_count', 0)} words" if result_data.get('success')
+                      else f"❌ {result_data.get('error', 'Unknown error')}")
+            print(f"  [{len(finished):3d}/{len(unique_urls)}] {status} - {result_data['url'][:80]}")
         
-        # Remove duplicates while preserving order
-        unique_urls = list(dict.fromkeys(all_urls))
+        # Keep the original URL order regardless of completion order
+        crawled_content = {url: finished[url] for url in unique_urls if url in finished}
         
-        print(f"📊 Found {len(unique_urls)} unique URLs to crawl")
+        successful_crawls = sum(1 for content in crawled_content.values() if content.get('success'))
+        print(f"\n✅ Content crawling completed!")
+        print(f"   📊 Successfully crawled: {successful_crawls}/{len(unique_urls)} URLs")
         
-        if not unique_urls:
-            print("❌ No valid URLs found for crawling")
-            return {}
+        return crawled_content
+    
+    async def iter_crawl_results(self, urls: List[str], url_source_map: Optional[Dict[str, Dict[str, Any]]] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Crawl URLs concurrently and yield each result dict as soon as it finishes.
+        
+        At most `max_concurrency` crawls run at once overall, at most `per_host_concurrency`
+        per host, request starts on one host are spaced by `per_host_delay`, and every URL
+        is bounded by `url_timeout` seconds.
+        """
+        url_source_map = url_source_map or {}
         
         # Configure crawl4ai
         browser_config = BrowserConfig(
@@ -119,11 +129,15 @@ class ContentProcessor:
             cache_mode="enabled"      # Use caching to avoid re-crawling
         )
         
-        crawled_content = {}
-        
         crawler = AsyncWebCrawler(config=browser_config)
-
-        for i, url in enumerate(unique_urls, 1):
+        # Start the browser once up front so concurrent arun() calls share it
+        await crawler.start()
+        
+        global_limit = asyncio.Semaphore(self.max_concurrency)
+        throttle = AsyncHostThrottle(per_host_concurrency=self.per_host_concurrency,
+                                     per_host_delay=self.per_host_delay)
+        
+        async def crawl_one(url: str) -> Dict[str, Any]:
             source_info = url_source_map.get(url, {})
             result_data = {
                 'url': url,
@@ -132,47 +146,83 @@ class ContentProcessor:
                 'success': False
             }
             try:
-                print(f"  [{i:2d}/{len(unique_urls)}] Crawling: {url[:80]}...")
-
-                if 'github.com' in url:
-                    content_result = await self.fetch_github_readme(url)
-                else:
-                    result = await crawler.arun(url=url, config=crawler_config)
-                    if result.success and result.markdown:
-                        markdown_text = str(result.markdown)
-                        content_result = {
-                            'success': True,
-                            'markdown_content': markdown_text,
-                            'word_count': len(markdown_text.split()),
-                            'crawled_at': datetime.now().isoformat()
-                        }
-                    else:
-                        content_result = {'success': False, 'error': result.error_message if result else 'Unknown error'}
-
+                # The host's start time is booked only once a global permit is held, so
+                # queueing for the global limit doesn't leave stale per-host reservations
+                async with throttle.slot(url, gate=global_limit):
+                    content_result = await asyncio.wait_for(
+                        self._fetch_content(crawler, crawler_config, url),
+                        timeout=self.url_timeout
+                    )
                 if content_result['success']:
                     result_data.update(content_result)
-                    print(f"    ✅ Success - {result_data.get('word_count', 0)} words extracted")
                 else:
                     result_data['error'] = content_result.get('error', 'Unknown error')
-                    print(f"    ❌ Failed - {result_data['error']}")
-
+            except asyncio.TimeoutError:
+                result_data['error'] = f"Timed out after {self.url_timeout}s"
             except Exception as e:
-                print(f"    ❌ Exception - {str(e)}")
                 result_data['error'] = str(e)
-            
-            crawled_content[url] = result_data
-            
-            # Be polite - small delay between requests
-            await asyncio.sleep(1)
-
-        await crawler.close()
-        await self._close_aio_session()
+            return result_data
         
-        successful_crawls = sum(1 for content in crawled_content.values() if content.get('success'))
-        print(f"\n✅ Content crawling completed!")
-        print(f"   📊 Successfully crawled: {successful_crawls}/{len(unique_urls)} URLs")
+        tasks = [asyncio.create_task(crawl_one(url)) for url in urls]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await crawler.close()
+            await self._close_aio_session()
+    
+    async def _fetch_content(self, crawler: AsyncWebCrawler, crawler_config: CrawlerRunConfig, url: str) -> Dict[str, Any]:
+        """
+        Fetch one URL: GitHub repos go through the README API, everything else through crawl4ai
+        """
+        if 'github.com' in url:
+            return await self.fetch_github_readme(url)
         
-        return crawled_content
+        result = await crawler.arun(url=url, config=crawler_config)
+        if result.success and result.markdown:
+            markdown_text = str(result.markdown)
+            return {
+                'success': True,
+                'markdown_content': markdown_text,
+                'word_count': len(markdown_text.split()),
+                'crawled_at': datetime.now().isoformat()
+            }
+        return {'success': False, 'error': result.error_message if result else 'Unknown error'}
+    
+    def _collect_crawl_targets(self, results: Dict[str, List[Dict[str, Any]]]) -> Tuple[List[str], Dict[str, Dict[str, Any]]]:
+        """
+        Collect unique crawlable URLs (HN + RSS) and their source info from scrape results
+        """
+        all_urls = []
+        url_source_map = {}
+        
+        # Add Hacker News URLs
+        for article in results.get('hackernews', []):
+            if article.get('url') and self._is_valid_url(article['url']):
+                all_urls.append(article['url'])
+                url_source_map[article['url']] = {
+                    'source': 'hackernews',
+                    'title': article['title'],
+                    'points': article.get('points', 0)
+                }
+        
+        # Add RSS URLs
+        for article in results.get('rss', []):
+            if article.get('url') and self._is_valid_url(article['url']):
+                all_urls.append(article['url'])
+                url_source_map[article['url']] = {
+                    'source': article['source'],
+                    'title': article['title'],
+                    'author': article.get('author', 'Unknown')
+                }
+        
+        # Note: ArXiv papers are PDFs, so we skip them for content crawling
+        
+        # Remove duplicates while preserving order
+        return list(dict.fromkeys(all_urls)), url_source_map
     
     def _is_valid_url(self, url: str) -> bool:
         """
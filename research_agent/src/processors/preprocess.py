@@ -3,7 +3,12 @@
 Preprocessing utilities for building clean text for embeddings
 """
 
-from typing import Optional
+import hashlib
+import json
+from typing import Optional, Iterator, Dict, Any
+
+from .chunker import (iter_markdown_chunks, iter_windows, approx_token_counts, count_text_tokens,
+                      TokenCounter, DEFAULT_MAX_TOKENS, DEFAULT_OVERLAP_TOKENS, SPECIAL_TOKENS)
 
 
 def build_document_for_embedding(title: str, summary: Optional[str], full_content: Optional[str]) -> str:
@@ -20,4 +25,54 @@ def build_document_for_embedding(title: str, summary: Optional[str], full_conten
     return "\n\n".join(parts)
 
 
+def document_hash(document: str, metadata: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Stable hash of an embedding document plus the metadata stored with its vectors (used to
+    skip unchanged re-embeds; a metadata-only change must still rewrite the stored metadata)
+    """
+    digest = hashlib.sha256(document.encode('utf-8'))
+    if metadata:
+        digest.update(b'\0' + json.dumps(metadata, sort_keys=True, default=str).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def iter_document_chunks(title: str, summary: Optional[str], full_content: Optional[str],
+                         max_tokens: int = DEFAULT_MAX_TOKENS,
+                         overlap_tokens: int = DEFAULT_OVERLAP_TOKENS,
+                         count_tokens: Optional[TokenCounter] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Yield {'index', 'heading', 'text'} embedding chunks for one article.
+
+    Chunk 0 is the title + summary; every content chunk is prefixed with the title (and
+    its section heading) so it stays retrievable on its own. Every chunk, prefix and
+    [CLS]/[SEP] included, fits in `max_tokens` word pieces as measured by `count_tokens`
+    (see chunker.py); a summary over the budget is split across several leading chunks.
+    """
+    count_tokens = count_tokens or approx_token_counts
+    budget = max(1, int(max_tokens) - SPECIAL_TOKENS)
+    title = (title or '').strip()
+    index = 0
+    header = build_document_for_embedding(title=title, summary=summary, full_content=None)
+    if header and count_text_tokens(header, count_tokens) > budget and (summary or '').strip():
+        words = summary.strip().split()
+        head = (f"Title: {title}\n\n" if title else '') + "Summary: "
+        room = budget - count_text_tokens(head, count_tokens)
+        for window in iter_windows(words, count_tokens(words), room, min(overlap_tokens, max(0, room - 1))):
+            yield {'index': index, 'heading': '', 'text': head + ' '.join(window)}
+            index += 1
+    elif header:
+        yield {'index': index, 'heading': '', 'text': header}
+        index += 1
+
+    def prefix_for(heading: str) -> str:
+        prefix = f"Title: {title}\n" if title else ''
+        if heading:
+            prefix += f"Section: {heading}\n"
+        return prefix
 
+    for chunk in iter_markdown_chunks((full_content or '').strip(), max_tokens=budget, overlap_tokens=overlap_tokens,
+                                      count_tokens=count_tokens,
+                                      reserve_tokens=lambda heading: count_text_tokens(prefix_for(heading), count_tokens)):
+        prefix = prefix_for(chunk['heading'])
+        yield {'index': index, 'heading': chunk['heading'], 'text': f"{prefix}\n{chunk['text']}" if prefix else chunk['text']}
+        index += 1
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Trend/velocity scoring over the daily_signals rollup.
+
+Per-day series for any number of topics are loaded into one (topics x days x metrics)
+array, and every statistic is computed with array operations across all topics at once:
+
+- activity: the per-day weighted sum of articles/points/comments/crawled (same weights
+  as the base score), so a topic's trend is on the scale its totals are scored on
+- short/long moving averages of activity (trailing, over consecutive calendar days; days
+  with no articles count as zero activity)
+- velocity: change in the short moving average per day over the last short window;
+  acceleration: that velocity minus the one over the window before it
+- z-score: mean activity over the last short window against the trailing baseline
+  (the baseline_days before it), with the baseline std floored at 1 so sparse series
+  with a near-constant baseline don't produce huge scores
+"""
+
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from src.storage.db import DatabaseManager
+
+METRICS = ('articles', 'points', 'comments', 'crawled')
+ACTIVITY_WEIGHTS = np.array([1.0, 0.5, 0.2, 0.1])  # matches MarketValidator._compute_score
+MIN_BASELINE_STD = 1.0
+
+
+class DailySeries:
+    """
+    values[t, d, m]: metric m of topics[t] on UTC day start_day + d (zero-filled)
+    """
+
+    def __init__(self, topics: List[str], start_day: int, values: np.ndarray):
+        self.topics = topics
+        self.start_day = start_day
+        self.values = values
+
+    @property
+    def activity(self) -> np.ndarray:
+        return self.values @ ACTIVITY_WEIGHTS
+
+
+def trailing_mean(x: np.ndarray, window: int) -> np.ndarray:
+    """
+    Trailing moving average along the last axis (shorter windows over the first days)
+    """
+    csum = np.cumsum(x, axis=-1)
+    out = csum.copy()
+    out[..., window:] = csum[..., window:] - csum[..., :-window]
+    counts = np.minimum(np.arange(1, x.shape[-1] + 1), window)
+    return out / counts
+
+
+class TrendEngine:
+    def __init__(self, short_window: int = 3, long_window: int = 7, baseline_days: int = 28,
+                 rising_z: float = 2.0, cooling_z: float = -1.0):
+        self.short_window = short_window
+        self.long_window = long_window
+        self.baseline_days = baseline_days
+        self.rising_z = rising_z
+        self.cooling_z = cooling_z
+
+    @property
+    def span_days(self) -> int:
+        # Two short windows for acceleration, plus the baseline behind the recent window
+        return max(self.baseline_days + self.short_window, 3 * self.short_window, self.long_window)
+
+    def load(self, db: DatabaseManager, topics: Optional[Sequence[str]] = None,
+             end_day: Optional[int] = None) -> DailySeries:
+        """
+        Series for `topics` (every topic in the rollup if None) over the span_days ending
+        at `end_day` (today, UTC)
+        """
+        end_day = int(time.time()) // 86400 if end_day is None else int(end_day)
+        start_day = end_day - self.span_days + 1
+        rows = db.daily_signal_series(start_day, topics=list(topics) if topics is not None else None)
+        names = list(dict.fromkeys(topics)) if topics is not None else sorted({row['topic'] for row in rows})
+        index = {topic: i for i, topic in enumerate(names)}
+        values = np.zeros((len(names), self.span_days, len(METRICS)), dtype=np.float64)
+        if rows:
+            t = np.array([index[row['topic']] for row in rows])
+            d = np.array([row['day'] - start_day for row in rows])
+            keep = d < self.span_days
+            values[t[keep], d[keep]] = np.array([[row[m] for m in METRICS] for row in rows], dtype=np.float64)[keep]
+        return DailySeries(names, start_day, values)
+
+    def score(self, series: DailySeries) -> Dict[str, Dict[str, Any]]:
+        """
+        Trend statistics per topic (all topics scored together)
+        """
+        if not series.topics:
+            return {}
+        s = self.short_window
+        activity = series.activity
+        ma_short = trailing_mean(activity, s)
+        ma_long = trailing_mean(activity, self.long_window)
+        velocity = (ma_short[:, -1] - ma_short[:, -1 - s]) / s
+        previous_velocity = (ma_short[:, -1 - s] - ma_short[:, -1 - 2 * s]) / s
+        acceleration = velocity - previous_velocity
+
+        recent = activity[:, -s:].mean(axis=1)
+        baseline = activity[:, -s - self.baseline_days:-s]
+        baseline_mean = baseline.mean(axis=1)
+        baseline_std = np.maximum(baseline.std(axis=1), MIN_BASELINE_STD)
+        z = (recent - baseline_mean) / baseline_std
+
+        labels = np.full(len(series.topics), 'steady', dtype=object)
+        labels[z <= self.cooling_z] = 'cooling'
+        labels[(recent == 0) & (baseline_mean > 0)] = 'stale'
+        labels[(z >= self.rising_z) & (velocity > 0)] = 'rising'
+        labels[activity.sum(axis=1) == 0] = 'no data'
+
+        return {
+            topic: {
+                'recent_activity': float(recent[i]),
+                'baseline_activity': float(baseline_mean[i]),
+                'ma_short': float(ma_short[i, -1]),
+                'ma_long': float(ma_long[i, -1]),
+                'velocity': float(velocity[i]),
+                'acceleration': float(acceleration[i]),
+                'z_score': float(z[i]),
+                'label': labels[i],
+                'daily_activity': [round(float(v), 2) for v in activity[i, -self.long_window:]],
+            }
+            for i, topic in enumerate(series.topics)
+        }
+
+    def score_topics(self, db: DatabaseManager, topics: Optional[Sequence[str]] = None,
+                     end_day: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+        return self.score(self.load(db, topics, end_day=end_day))
@@ -1,17 +1,19 @@
 #!/usr/bin/env python3
 """
-Market validation: combine DB metrics and social signals into a simple score and report.
+Market validation: combine DB metrics and social signals into a simple score and report,
+with a trend section (see trends.py) that separates rising topics from large but stale ones.
 """
 
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 
+from src.processors.trends import TrendEngine
 from src.storage.db import DatabaseManager
 
 
 class MarketValidator:
-    def __init__(self):
-        pass
+    def __init__(self, trend_engine: Optional[TrendEngine] = None):
+        self.trends = trend_engine or TrendEngine()
 
     def _compute_score(self, db_metrics: Dict[str, Any], social_items: List[Dict[str, Any]]) -> Dict[str, Any]:
         social_score = sum(item.get('score', 0) + item.get('comments', 0) * 0.5 for item in social_items)
@@ -28,9 +30,29 @@ class MarketValidator:
             'total_score': total
         }
 
-    def generate_report(self, db: DatabaseManager, social_items: List[Dict[str, Any]], topic: str, days: int) -> Tuple[str, Dict[str, Any]]:
-        metrics = db.aggregate_signals(topic=topic, days=days)
+    def _trend_lines(self, trend: Dict[str, Any]) -> List[str]:
+        engine = self.trends
+        return [
+            f"- Trend: **{trend['label']}** (z-score {trend['z_score']:+.2f} vs the {engine.baseline_days}-day baseline)",
+            f"- Activity: last {engine.short_window} days avg {trend['recent_activity']:.1f}/day, "
+            f"baseline avg {trend['baseline_activity']:.1f}/day",
+            f"- Moving averages: {engine.short_window}-day {trend['ma_short']:.1f}, {engine.long_window}-day {trend['ma_long']:.1f}",
+            f"- Velocity: {trend['velocity']:+.2f}/day, acceleration: {trend['acceleration']:+.2f}",
+            f"- Daily activity (last {engine.long_window} days): {', '.join(f'{v:g}' for v in trend['daily_activity'])}",
+        ]
+
+    def generate_report(self, db: DatabaseManager, social_items: List[Dict[str, Any]], topic: str, days: int,
+                        metrics: Optional[Dict[str, Any]] = None,
+                        trend: Optional[Dict[str, Any]] = None) -> Tuple[str, Dict[str, Any]]:
+        """
+        Markdown report + summary for one topic; pass precomputed metrics/trend (batch
+        validation) to skip the per-topic queries
+        """
+        if metrics is None:
+            metrics = db.aggregate_signals(topic=topic, days=days)
         scores = self._compute_score(metrics, social_items)
+        if trend is None:
+            trend = self.trends.score_topics(db, [topic])[topic]
 
         lines = []
         lines.append(f"# Market Validation Report: {topic}")
@@ -42,6 +64,9 @@ class MarketValidator:
         lines.append(f"- HN comments total: {metrics['hn_comments']}")
         lines.append(f"- Crawled content count: {metrics['crawled_count']}")
         lines.append("")
+        lines.append("## Trend")
+        lines.extend(self._trend_lines(trend))
+        lines.append("")
         lines.append("## Social Signals (sample)")
         for item in social_items[:10]:
             lines.append(f"- [{item.get('title','')}]({item.get('url','')}) | score={item.get('score',0)} comments={item.get('comments',0)}")
@@ -56,7 +81,40 @@ class MarketValidator:
         lines.append("## Notes")
         lines.append("This is a heuristic MVP score combining collection volume and social traction.")
 
-        return "\n".join(lines), {'metrics': metrics, 'scores': scores}
+        return "\n".join(lines), {'metrics': metrics, 'scores': scores, 'trend': trend}
 
+    def generate_leaderboard(self, summaries: Dict[str, Dict[str, Any]], days: int,
+                             report_names: Optional[Dict[str, str]] = None) -> str:
+        """
+        Combined markdown leaderboard: topics ranked by total score, then the rising ones by z-score
+        """
+        report_names = report_names or {}
+        ranked = sorted(summaries.items(), key=lambda item: item[1]['scores']['total_score'], reverse=True)
 
+        lines = []
+        lines.append(f"# Market Validation Leaderboard ({len(summaries)} topics, last {days} days)")
+        lines.append(f"Generated: {datetime.utcnow().isoformat()} UTC")
+        lines.append("")
+        lines.append("## Ranking")
+        lines.append("| # | Topic | Total | Base | Social | Articles | Trend | z | Velocity |")
+        lines.append("|---|---|---|---|---|---|---|---|---|")
+        for rank, (topic, summary) in enumerate(ranked, 1):
+            scores, metrics, trend = summary['scores'], summary['metrics'], summary['trend']
+            name = f"[{topic}]({report_names[topic]})" if topic in report_names else topic
+            lines.append(
+                f"| {rank} | {name} | {scores['total_score']:.1f} | {scores['base_score']:.1f} | "
+                f"{scores['social_score']:.1f} | {metrics['articles']} | {trend['label']} | "
+                f"{trend['z_score']:+.2f} | {trend['velocity']:+.2f} |"
+            )
+        lines.append("")
+        lines.append("## Rising")
+        rising = sorted((item for item in summaries.items() if item[1]['trend']['label'] == 'rising'),
+                        key=lambda item: item[1]['trend']['z_score'], reverse=True)
+        for topic, summary in rising:
+            trend = summary['trend']
+            lines.append(f"- {topic}: z {trend['z_score']:+.2f}, velocity {trend['velocity']:+.2f}/day, "
+                         f"acceleration {trend['acceleration']:+.2f}")
+        if not rising:
+            lines.append("- (none)")
 
+        return "\n".join(lines)
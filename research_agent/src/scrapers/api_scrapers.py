@@ -7,13 +7,24 @@ Handles Hacker News, ArXiv, and other API-based data sources
 import requests
 import feedparser
 import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Iterator, Set
 from fake_useragent import UserAgent
 
+from ..storage.feed_cache import FeedCache
+from ..storage.timestamps import utc_epoch
+from ..storage.watermarks import Watermark
+
 
 class APIScrapers:
-    def __init__(self):
+    # Algolia serves at most 1000 hits per query, regardless of paging
+    HN_MAX_RESULTS_PER_QUERY = 1000
+    HN_BACKFILL_PAGE_SIZE = 200
+    
+    def __init__(self, timeout: float = 10, feed_cache: Optional[FeedCache] = None):
+        self.timeout = timeout
+        self.feed_cache = feed_cache
         self.ua = UserAgent()
         self.headers = {'User-Agent': self.ua.random}
         self.session = requests.Session()
@@ -29,10 +40,28 @@ class APIScrapers:
             'robotics': 'cs.RO'
         }
     
-    def fetch_hackernews(self, topic: str, days: int = 7) -> List[Dict[str, Any]]:
+    def fetch_hackernews(self, topic: str, days: int = 7, watermark: Optional[Watermark] = None,
+                         incomplete_sources: Optional[Set[str]] = None) -> List[Dict[str, Any]]:
         """
         Fetch Hacker News stories using Algolia API
+        
+        Without a watermark this is one relevance-ranked request (the top 50 matches). With
+        a watermark every matching story since it is paged through by date (search_by_date,
+        sliced like the backfill), so stories outside a top-N are never skipped; already
+        seen story IDs are dropped. 'hackernews' is added to `incomplete_sources` when the
+        fetch failed or did not return every match, so its watermark is not advanced.
         """
+        if watermark is not None:
+            print(f"🔍 Fetching Hacker News stories for '{topic}' since the watermark (by date)...")
+            end_ts = int(datetime.now().timestamp())
+            start_ts = max(end_ts - days * 86400, watermark.last_ts)
+            articles = [article for batch in self._iter_hn_window(topic, start_ts, end_ts, slice_hours=24, max_workers=4,
+                                                                  watermark=watermark,
+                                                                  incomplete_sources=incomplete_sources)
+                        for article in batch]
+            print(f"✅ Found {len(articles)} Hacker News articles")
+            return articles
+        
         print(f"🔍 Fetching Hacker News stories for '{topic}' (last {days} days)...")
         
         # Calculate timestamp for date filtering
@@ -49,23 +78,16 @@ class APIScrapers:
         articles = []
         
         try:
-            response = self.session.get(url, params=params, timeout=10)
+            response = self.session.get(url, params=params, timeout=self.timeout)
             response.raise_for_status()
             data = response.json()
+            hits = data.get('hits', [])
+            if int(data.get('nbHits', 0)) > len(hits) and incomplete_sources is not None:
+                # Only the top matches came back: not a complete picture to advance a watermark on
+                incomplete_sources.add('hackernews')
             
-            for hit in data.get('hits', []):
-                article = {
-                    'title': hit.get('title', ''),
-                    'url': hit.get('url', ''),
-                    'points': hit.get('points', 0),
-                    'comments_count': hit.get('num_comments', 0),
-                    'created_at': datetime.fromtimestamp(hit.get('created_at_i', 0)).isoformat(),
-                    'author': hit.get('author', ''),
-                    'source': 'hackernews',
-                    'story_id': hit.get('objectID', ''),
-                    'hn_url': f"https://news.ycombinator.com/item?id={hit.get('objectID', '')}"
-                }
-                
+            for hit in hits:
+                article = self._hn_hit_to_article(hit)
                 if article['title'] and article['url']:
                     articles.append(article)
             
@@ -73,18 +95,143 @@ class APIScrapers:
             
         except Exception as e:
             print(f"❌ Error fetching Hacker News: {str(e)}")
+            if incomplete_sources is not None:
+                incomplete_sources.add('hackernews')
         
         return articles
     
-    def fetch_arxiv_papers(self, topic: str, days: int = 7) -> List[Dict[str, Any]]:
+    def iter_hackernews_backfill(self, topic: str, days: int = 90, slice_hours: int = 24,
+                                 max_workers: int = 4, watermark: Optional[Watermark] = None,
+                                 incomplete_sources: Optional[Set[str]] = None) -> Iterator[List[Dict[str, Any]]]:
         """
-        Fetch ArXiv papers from RSS feeds
+        Exhaustively page through HN stories for `topic` over the last `days` days.
+        
+        The created_at_i window is cut into `slice_hours` slices that are fetched
+        concurrently (at most `max_workers` requests in flight). Algolia only serves the
+        first 1000 hits of any query, so a slice with more matches is split in half until
+        it fits. Yields one list of articles per fetched page, as pages complete, so the
+        caller can stream them into the DB. A watermark moves the window start forward.
+        If any slice or page fails, 'hackernews' is added to `incomplete_sources`.
+        """
+        print(f"🔍 Backfilling Hacker News stories for '{topic}' (last {days} days, "
+              f"{slice_hours}h slices, {max_workers} workers)...")
+        
+        end_ts = int(datetime.now().timestamp())
+        start_ts = end_ts - days * 86400
+        if watermark:
+            start_ts = max(start_ts, watermark.last_ts)
+        yield from self._iter_hn_window(topic, start_ts, end_ts, slice_hours=slice_hours, max_workers=max_workers,
+                                        watermark=watermark, incomplete_sources=incomplete_sources)
+    
+    def _iter_hn_window(self, topic: str, start_ts: int, end_ts: int, slice_hours: int, max_workers: int,
+                        watermark: Optional[Watermark] = None,
+                        incomplete_sources: Optional[Set[str]] = None) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Every matching story with start_ts <= created_at_i < end_ts, by date, one page per yield
+        """
+        step = max(1, int(slice_hours * 3600))
+        slices = [(lo, min(lo + step, end_ts)) for lo in range(start_ts, end_ts, step)]
+        
+        total = 0
+        pages_fetched = 0
+        failed = 0
+        with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix='hn-backfill') as executor:
+            # future -> (lo, hi, page)
+            pending = {executor.submit(self._fetch_hn_page, topic, lo, hi, 0): (lo, hi, 0) for lo, hi in slices}
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    lo, hi, page = pending.pop(future)
+                    try:
+                        data = future.result()
+                    except Exception as e:
+                        print(f"❌ Error fetching HN slice {lo}-{hi} page {page}: {str(e)}")
+                        failed += 1
+                        continue
+                    
+                    if page == 0:
+                        nb_hits = int(data.get('nbHits', 0))
+                        if nb_hits > self.HN_MAX_RESULTS_PER_QUERY and hi - lo > 60:
+                            # Too many matches to page through; split the slice and retry
+                            mid = lo + (hi - lo) // 2
+                            for sub_lo, sub_hi in ((lo, mid), (mid, hi)):
+                                pending[executor.submit(self._fetch_hn_page, topic, sub_lo, sub_hi, 0)] = (sub_lo, sub_hi, 0)
+                            continue
+                        if nb_hits > self.HN_MAX_RESULTS_PER_QUERY:
+                            # Cannot split below a minute: Algolia will only serve the first 1000
+                            print(f"⚠️ HN slice {lo}-{hi} has {nb_hits} matches; only the first "
+                                  f"{self.HN_MAX_RESULTS_PER_QUERY} are reachable")
+                            failed += 1
+                        for next_page in range(1, int(data.get('nbPages', 1))):
+                            pending[executor.submit(self._fetch_hn_page, topic, lo, hi, next_page)] = (lo, hi, next_page)
+                    
+                    hits = [hit for hit in data.get('hits', [])
+                            if not watermark or watermark.is_new(str(hit.get('objectID', '')), hit.get('created_at_i', 0))]
+                    articles = [a for a in (self._hn_hit_to_article(hit) for hit in hits) if a['title'] and a['url']]
+                    pages_fetched += 1
+                    total += len(articles)
+                    if articles:
+                        yield articles
+        
+        if failed:
+            print(f"⚠️ {failed} HN requests failed; the hackernews watermark will not advance this run")
+            if incomplete_sources is not None:
+                incomplete_sources.add('hackernews')
+        print(f"✅ Fetched {total} Hacker News articles from {pages_fetched} pages")
+    
+    def _fetch_hn_page(self, topic: str, lo: int, hi: int, page: int) -> Dict[str, Any]:
+        params = {
+            'query': topic,
+            'tags': 'story',
+            'numericFilters': f'created_at_i>={lo},created_at_i<{hi}',
+            'hitsPerPage': self.HN_BACKFILL_PAGE_SIZE,
+            'page': page
+        }
+        response = self.session.get("https://hn.algolia.com/api/v1/search_by_date", params=params, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+    
+    def _hn_hit_to_article(self, hit: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'title': hit.get('title', ''),
+            'url': hit.get('url', ''),
+            'points': hit.get('points', 0),
+            'comments_count': hit.get('num_comments', 0),
+            'created_at': datetime.utcfromtimestamp(hit.get('created_at_i', 0)).isoformat(),
+            'published_ts': int(hit.get('created_at_i', 0)),
+            'author': hit.get('author', ''),
+            'source': 'hackernews',
+            'story_id': hit.get('objectID', ''),
+            'hn_url': f"https://news.ycombinator.com/item?id={hit.get('objectID', '')}"
+        }
+    
+    def fetch_arxiv_papers(self, topic: str, days: int = 7, watermarks: Optional[Dict[str, Watermark]] = None,
+                           incomplete_sources: Optional[Set[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Fetch ArXiv papers from RSS feeds (failed categories are added to `incomplete_sources`
+        by watermark key, 'arxiv/<category>')
         """
         print(f"📚 Fetching ArXiv papers for '{topic}' (last {days} days)...")
         
         articles = []
         
-        # Map topic to ArXiv categories
+        for category in self.arxiv_categories_for_topic(topic):
+            try:
+                watermark = (watermarks or {}).get(f"arxiv/{category}")
+                articles.extend(self.fetch_arxiv_category(category, topic, days, watermark=watermark))
+                time.sleep(1)  # Be respectful to ArXiv
+            except Exception as e:
+                print(f"❌ Error fetching ArXiv category {category}: {str(e)}")
+                if incomplete_sources is not None:
+                    incomplete_sources.add(f"arxiv/{category}")
+        
+        print(f"✅ Found {len(articles)} ArXiv papers")
+        return articles
+    
+    def arxiv_categories_for_topic(self, topic: str) -> List[str]:
+        """
+        Map topic keywords to the ArXiv categories worth searching
+        """
         categories_to_search = []
         topic_lower = topic.lower()
         
@@ -105,47 +252,61 @@ class APIScrapers:
         if not categories_to_search:
             categories_to_search = ['cs.AI', 'cs.LG']
         
-        cutoff_date = datetime.now() - timedelta(days=days)
+        return categories_to_search
+    
+    def arxiv_feed_url(self, category: str) -> str:
+        return f"http://export.arxiv.org/rss/{category}"
+    
+    def fetch_arxiv_category(self, category: str, topic: str, days: int = 7,
+                             watermark: Optional[Watermark] = None) -> List[Dict[str, Any]]:
+        """
+        Fetch and topic-filter a single ArXiv category feed (raises on network errors)
+        """
+        rss_url = self.arxiv_feed_url(category)
+        print(f"  📡 Fetching from {rss_url}")
         
-        for category in categories_to_search:
-            try:
-                rss_url = f"http://export.arxiv.org/rss/{category}"
-                print(f"  📡 Fetching from {rss_url}")
-                
-                feed = feedparser.parse(rss_url)
-                
-                for entry in feed.entries:
-                    # Parse publication date
-                    pub_date = datetime(*entry.published_parsed[:6])
-                    
-                    if pub_date >= cutoff_date:
-                        # Extract ArXiv ID from link
-                        arxiv_id = entry.id.split('/')[-1]
-                        
-                        article = {
-                            'title': entry.title,
-                            'authors': entry.author if hasattr(entry, 'author') else 'Unknown',
-                            'abstract': entry.summary,
-                            'pdf_url': f"https://arxiv.org/pdf/{arxiv_id}.pdf",
-                            'arxiv_url': f"https://arxiv.org/abs/{arxiv_id}",
-                            'published_date': pub_date.isoformat(),
-                            'category': category,
-                            'source': 'arxiv',
-                            'arxiv_id': arxiv_id
-                        }
-                        
-                        # Filter by topic in title or abstract
-                        if self._matches_topic(topic, article['title'] + ' ' + article['abstract']):
-                            articles.append(article)
+        cutoff_date = datetime.utcnow() - timedelta(days=days)  # published_parsed is UTC
+        articles = []
+        
+        for entry in self._fetch_feed_entries(rss_url):
+            # Parse publication date
+            pub_date = datetime(*entry.published_parsed[:6])
+            
+            if pub_date >= cutoff_date:
+                # Extract ArXiv ID from link
+                arxiv_id = entry.id.split('/')[-1]
+                if watermark and not watermark.is_new(arxiv_id, utc_epoch(pub_date)):
+                    continue
                 
-                time.sleep(1)  # Be respectful to ArXiv
+                article = {
+                    'title': entry.title,
+                    'authors': entry.author if hasattr(entry, 'author') else 'Unknown',
+                    'abstract': entry.summary,
+                    'pdf_url': f"https://arxiv.org/pdf/{arxiv_id}.pdf",
+                    'arxiv_url': f"https://arxiv.org/abs/{arxiv_id}",
+                    'published_date': pub_date.isoformat(),
+                    'category': category,
+                    'source': 'arxiv',
+                    'arxiv_id': arxiv_id
+                }
                 
-            except Exception as e:
-                print(f"❌ Error fetching ArXiv category {category}: {str(e)}")
+                # Filter by topic in title or abstract
+                if self._matches_topic(topic, article['title'] + ' ' + article['abstract']):
+                    articles.append(article)
         
-        print(f"✅ Found {len(articles)} ArXiv papers")
         return articles
     
+    def _fetch_feed_entries(self, url: str) -> List[Any]:
+        """
+        Download a feed with a bounded timeout and parse it with feedparser
+        (conditional GET through the feed cache when one is attached)
+        """
+        if self.feed_cache is not None:
+            return self.feed_cache.fetch_entries(self.session, url, timeout=self.timeout)
+        response = self.session.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        return feedparser.parse(response.content, response_headers=dict(response.headers)).entries
+    
     def _matches_topic(self, topic: str, text: str) -> bool:
         """
         Simple topic matching using keywords
@@ -4,13 +4,19 @@ Base scraper orchestrator for research agent
 Coordinates all scraping activities and provides main interface
 """
 
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime
-from typing import Dict, Any, List
+from pathlib import Path
+from typing import Dict, Any, List, Tuple, Callable, Optional, Iterable, Iterator, Set
 
 from .api_scrapers import APIScrapers
 from .rss_scrapers import RSSScrapers
 from ..processors.content_processor import ContentProcessor
+from ..storage.feed_cache import FeedCache
 from ..storage.file_manager import FileManager
+from ..storage.watermarks import Watermark
+from ..utils.politeness import HostLease, HostThrottle
 
 
 class ResearchAgent:
@@ -19,17 +25,38 @@ class ResearchAgent:
     Coordinates scraping, processing, and storage
     """
     
-    def __init__(self, data_dir: str = "data"):
-        self.api_scrapers = APIScrapers()
-        self.rss_scrapers = RSSScrapers()
-        self.content_processor = ContentProcessor()
+    SOURCES = ('hackernews', 'arxiv', 'rss')
+    
+    def __init__(self, data_dir: str = "data", crawl_concurrency: int = 8, crawl_timeout: float = 60.0,
+                 use_feed_cache: bool = True):
+        # Conditional-GET cache for RSS/ArXiv feeds, stored next to research.db
+        self.feed_cache = FeedCache(str(Path(data_dir) / "feed_cache.db")) if use_feed_cache else None
+        self.api_scrapers = APIScrapers(feed_cache=self.feed_cache)
+        self.rss_scrapers = RSSScrapers(feed_cache=self.feed_cache)
+        self.content_processor = ContentProcessor(max_concurrency=crawl_concurrency, url_timeout=crawl_timeout)
         self.file_manager = FileManager(data_dir)
+        # Shared politeness for parallel scraping: one request at a time per host, 1s apart
+        self.host_throttle = HostThrottle(per_host_concurrency=1, per_host_delay=1.0)
     
-    def scrape_all(self, topic: str, days: int = 7) -> Dict[str, List[Dict[str, Any]]]:
+    def scrape_all(self, topic: str, days: int = 7, parallel: bool = False,
+                   source_timeout: float = 30.0, sources: Optional[Iterable[str]] = None,
+                   watermarks: Optional[Dict[str, Watermark]] = None) -> Dict[str, List[Dict[str, Any]]]:
         """
         Scrape all Phase 1 sources (without content extraction)
+        
+        With parallel=True every source and every individual feed is fetched concurrently,
+        each bounded by `source_timeout` seconds; politeness delays apply per host.
+        `sources` restricts scraping to a subset of SOURCES. `watermarks` (source key ->
+        Watermark, see storage.watermarks) skips items already ingested.
+        
+        Watermark keys of feeds that failed, timed out or returned only part of their
+        matches are listed in metadata['incomplete_sources']; their watermarks must not
+        advance on this run's results.
         """
-        print(f"\n🚀 Starting Phase 1 scraping for topic: '{topic}' (last {days} days)")
+        watermarks = watermarks or {}
+        sources = set(sources) if sources is not None else set(self.SOURCES)
+        mode = "parallel" if parallel else "sequential"
+        print(f"\n🚀 Starting Phase 1 scraping for topic: '{topic}' (last {days} days, {mode})")
         print("=" * 60)
         
         results = {
@@ -44,24 +71,121 @@ class ResearchAgent:
             }
         }
         
+        started = time.monotonic()
+        incomplete: Set[str] = set()
+        
         # Fetch from all sources
-        results['hackernews'] = self.api_scrapers.fetch_hackernews(topic, days)
-        results['arxiv'] = self.api_scrapers.fetch_arxiv_papers(topic, days)
-        results['rss'] = self.rss_scrapers.parse_rss_feeds(topic, days)
+        if parallel:
+            results.update(self._scrape_parallel(topic, days, source_timeout, sources, watermarks, incomplete))
+        else:
+            if 'hackernews' in sources:
+                results['hackernews'] = self.api_scrapers.fetch_hackernews(topic, days, watermark=watermarks.get('hackernews'),
+                                                                           incomplete_sources=incomplete)
+            if 'arxiv' in sources:
+                results['arxiv'] = self.api_scrapers.fetch_arxiv_papers(topic, days, watermarks=watermarks,
+                                                                        incomplete_sources=incomplete)
+            if 'rss' in sources:
+                results['rss'] = self.rss_scrapers.parse_rss_feeds(topic, days, watermarks=watermarks,
+                                                                   incomplete_sources=incomplete)
+        results['metadata']['incomplete_sources'] = sorted(incomplete)
         
         # Update metadata
         total = len(results['hackernews']) + len(results['arxiv']) + len(results['rss'])
         results['metadata']['total_articles'] = total
         
         print("\n" + "=" * 60)
-        print(f"🎉 Scraping complete! Total articles found: {total}")
+        print(f"🎉 Scraping complete in {time.monotonic() - started:.1f}s! Total articles found: {total}")
         print(f"   📊 Hacker News: {len(results['hackernews'])}")
         print(f"   📚 ArXiv: {len(results['arxiv'])}")
         print(f"   📰 RSS Feeds: {len(results['rss'])}")
+        if incomplete:
+            print(f"   ⚠️  Incomplete: {', '.join(sorted(incomplete))}")
         
         return results
     
-    async def scrape_all_with_content(self, topic: str, days: int = 7) -> Dict[str, Any]:
+    def _scrape_parallel(self, topic: str, days: int, source_timeout: float, sources: Set[str],
+                         watermarks: Dict[str, Watermark], incomplete: Set[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Fan out HN, every ArXiv category feed and every RSS feed onto a thread pool.
+        
+        Each job gets its own timeout (measured from when it actually starts, after any
+        per-host politeness wait); a failed or timed-out job contributes no articles,
+        never blocks the others, and has its label (the watermark key) added to `incomplete`.
+        
+        A timed-out job cannot be interrupted: its thread keeps running in the background
+        until the scraper's own HTTP timeout ends it, and its results are discarded. Its
+        host slot is released at the timeout so queued jobs for that host can proceed.
+        """
+        # (result key, label, url used for per-host politeness, callable)
+        jobs: List[Tuple[str, str, str, Callable[[], List[Dict[str, Any]]]]] = []
+        if 'hackernews' in sources:
+            jobs.append(('hackernews', 'hackernews', 'https://hn.algolia.com/',
+                         lambda: self.api_scrapers.fetch_hackernews(topic, days, watermark=watermarks.get('hackernews'),
+                                                                    incomplete_sources=incomplete)))
+        if 'arxiv' in sources:
+            for category in self.api_scrapers.arxiv_categories_for_topic(topic):
+                jobs.append(('arxiv', f"arxiv/{category}", self.api_scrapers.arxiv_feed_url(category),
+                             lambda category=category: self.api_scrapers.fetch_arxiv_category(
+                                 category, topic, days, watermark=watermarks.get(f"arxiv/{category}"))))
+        if 'rss' in sources:
+            for source_name, rss_url in self.rss_scrapers.rss_sources.items():
+                jobs.append(('rss', source_name, rss_url,
+                             lambda source_name=source_name, rss_url=rss_url:
+                                 self.rss_scrapers.parse_rss_feed(source_name, rss_url, topic, days,
+                                                                  watermark=watermarks.get(source_name))))
+        
+        merged: Dict[str, List[Dict[str, Any]]] = {'hackernews': [], 'arxiv': [], 'rss': []}
+        if not jobs:
+            return merged
+        
+        started_at: Dict[int, float] = {}
+        leases: Dict[int, HostLease] = {}
+        
+        def run(index: int, host_url: str, fn: Callable[[], List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+            with self.host_throttle.slot(host_url) as lease:
+                leases[index] = lease
+                started_at[index] = time.monotonic()
+                return fn()
+        
+        executor = ThreadPoolExecutor(max_workers=len(jobs), thread_name_prefix='scrape')
+        futures = {executor.submit(run, i, host_url, fn): i for i, (_, _, host_url, fn) in enumerate(jobs)}
+        outcomes: Dict[int, List[Dict[str, Any]]] = {}
+        pending = set(futures)
+        try:
+            while pending:
+                done, pending = wait(pending, timeout=0.25, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = futures[future]
+                    label = jobs[index][1]
+                    try:
+                        outcomes[index] = future.result()
+                        print(f"  ✅ {label}: {len(outcomes[index])} articles")
+                    except Exception as e:
+                        incomplete.add(label)
+                        print(f"  ❌ {label} failed: {e}")
+                now = time.monotonic()
+                for future in list(pending):
+                    index = futures[future]
+                    if index in started_at and now - started_at[index] > source_timeout:
+                        pending.discard(future)
+                        # The running thread can't be stopped; free its host for queued jobs
+                        leases[index].release()
+                        incomplete.add(jobs[index][1])
+                        print(f"  ⏱️  {jobs[index][1]} timed out after {source_timeout:.0f}s "
+                              f"(still finishing in the background; results discarded)")
+        finally:
+            # Don't wait on stragglers; their sockets are bounded by the scraper timeouts
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        # Merge in job order so output ordering is deterministic
+        for index, (key, _, _, _) in enumerate(jobs):
+            merged[key].extend(outcomes.get(index, []))
+        return merged
+    
+    async def scrape_all_with_content(self, topic: str, days: int = 7, parallel: bool = False,
+                                      source_timeout: float = 30.0,
+                                      sources: Optional[Iterable[str]] = None,
+                                      watermarks: Optional[Dict[str, Watermark]] = None) -> Dict[str, Any]:
         """
         Enhanced scraping that includes content extraction
         """
@@ -69,7 +193,8 @@ class ResearchAgent:
         print("=" * 80)
         
         # First, get the metadata (URLs, titles, etc.)
-        results = self.scrape_all(topic, days)
+        results = self.scrape_all(topic, days, parallel=parallel, source_timeout=source_timeout, sources=sources,
+                                  watermarks=watermarks)
         
         # Then crawl the actual content
         crawled_content = await self.content_processor.crawl_content_from_urls(results)
@@ -89,6 +214,25 @@ class ResearchAgent:
         
         return results
     
+    def iter_hackernews_backfill(self, topic: str, days: int = 90, slice_hours: int = 24,
+                                 max_workers: int = 4, watermark: Optional[Watermark] = None,
+                                 incomplete_sources: Optional[Set[str]] = None) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Stream every matching HN story in the window, one page-sized batch at a time
+        ('hackernews' is added to `incomplete_sources` if any slice failed)
+        """
+        return self.api_scrapers.iter_hackernews_backfill(topic, days, slice_hours=slice_hours, max_workers=max_workers,
+                                                          watermark=watermark, incomplete_sources=incomplete_sources)
+    
+    def feed_cache_stats(self, run_only: bool = False) -> List[Dict[str, Any]]:
+        """
+        Per-feed conditional-GET stats, lifetime or (run_only) for this process's requests;
+        empty when the feed cache is disabled
+        """
+        if not self.feed_cache:
+            return []
+        return self.feed_cache.run_stats() if run_only else self.feed_cache.stats()
+    
     def save_results(self, results: Dict[str, Any], filename: str = None) -> str:
         """
         Save results to JSON file
@@ -5,13 +5,23 @@ Handles TechCrunch, MIT Tech Review, Wired, and other RSS feeds
 """
 
 import feedparser
+import requests
 import time
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Set
+
+from ..storage.feed_cache import FeedCache
+from ..storage.timestamps import utc_epoch
+from ..storage.watermarks import Watermark
 
 
 class RSSScrapers:
-    def __init__(self):
+    def __init__(self, timeout: float = 10, feed_cache: Optional[FeedCache] = None):
+        self.timeout = timeout
+        self.feed_cache = feed_cache
+        self.session = requests.Session()
+        self.session.headers.update({'User-Agent': 'Mozilla/5.0 (compatible; ResearchAgent/0.1)'})
+        
         # RSS Feed URLs
         self.rss_sources = {
             'techcrunch': 'https://techcrunch.com/feed/',
@@ -19,53 +29,80 @@ class RSSScrapers:
             'wired': 'https://www.wired.com/feed/'
         }
     
-    def parse_rss_feeds(self, topic: str, days: int = 7) -> List[Dict[str, Any]]:
+    def parse_rss_feeds(self, topic: str, days: int = 7, watermarks: Optional[Dict[str, Watermark]] = None,
+                        incomplete_sources: Optional[Set[str]] = None) -> List[Dict[str, Any]]:
         """
-        Parse RSS feeds from TechCrunch, MIT Tech Review, and Wired
+        Parse RSS feeds from TechCrunch, MIT Tech Review, and Wired (failed feeds are added
+        to `incomplete_sources` by source name)
         """
         print(f"📰 Fetching RSS feeds for '{topic}' (last {days} days)...")
         
         articles = []
-        cutoff_date = datetime.now() - timedelta(days=days)
         
         for source_name, rss_url in self.rss_sources.items():
             try:
-                print(f"  📡 Fetching from {source_name}: {rss_url}")
-                
-                feed = feedparser.parse(rss_url)
-                
-                for entry in feed.entries:
-                    # Parse publication date
-                    if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                        pub_date = datetime(*entry.published_parsed[:6])
-                    elif hasattr(entry, 'updated_parsed') and entry.updated_parsed:
-                        pub_date = datetime(*entry.updated_parsed[:6])
-                    else:
-                        pub_date = datetime.now()
-                    
-                    if pub_date >= cutoff_date:
-                        article = {
-                            'title': entry.title,
-                            'description': entry.summary if hasattr(entry, 'summary') else '',
-                            'url': entry.link,
-                            'published_date': pub_date.isoformat(),
-                            'source': source_name,
-                            'author': entry.author if hasattr(entry, 'author') else 'Unknown'
-                        }
-                        
-                        # Filter by topic
-                        search_text = article['title'] + ' ' + article['description']
-                        if self._matches_topic(topic, search_text):
-                            articles.append(article)
-                
+                watermark = (watermarks or {}).get(source_name)
+                articles.extend(self.parse_rss_feed(source_name, rss_url, topic, days, watermark=watermark))
                 time.sleep(1)  # Be respectful
-                
             except Exception as e:
                 print(f"❌ Error fetching RSS from {source_name}: {str(e)}")
+                if incomplete_sources is not None:
+                    incomplete_sources.add(source_name)
         
         print(f"✅ Found {len(articles)} RSS articles")
         return articles
     
+    def parse_rss_feed(self, source_name: str, rss_url: str, topic: str, days: int = 7,
+                       watermark: Optional[Watermark] = None) -> List[Dict[str, Any]]:
+        """
+        Fetch and topic-filter a single RSS feed (raises on network errors);
+        entries behind the watermark are skipped
+        """
+        print(f"  📡 Fetching from {source_name}: {rss_url}")
+        
+        cutoff_date = datetime.utcnow() - timedelta(days=days)  # *_parsed dates are UTC
+        articles = []
+        
+        for entry in self._fetch_feed_entries(rss_url):
+            # Parse publication date
+            if hasattr(entry, 'published_parsed') and entry.published_parsed:
+                pub_date = datetime(*entry.published_parsed[:6])
+            elif hasattr(entry, 'updated_parsed') and entry.updated_parsed:
+                pub_date = datetime(*entry.updated_parsed[:6])
+            else:
+                pub_date = datetime.utcnow()
+            
+            if watermark and not watermark.is_new(entry.link, utc_epoch(pub_date)):
+                continue
+            
+            if pub_date >= cutoff_date:
+                article = {
+                    'title': entry.title,
+                    'description': entry.summary if hasattr(entry, 'summary') else '',
+                    'url': entry.link,
+                    'published_date': pub_date.isoformat(),
+                    'source': source_name,
+                    'author': entry.author if hasattr(entry, 'author') else 'Unknown'
+                }
+                
+                # Filter by topic
+                search_text = article['title'] + ' ' + article['description']
+                if self._matches_topic(topic, search_text):
+                    articles.append(article)
+        
+        return articles
+    
+    def _fetch_feed_entries(self, url: str) -> List[Any]:
+        """
+        Download a feed with a bounded timeout and parse it with feedparser
+        (conditional GET through the feed cache when one is attached)
+        """
+        if self.feed_cache is not None:
+            return self.feed_cache.fetch_entries(self.session, url, timeout=self.timeout)
+        response = self.session.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        return feedparser.parse(response.content, response_headers=dict(response.headers)).entries
+    
     def _matches_topic(self, topic: str, text: str) -> bool:
         """
         Simple topic matching using keywords
@@ -1,52 +1,166 @@
 #!/usr/bin/env python3
 """
-Social scraping (lightweight, API-first where possible). For MVP, use HN comment/meta (already captured),
-and Reddit via the public pushshift-like endpoints fallback (if available) or omit and return empty.
+Social scraping (lightweight, API-first where possible). HN comment/meta is already
+captured at ingest; this module collects Reddit posts through the public JSON search API.
+
+Collection is async (aiohttp): each topic is searched across a configurable set of
+subreddits concurrently, following the `after` cursor page by page, with the `t=` window
+derived from `days` and posts outside the window dropped. Requests are spaced per host
+(AsyncHostThrottle) and retried on 429/5xx; other failures are reported, not swallowed.
+Pages are stored in a TTL response cache, so repeated runs within the TTL make no requests.
 
 This module provides a unified interface returning social signal items:
-  { source, url, title, score, comments, created_at }
+  { source, url, title, score, comments, created_at, subreddit }
 """
 
-from typing import List, Dict, Any
+import asyncio
+import os
+from typing import List, Dict, Any, Optional, Sequence
 from datetime import datetime, timedelta
+from urllib.parse import quote, urlencode
+
+import aiohttp
+
+from ..storage.response_cache import ResponseCache
+from ..utils.politeness import AsyncHostThrottle
 
-import requests
+REDDIT_BASE_URL = 'https://www.reddit.com'
+SITE_WIDE = 'all'  # searches all of Reddit (/search.json) rather than one subreddit
+DEFAULT_SUBREDDITS = (SITE_WIDE,)
+PAGE_LIMIT = 100  # Reddit's maximum page size
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+def reddit_time_window(days: int) -> str:
+    """
+    Smallest Reddit search `t=` window that covers `days`
+    """
+    for limit, window in ((1, 'day'), (7, 'week'), (31, 'month'), (365, 'year')):
+        if days <= limit:
+            return window
+    return 'all'
 
 
 class SocialScraper:
-    def __init__(self):
-        self.session = requests.Session()
+    def __init__(self, subreddits: Optional[Sequence[str]] = None, base_url: Optional[str] = None,
+                 cache: Optional[ResponseCache] = None, max_pages: int = 4, concurrency: int = 8,
+                 per_host_delay: float = 0.6, timeout: float = 10, retries: int = 2):
+        self.subreddits = list(subreddits or DEFAULT_SUBREDDITS)
+        # REDDIT_BASE_URL points collection at another endpoint, e.g. scripts/fake_reddit_server.py
+        self.base_url = (base_url or os.getenv('REDDIT_BASE_URL') or REDDIT_BASE_URL).rstrip('/')
+        self.cache = cache
+        self.max_pages = max(1, int(max_pages))
+        self.concurrency = max(1, int(concurrency))
+        self.per_host_delay = per_host_delay
+        self.timeout = timeout
+        self.retries = retries
+        self.headers = {'User-Agent': 'ResearchAgent/0.1 (by u/example)'}
+        self.requests_made = 0
+        self.errors: List[str] = []
+
+    def search_url(self, subreddit: str, topic: str, days: int, after: Optional[str] = None) -> str:
+        params = {'q': topic, 'sort': 'top', 't': reddit_time_window(days), 'limit': PAGE_LIMIT}
+        if subreddit == SITE_WIDE:
+            path = '/search.json'
+        else:
+            path = f"/r/{quote(subreddit)}/search.json"
+            params['restrict_sr'] = 1
+        if after:
+            params['after'] = after
+        return f"{self.base_url}{path}?{urlencode(params)}"
 
     def fetch_social_signals(self, topic: str, days: int = 7) -> List[Dict[str, Any]]:
-        # For MVP, we implement a simple Reddit search using the public Reddit JSON endpoints.
-        # Note: This is limited and may be throttled; acceptable for MVP.
+        return self.fetch_many([topic], days=days)[topic]
+
+    def fetch_many(self, topics: Sequence[str], days: int = 7) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Social items for every topic, collected in one event loop with at most
+        `concurrency` requests in flight
+        """
+        return asyncio.run(self.fetch_many_async(topics, days=days))
+
+    async def fetch_many_async(self, topics: Sequence[str], days: int = 7) -> Dict[str, List[Dict[str, Any]]]:
+        topics = list(dict.fromkeys(topics))
+        limit = asyncio.Semaphore(self.concurrency)
+        throttle = AsyncHostThrottle(per_host_concurrency=self.concurrency, per_host_delay=self.per_host_delay)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        async with aiohttp.ClientSession(headers=self.headers, timeout=timeout) as session:
+            results = await asyncio.gather(*(
+                self._collect_topic(session, limit, throttle, topic, days) for topic in topics
+            ))
+        return dict(zip(topics, results))
+
+    async def _collect_topic(self, session, limit, throttle, topic: str, days: int) -> List[Dict[str, Any]]:
+        pages = await asyncio.gather(*(
+            self._collect_subreddit(session, limit, throttle, subreddit, topic, days) for subreddit in self.subreddits
+        ))
+        seen = set()
         items: List[Dict[str, Any]] = []
-        try:
-            q = topic.replace(' ', '+')
-            url = f"https://www.reddit.com/search.json?q={q}&sort=top&t=week&limit=25"
-            headers = {
-                'User-Agent': 'ResearchAgent/0.1 (by u/example)'
-            }
-            resp = self.session.get(url, headers=headers, timeout=10)
-            if resp.status_code == 200:
-                data = resp.json()
-                for child in data.get('data', {}).get('children', []):
-                    post = child.get('data', {})
-                    created = datetime.utcfromtimestamp(post.get('created_utc', 0))
-                    if created >= datetime.utcnow() - timedelta(days=days):
-                        items.append({
-                            'source': 'reddit',
-                            'url': 'https://www.reddit.com' + post.get('permalink', ''),
-                            'title': post.get('title', ''),
-                            'score': int(post.get('score', 0)),
-                            'comments': int(post.get('num_comments', 0)),
-                            'created_at': created.isoformat(),
-                            'subreddit': post.get('subreddit', '')
-                        })
-        except Exception:
-            # Silent fail for MVP; return what we have
-            pass
+        for page_items in pages:
+            for item in page_items:
+                if item['url'] not in seen:
+                    seen.add(item['url'])
+                    items.append(item)
+        items.sort(key=lambda item: item['score'], reverse=True)
         return items
 
+    async def _collect_subreddit(self, session, limit, throttle, subreddit: str, topic: str,
+                                 days: int) -> List[Dict[str, Any]]:
+        cutoff = datetime.utcnow() - timedelta(days=days)
+        items: List[Dict[str, Any]] = []
+        after = None
+        for _ in range(self.max_pages):
+            data = await self._get_json(session, limit, throttle, self.search_url(subreddit, topic, days, after))
+            if data is None:
+                break
+            listing = data.get('data', {})
+            for child in listing.get('children', []):
+                post = child.get('data', {})
+                created = datetime.utcfromtimestamp(post.get('created_utc', 0))
+                if created >= cutoff:
+                    items.append({
+                        'source': 'reddit',
+                        'url': 'https://www.reddit.com' + post.get('permalink', ''),
+                        'title': post.get('title', ''),
+                        'score': int(post.get('score', 0)),
+                        'comments': int(post.get('num_comments', 0)),
+                        'created_at': created.isoformat(),
+                        'subreddit': post.get('subreddit', '')
+                    })
+            after = listing.get('after')
+            if not after:
+                break
+        return items
 
+    async def _get_json(self, session, limit, throttle, url: str) -> Optional[Dict[str, Any]]:
+        if self.cache is not None:
+            cached = self.cache.get(url)
+            if cached is not None:
+                return cached
+        for attempt in range(self.retries + 1):
+            try:
+                async with limit, throttle.slot(url):
+                    self.requests_made += 1
+                    async with session.get(url) as response:
+                        if response.status in RETRY_STATUSES and attempt < self.retries:
+                            retry_after = response.headers.get('Retry-After', '')
+                            delay = float(retry_after) if retry_after.isdigit() else 2.0 ** attempt
+                        else:
+                            response.raise_for_status()
+                            data = await response.json(content_type=None)
+                            if self.cache is not None:
+                                self.cache.put(url, data)
+                            return data
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                permanent = isinstance(e, aiohttp.ClientResponseError) and e.status not in RETRY_STATUSES
+                if permanent or attempt >= self.retries:
+                    self._report_error(url, e)
+                    return None
+                delay = 2.0 ** attempt
+            await asyncio.sleep(delay)
+        return None
 
+    def _report_error(self, url: str, error: Exception) -> None:
+        message = f"{url}: {type(error).__name__}: {error}"
+        self.errors.append(message)
+        print(f"⚠️ Reddit request failed: {message}")
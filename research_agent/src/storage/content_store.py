@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Compression helpers for content-addressed crawled markdown.
+
+Bodies are keyed by the SHA-256 of their text and compressed with zstd when the
+`zstandard` package is installed, zlib otherwise. Each blob records its codec, so a DB
+written with one codec stays readable after the other becomes the default (zstd blobs do
+need `zstandard` to be read).
+"""
+
+import hashlib
+import zlib
+from typing import Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+DEFAULT_CODEC = 'zstd' if zstandard is not None else 'zlib'
+ZSTD_LEVEL = 10
+ZLIB_LEVEL = 6
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256((text or '').encode('utf-8')).hexdigest()
+
+
+def compress_text(text: str, codec: str = DEFAULT_CODEC) -> Tuple[str, bytes]:
+    raw = (text or '').encode('utf-8')
+    if codec == 'zstd':
+        return codec, zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(raw)
+    if codec == 'zlib':
+        return codec, zlib.compress(raw, ZLIB_LEVEL)
+    raise ValueError(f"unknown content codec: {codec}")
+
+
+def decompress_text(codec: Optional[str], data: Optional[bytes]) -> Optional[str]:
+    """
+    Inverse of compress_text; None passes through (registered as a SQLite function)
+    """
+    if data is None:
+        return None
+    if codec == 'zstd':
+        if zstandard is None:
+            raise RuntimeError("content stored with zstd; install the 'zstandard' package to read it")
+        return zstandard.ZstdDecompressor().decompress(data).decode('utf-8')
+    if codec == 'zlib':
+        return zlib.decompress(data).decode('utf-8')
+    raise ValueError(f"unknown content codec: {codec}")
@@ -1,221 +1,946 @@
 #!/usr/bin/env python3
 """
 SQLite persistence for articles and crawled content.
+
+Connections are long-lived and in WAL mode: each thread reuses one reader connection, and
+every write runs on a single writer thread (fed by a queue) inside BEGIN IMMEDIATE, so
+readers never block on an ingest and several ingest processes can share the file, with
+each waiting on the busy timeout for its turn instead of failing with "database is locked".
 """
 
+import json
+import queue
 import sqlite3
+import threading
+import time
+from concurrent.futures import Future
 from pathlib import Path
-from typing import Dict, Any, List, Optional
-from datetime import datetime
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
+from datetime import datetime, timezone
+
+from .content_store import compress_text, content_hash, decompress_text
+from .timestamps import iso_to_epoch, utc_epoch
+from .watermarks import Watermark
+
+
+def _int_or_none(value: Any) -> Optional[int]:
+    return None if value is None else int(value or 0)
+
+
+def _published_ts(article: Dict[str, Any]) -> Optional[int]:
+    """
+    Normalized publish time (epoch seconds, UTC) for an article dict; None if it has no date
+    """
+    if article.get('published_ts') is not None:
+        return int(article['published_ts'])
+    value = article.get('published_date') or article.get('created_at')
+    return iso_to_epoch(value) if value else None
+
+
+def _signal_day(published_ts: Optional[int]) -> int:
+    """
+    daily_signals bucket: UTC day number, or -1 for undated articles (outside every window)
+    """
+    return -1 if published_ts is None else int(published_ts) // 86400
 
 
 class DatabaseManager:
-    def __init__(self, db_path: str):
+    BUSY_TIMEOUT_MS = 30000
+    WRITE_RETRIES = 5
+
+    def __init__(self, db_path: str, cache_size_kb: int = 65536, mmap_size: int = 256 * 1024 * 1024):
         self.db_path = db_path
+        self.fts_enabled = False
+        self.cache_size_kb = cache_size_kb
+        self.mmap_size = mmap_size
         Path(db_path).parent.mkdir(parents=True, exist_ok=True)
-        self._init_schema()
+        self._local = threading.local()
+        self._write_queue: "queue.Queue" = queue.Queue()
+        self._writer_thread: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+        self._rollup_missing = False
+        self._write(self._init_schema)
+        self._migrate_inline_content()
+        if self._backfill_published_ts() or self._rollup_missing:
+            self.rebuild_daily_signals()
+        self._migrate_watermark_timestamps()
 
-    def _connect(self):
-        conn = sqlite3.connect(self.db_path)
+    def _open_connection(self, autocommit: bool = False) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=self.BUSY_TIMEOUT_MS / 1000.0,
+                               isolation_level=None if autocommit else '')
         conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")  # durable at checkpoints; safe with WAL
+        conn.execute(f"PRAGMA busy_timeout={int(self.BUSY_TIMEOUT_MS)}")
+        conn.execute(f"PRAGMA cache_size=-{int(self.cache_size_kb)}")
+        conn.execute(f"PRAGMA mmap_size={int(self.mmap_size)}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.create_function("decompress_content", 2, decompress_text, deterministic=True)
         return conn
 
-    def _init_schema(self) -> None:
-        with self._connect() as conn:
-            cur = conn.cursor()
+    def _connect(self) -> sqlite3.Connection:
+        """
+        This thread's persistent reader connection
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = self._open_connection()
+        return conn
+
+    def _write(self, fn):
+        """
+        Run fn(cursor) as one transaction on the writer thread and return its result
+        """
+        with self._writer_lock:
+            if self._writer_thread is None or not self._writer_thread.is_alive():
+                self._writer_thread = threading.Thread(target=self._writer_loop, name='sqlite-writer', daemon=True)
+                self._writer_thread.start()
+        future: Future = Future()
+        self._write_queue.put((fn, future))
+        return future.result()
+
+    def _writer_loop(self) -> None:
+        conn = self._open_connection(autocommit=True)
+        while True:
+            item = self._write_queue.get()
+            if item is None:
+                break
+            fn, future = item
+            try:
+                future.set_result(self._run_write(conn, fn))
+            except BaseException as e:
+                future.set_exception(e)
+        conn.close()
+
+    def _run_write(self, conn: sqlite3.Connection, fn):
+        for attempt in range(self.WRITE_RETRIES):
+            try:
+                # Take the write lock up front: a deferred transaction that later upgrades
+                # cannot wait on the busy handler and fails immediately under contention
+                conn.execute("BEGIN IMMEDIATE")
+                break
+            except sqlite3.OperationalError as e:
+                if 'locked' not in str(e) and 'busy' not in str(e) or attempt == self.WRITE_RETRIES - 1:
+                    raise
+                time.sleep(0.1 * (2 ** attempt))
+        try:
+            result = fn(conn.cursor())
+            conn.execute("COMMIT")
+            return result
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def close(self) -> None:
+        if self._writer_thread is not None and self._writer_thread.is_alive():
+            self._write_queue.put(None)
+            self._writer_thread.join()
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _init_schema(self, cur: sqlite3.Cursor) -> None:
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS articles (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                url TEXT UNIQUE,
+                title TEXT,
+                source TEXT,
+                author TEXT,
+                created_at TEXT,
+                published_date TEXT,
+                points INTEGER,
+                comments_count INTEGER,
+                description TEXT,
+                abstract TEXT,
+                category TEXT,
+                arxiv_id TEXT,
+                hn_url TEXT,
+                topic TEXT,
+                inserted_at TEXT,
+                updated_at TEXT
+            )
+            """
+        )
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS crawled_content (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                article_id INTEGER,
+                url TEXT,
+                markdown_content TEXT,
+                word_count INTEGER,
+                crawled_at TEXT,
+                updated_at TEXT,
+                UNIQUE(article_id),
+                FOREIGN KEY(article_id) REFERENCES articles(id) ON DELETE CASCADE
+            )
+            """
+        )
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS source_watermarks (
+                source TEXT,
+                topic TEXT,
+                last_ts INTEGER,
+                seen_ids TEXT,
+                updated_at TEXT,
+                PRIMARY KEY(source, topic)
+            )
+            """
+        )
+        # Crawled bodies, compressed and deduplicated by SHA-256 of the markdown
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS content_blobs (
+                hash TEXT PRIMARY KEY,
+                codec TEXT NOT NULL,
+                raw_size INTEGER,
+                stored_size INTEGER,
+                data BLOB NOT NULL,
+                created_at TEXT
+            )
+            """
+        )
+        # Per (topic, source, UTC day) totals, kept in step with articles/crawled_content by the
+        # upsert transactions so windowed validation metrics cost O(days), not O(articles)
+        cur.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'daily_signals'")
+        self._rollup_missing = cur.fetchone() is None
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS daily_signals (
+                topic TEXT NOT NULL,
+                source TEXT NOT NULL,
+                day INTEGER NOT NULL,
+                articles INTEGER NOT NULL DEFAULT 0,
+                points INTEGER NOT NULL DEFAULT 0,
+                comments INTEGER NOT NULL DEFAULT 0,
+                crawled INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY(topic, source, day)
+            ) WITHOUT ROWID
+            """
+        )
+        # Columns added after the initial schema (migrated in place for existing DBs)
+        self._ensure_column(cur, "articles", "content_hash", "TEXT")
+        self._ensure_column(cur, "articles", "embedded_at", "TEXT")
+        self._ensure_column(cur, "crawled_content", "content_hash", "TEXT")
+        self._ensure_column(cur, "articles", "published_ts", "INTEGER")
+        # NULL = written before watermark timestamps were normalized to UTC epochs
+        self._ensure_column(cur, "source_watermarks", "ts_basis", "TEXT")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_crawled_content_hash ON crawled_content(content_hash)")
+        # Windowed aggregates (topic/source + published_ts range, summing points/comments) are
+        # answered from these covering indexes alone; they supersede the single-column ones
+        cur.execute("DROP INDEX IF EXISTS idx_articles_topic")
+        cur.execute("DROP INDEX IF EXISTS idx_articles_source")
+        cur.execute("DROP INDEX IF EXISTS idx_articles_published")
+        cur.execute(
+            "CREATE INDEX IF NOT EXISTS idx_articles_topic_published "
+            "ON articles(topic, published_ts, points, comments_count)"
+        )
+        cur.execute(
+            "CREATE INDEX IF NOT EXISTS idx_articles_source_published "
+            "ON articles(source, published_ts, points, comments_count)"
+        )
+        cur.execute(
+            "CREATE INDEX IF NOT EXISTS idx_articles_published_ts "
+            "ON articles(published_ts, points, comments_count)"
+        )
+        self._init_fts(cur)
+
+    def _init_fts(self, cur: sqlite3.Cursor) -> None:
+        """
+        Full-text index (rowid = articles.id) over title/description/abstract + crawled markdown.
+        Kept in sync by the upsert paths; disabled if this SQLite build lacks FTS5.
+        """
+        try:
             cur.execute(
                 """
-                CREATE TABLE IF NOT EXISTS articles (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    url TEXT UNIQUE,
-                    title TEXT,
-                    source TEXT,
-                    author TEXT,
-                    created_at TEXT,
-                    published_date TEXT,
-                    points INTEGER,
-                    comments_count INTEGER,
-                    description TEXT,
-                    abstract TEXT,
-                    category TEXT,
-                    arxiv_id TEXT,
-                    hn_url TEXT,
-                    topic TEXT,
-                    inserted_at TEXT,
-                    updated_at TEXT
+                CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+                    title, description, abstract, content,
+                    tokenize = 'porter unicode61'
                 )
                 """
             )
+        except sqlite3.OperationalError:
+            self.fts_enabled = False
+            return
+        self.fts_enabled = True
+        # First run against an existing DB: index everything once
+        cur.execute("SELECT (SELECT COUNT(*) FROM articles_fts), (SELECT COUNT(*) FROM articles)")
+        indexed, total = cur.fetchone()
+        if indexed == 0 and total > 0:
+            cur.execute("SELECT id FROM articles")
+            self._refresh_fts(cur, [row[0] for row in cur.fetchall()])
+
+    def _refresh_fts(self, cur: sqlite3.Cursor, article_ids: List[int]) -> None:
+        if not self.fts_enabled or not article_ids:
+            return
+        for start in range(0, len(article_ids), 500):
+            chunk = article_ids[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            cur.execute(f"DELETE FROM articles_fts WHERE rowid IN ({placeholders})", chunk)
+            cur.execute(
+                f"""
+                INSERT INTO articles_fts (rowid, title, description, abstract, content)
+                SELECT a.id, COALESCE(a.title, ''), COALESCE(a.description, ''), COALESCE(a.abstract, ''),
+                       COALESCE(decompress_content(b.codec, b.data), cc.markdown_content, '')
+                FROM articles a
+                LEFT JOIN crawled_content cc ON cc.article_id = a.id
+                LEFT JOIN content_blobs b ON b.hash = cc.content_hash
+                WHERE a.id IN ({placeholders})
+                """,
+                chunk,
+            )
+
+    def _ensure_column(self, cur: sqlite3.Cursor, table: str, column: str, decl: str) -> None:
+        cur.execute(f"PRAGMA table_info({table})")
+        if column not in {row['name'] for row in cur.fetchall()}:
+            cur.execute(f"ALTER TABLE {table} ADD COLUMN {column} {decl}")
+
+    def upsert_article(self, article: Dict[str, Any], topic: Optional[str] = None) -> int:
+        url = article.get('url') or article.get('arxiv_url') or article.get('hn_url')
+        return self.bulk_upsert_articles([article], topic=topic)[url]
+
+    def bulk_upsert_articles(self, articles: Iterable[Dict[str, Any]], topic: Optional[str] = None,
+                             batch_size: int = 500) -> Dict[str, int]:
+        """
+        Insert-or-update many articles through the writer (one executemany + one transaction
+        per batch). Non-null fields overwrite, nulls keep the stored value.
+        Returns {canonical url: article id}.
+        """
+        now = datetime.utcnow().isoformat()
+        rows = []
+        for article in articles:
+            url = article.get('url') or article.get('arxiv_url') or article.get('hn_url')
+            if not url:
+                raise ValueError("Article missing canonical URL")
+            rows.append({
+                'url': url,
+                'title': article.get('title'),
+                'source': article.get('source'),
+                'author': article.get('author'),
+                'created_at': article.get('created_at'),
+                'published_date': article.get('published_date'),
+                'published_ts': _published_ts(article),
+                'points': _int_or_none(article.get('points')),
+                'comments_count': _int_or_none(article.get('comments_count')),
+                'description': article.get('description'),
+                'abstract': article.get('abstract'),
+                'category': article.get('category'),
+                'arxiv_id': article.get('arxiv_id'),
+                'hn_url': article.get('hn_url'),
+                'topic': topic,
+                'now': now,
+            })
+        id_map: Dict[str, int] = {}
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start:start + batch_size]
+            id_map.update(self._write(lambda cur: self._upsert_article_rows(cur, batch)))
+        return id_map
+
+    def _upsert_article_rows(self, cur: sqlite3.Cursor, batch: List[Dict[str, Any]]) -> Dict[str, int]:
+        urls = [row['url'] for row in batch]
+        before = self._signal_contributions(cur, "a.url", urls)
+        cur.executemany(
+            """
+            INSERT INTO articles (
+                url, title, source, author, created_at, published_date, published_ts,
+                points, comments_count, description, abstract, category,
+                arxiv_id, hn_url, topic, inserted_at, updated_at
+            ) VALUES (
+                :url, :title, :source, :author, :created_at, :published_date, :published_ts,
+                COALESCE(:points, 0), COALESCE(:comments_count, 0), :description, :abstract, :category,
+                :arxiv_id, :hn_url, :topic, :now, :now
+            )
+            ON CONFLICT(url) DO UPDATE SET
+                title = COALESCE(:title, title),
+                source = COALESCE(:source, source),
+                author = COALESCE(:author, author),
+                created_at = COALESCE(:created_at, created_at),
+                published_date = COALESCE(:published_date, published_date),
+                published_ts = COALESCE(:published_ts, published_ts),
+                points = COALESCE(:points, points),
+                comments_count = COALESCE(:comments_count, comments_count),
+                description = COALESCE(:description, description),
+                abstract = COALESCE(:abstract, abstract),
+                category = COALESCE(:category, category),
+                arxiv_id = COALESCE(:arxiv_id, arxiv_id),
+                hn_url = COALESCE(:hn_url, hn_url),
+                topic = COALESCE(:topic, topic),
+                updated_at = :now
+            """,
+            batch,
+        )
+        batch_ids = self._ids_for_urls(cur, urls)
+        self._apply_signal_deltas(cur, before, self._signal_contributions(cur, "a.url", urls))
+        self._refresh_fts(cur, list(batch_ids.values()))
+        return batch_ids
+
+    def _signal_contributions(self, cur: sqlite3.Cursor, key_column: str, keys: List[Any]) -> List[Tuple]:
+        """
+        What the given articles currently add to daily_signals:
+        [(topic, source, day, points, comments, crawled)], selected by `key_column` IN keys
+        """
+        contributions: List[Tuple] = []
+        unique = list(dict.fromkeys(keys))
+        for start in range(0, len(unique), 500):
+            chunk = unique[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            cur.execute(
+                f"""
+                SELECT COALESCE(a.topic, ''), COALESCE(a.source, ''), a.published_ts,
+                       COALESCE(a.points, 0), COALESCE(a.comments_count, 0),
+                       EXISTS(SELECT 1 FROM crawled_content cc WHERE cc.article_id = a.id)
+                FROM articles a WHERE {key_column} IN ({placeholders})
+                """,
+                chunk,
+            )
+            contributions.extend(
+                (row[0], row[1], _signal_day(row[2]), row[3], row[4], row[5]) for row in cur.fetchall()
+            )
+        return contributions
+
+    def _apply_signal_deltas(self, cur: sqlite3.Cursor, before: List[Tuple], after: List[Tuple]) -> None:
+        deltas: Dict[Tuple[str, str, int], List[int]] = {}
+        for sign, contributions in ((-1, before), (1, after)):
+            for topic, source, day, points, comments, crawled in contributions:
+                delta = deltas.setdefault((topic, source, day), [0, 0, 0, 0])
+                delta[0] += sign
+                delta[1] += sign * points
+                delta[2] += sign * comments
+                delta[3] += sign * crawled
+        changed = [key + tuple(delta) for key, delta in deltas.items() if any(delta)]
+        if not changed:
+            return
+        cur.executemany(
+            """
+            INSERT INTO daily_signals (topic, source, day, articles, points, comments, crawled)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(topic, source, day) DO UPDATE SET
+                articles = articles + excluded.articles,
+                points = points + excluded.points,
+                comments = comments + excluded.comments,
+                crawled = crawled + excluded.crawled
+            """,
+            changed,
+        )
+        cur.executemany(
+            "DELETE FROM daily_signals WHERE topic = ? AND source = ? AND day = ? AND articles = 0 AND crawled = 0",
+            [key[:3] for key in changed],
+        )
+
+    def rebuild_daily_signals(self) -> None:
+        """
+        Recompute the daily_signals rollup from articles/crawled_content in one transaction
+        """
+        def rebuild(cur: sqlite3.Cursor) -> None:
+            cur.execute("DELETE FROM daily_signals")
             cur.execute(
                 """
-                CREATE TABLE IF NOT EXISTS crawled_content (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    article_id INTEGER,
-                    url TEXT,
-                    markdown_content TEXT,
-                    word_count INTEGER,
-                    crawled_at TEXT,
-                    updated_at TEXT,
-                    UNIQUE(article_id),
-                    FOREIGN KEY(article_id) REFERENCES articles(id) ON DELETE CASCADE
-                )
+                INSERT INTO daily_signals (topic, source, day, articles, points, comments, crawled)
+                SELECT COALESCE(a.topic, ''), COALESCE(a.source, ''),
+                       CASE WHEN a.published_ts IS NULL THEN -1 ELSE a.published_ts / 86400 END AS day,
+                       COUNT(*), SUM(COALESCE(a.points, 0)), SUM(COALESCE(a.comments_count, 0)),
+                       SUM(EXISTS(SELECT 1 FROM crawled_content cc WHERE cc.article_id = a.id))
+                FROM articles a
+                GROUP BY 1, 2, 3
                 """
             )
-            cur.execute("CREATE INDEX IF NOT EXISTS idx_articles_topic ON articles(topic)")
-            cur.execute("CREATE INDEX IF NOT EXISTS idx_articles_source ON articles(source)")
-            cur.execute("CREATE INDEX IF NOT EXISTS idx_articles_published ON articles(published_date)")
-            conn.commit()
 
-    def upsert_article(self, article: Dict[str, Any], topic: Optional[str] = None) -> int:
+        self._write(rebuild)
+
+    def _ids_for_urls(self, cur: sqlite3.Cursor, urls: List[str]) -> Dict[str, int]:
+        ids: Dict[str, int] = {}
+        unique = list(dict.fromkeys(urls))
+        for start in range(0, len(unique), 500):
+            chunk = unique[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            cur.execute(f"SELECT id, url FROM articles WHERE url IN ({placeholders})", chunk)
+            ids.update({row['url']: int(row['id']) for row in cur.fetchall()})
+        return ids
+
+    def upsert_crawled_content(self, article_id: int, url: str, markdown: str, word_count: int, crawled_at: str) -> None:
+        self.bulk_upsert_crawled_content([{'article_id': article_id, 'url': url, 'markdown': markdown,
+                                           'word_count': word_count, 'crawled_at': crawled_at}])
+
+    def bulk_upsert_crawled_content(self, items: Iterable[Dict[str, Any]], batch_size: int = 200) -> Dict[str, int]:
+        """
+        Insert-or-update crawled markdown for many articles, one transaction per batch.
+        Each item: {article_id, url, markdown, word_count, crawled_at}. Returns {url: article id}.
+        """
         now = datetime.utcnow().isoformat()
-        url = article.get('url') or article.get('arxiv_url') or article.get('hn_url')
-        if not url:
-            raise ValueError("Article missing canonical URL")
-        with self._connect() as conn:
-            cur = conn.cursor()
-            cur.execute("SELECT id FROM articles WHERE url = ?", (url,))
-            row = cur.fetchone()
-            if row:
-                article_id = row['id']
-                cur.execute(
+        rows = []
+        for item in items:
+            markdown = item.get('markdown') or ''
+            rows.append({
+                'article_id': int(item['article_id']),
+                'url': item.get('url'),
+                'markdown': markdown,
+                'hash': content_hash(markdown),
+                'word_count': int(item.get('word_count') or 0),
+                'crawled_at': item.get('crawled_at'),
+                'now': now,
+            })
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start:start + batch_size]
+            # Compress outside the write lock, once per distinct body
+            blobs = self._compress_blobs({row['hash']: row['markdown'] for row in batch}, now)
+            self._write(lambda cur: self._upsert_crawled_rows(cur, batch, blobs))
+        return {row['url']: row['article_id'] for row in rows}
+
+    def _compress_blobs(self, bodies: Dict[str, str], now: str) -> List[Tuple[str, str, int, int, bytes, str]]:
+        blobs = []
+        for digest, markdown in bodies.items():
+            codec, data = compress_text(markdown)
+            blobs.append((digest, codec, len(markdown.encode('utf-8')), len(data), data, now))
+        return blobs
+
+    def _upsert_crawled_rows(self, cur: sqlite3.Cursor, batch: List[Dict[str, Any]],
+                             blobs: List[Tuple[str, str, int, int, bytes, str]]) -> None:
+        ids = [row['article_id'] for row in batch]
+        placeholders = ','.join('?' * len(ids))
+        cur.execute(f"SELECT DISTINCT content_hash FROM crawled_content WHERE article_id IN ({placeholders})", ids)
+        previous = {row[0] for row in cur.fetchall() if row[0]}
+        before = self._signal_contributions(cur, "a.id", ids)
+        cur.executemany(
+            """
+            INSERT OR IGNORE INTO content_blobs (hash, codec, raw_size, stored_size, data, created_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            blobs,
+        )
+        cur.executemany(
+            """
+            INSERT INTO crawled_content (
+                article_id, url, markdown_content, content_hash, word_count, crawled_at, updated_at
+            ) VALUES (:article_id, :url, NULL, :hash, :word_count, COALESCE(:crawled_at, :now), :now)
+            ON CONFLICT(article_id) DO UPDATE SET
+                url = :url,
+                markdown_content = NULL,
+                word_count = :word_count,
+                crawled_at = COALESCE(:crawled_at, crawled_at),
+                -- An identical recrawl is not a content change (keeps the article out of re-embedding)
+                updated_at = CASE WHEN content_hash IS :hash THEN updated_at ELSE :now END,
+                content_hash = :hash
+            """,
+            batch,
+        )
+        self._drop_orphan_blobs(cur, previous - {row['hash'] for row in batch})
+        self._apply_signal_deltas(cur, before, self._signal_contributions(cur, "a.id", ids))
+        self._refresh_fts(cur, ids)
+
+    def _drop_orphan_blobs(self, cur: sqlite3.Cursor, hashes: Iterable[str]) -> None:
+        cur.executemany(
+            """
+            DELETE FROM content_blobs
+            WHERE hash = ? AND NOT EXISTS (SELECT 1 FROM crawled_content WHERE content_hash = content_blobs.hash)
+            """,
+            [(digest,) for digest in hashes],
+        )
+
+    def _migrate_inline_content(self, batch_size: int = 200) -> None:
+        """
+        Move crawled markdown still stored inline (pre-blob rows) into content_blobs.
+        Leaves updated_at alone so migrated articles are not re-embedded.
+        """
+        migrated = 0
+        while True:
+            with self._connect() as conn:
+                rows = conn.execute(
                     """
-                    UPDATE articles SET
-                        title = COALESCE(?, title),
-                        source = COALESCE(?, source),
-                        author = COALESCE(?, author),
-                        created_at = COALESCE(?, created_at),
-                        published_date = COALESCE(?, published_date),
-                        points = COALESCE(?, points),
-                        comments_count = COALESCE(?, comments_count),
-                        description = COALESCE(?, description),
-                        abstract = COALESCE(?, abstract),
-                        category = COALESCE(?, category),
-                        arxiv_id = COALESCE(?, arxiv_id),
-                        hn_url = COALESCE(?, hn_url),
-                        topic = COALESCE(?, topic),
-                        updated_at = ?
-                    WHERE id = ?
+                    SELECT id, markdown_content FROM crawled_content
+                    WHERE content_hash IS NULL AND markdown_content IS NOT NULL
+                    LIMIT ?
                     """,
-                    (
-                        article.get('title'),
-                        article.get('source'),
-                        article.get('author'),
-                        article.get('created_at'),
-                        article.get('published_date'),
-                        article.get('points'),
-                        article.get('comments_count'),
-                        article.get('description'),
-                        article.get('abstract'),
-                        article.get('category'),
-                        article.get('arxiv_id'),
-                        article.get('hn_url'),
-                        topic,
-                        now,
-                        article_id,
-                    ),
-                )
-            else:
-                cur.execute(
+                    (batch_size,),
+                ).fetchall()
+            if not rows:
+                break
+            now = datetime.utcnow().isoformat()
+            hashed = [(row['id'], content_hash(row['markdown_content']), row['markdown_content']) for row in rows]
+            blobs = self._compress_blobs({digest: markdown for _, digest, markdown in hashed}, now)
+
+            def move(cur: sqlite3.Cursor) -> None:
+                cur.executemany(
                     """
-                    INSERT INTO articles (
-                        url, title, source, author, created_at, published_date,
-                        points, comments_count, description, abstract, category,
-                        arxiv_id, hn_url, topic, inserted_at, updated_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    INSERT OR IGNORE INTO content_blobs (hash, codec, raw_size, stored_size, data, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
                     """,
-                    (
-                        url,
-                        article.get('title'),
-                        article.get('source'),
-                        article.get('author'),
-                        article.get('created_at'),
-                        article.get('published_date'),
-                        int(article.get('points') or 0),
-                        int(article.get('comments_count') or 0),
-                        article.get('description'),
-                        article.get('abstract'),
-                        article.get('category'),
-                        article.get('arxiv_id'),
-                        article.get('hn_url'),
-                        topic,
-                        now,
-                        now,
-                    ),
+                    blobs,
+                )
+                cur.executemany(
+                    "UPDATE crawled_content SET content_hash = ?, markdown_content = NULL WHERE id = ? AND content_hash IS NULL",
+                    [(digest, row_id) for row_id, digest, _ in hashed],
                 )
-                article_id = cur.lastrowid
-            conn.commit()
-            return int(article_id)
 
-    def upsert_crawled_content(self, article_id: int, url: str, markdown: str, word_count: int, crawled_at: str) -> None:
-        now = datetime.utcnow().isoformat()
-        with self._connect() as conn:
-            cur = conn.cursor()
-            cur.execute("SELECT id FROM crawled_content WHERE article_id = ?", (article_id,))
-            row = cur.fetchone()
-            if row:
-                cur.execute(
+            self._write(move)
+            migrated += len(rows)
+        if migrated:
+            print(f"🗜️  Migrated {migrated} crawled bodies to compressed content-addressed storage")
+
+    def _backfill_published_ts(self, batch_size: int = 5000) -> int:
+        """
+        Fill published_ts for rows written before the column existed. Hacker News
+        created_at used to be stored as naive local time (every other source is naive UTC),
+        so those legacy values are converted from local time and rewritten as UTC.
+        """
+        filled = 0
+        last_id = 0
+        while True:
+            with self._connect() as conn:
+                rows = conn.execute(
                     """
-                    UPDATE crawled_content SET
-                        url = ?,
-                        markdown_content = ?,
-                        word_count = ?,
-                        crawled_at = COALESCE(?, crawled_at),
-                        updated_at = ?
-                    WHERE article_id = ?
+                    SELECT id, source, created_at, published_date FROM articles
+                    WHERE id > ? AND published_ts IS NULL
+                      AND COALESCE(published_date, created_at) IS NOT NULL
+                    ORDER BY id
+                    LIMIT ?
                     """,
-                    (url, markdown, int(word_count or 0), crawled_at, now, article_id),
-                )
+                    (last_id, batch_size),
+                ).fetchall()
+            if not rows:
+                break
+            last_id = rows[-1]['id']
+            updates = []
+            for row in rows:
+                created_at = row['created_at']
+                if row['source'] == 'hackernews' and not row['published_date'] and created_at:
+                    try:
+                        local = datetime.fromisoformat(created_at)
+                    except ValueError:
+                        local = None
+                    if local is not None and local.tzinfo is None:
+                        created_at = local.astimezone(timezone.utc).replace(tzinfo=None).isoformat()
+                published_ts = iso_to_epoch(row['published_date'] or created_at)
+                updates.append((published_ts, created_at, row['id']))
+            self._write(lambda cur: cur.executemany(
+                "UPDATE articles SET published_ts = ?, created_at = ? WHERE id = ?", updates
+            ))
+            filled += len(updates)
+        if filled:
+            print(f"🕒 Backfilled published_ts for {filled} articles")
+        return filled
+
+    def _migrate_watermark_timestamps(self) -> int:
+        """
+        Rewrite watermarks saved before they were built from UTC epochs. Those read naive-UTC
+        stamps as local time (ahead of the true time west of UTC, so incremental ingest
+        skipped new items). Seen IDs are re-timed from the stored articles' published_ts;
+        IDs not found fall back to undoing the local-time reading, never moving forward.
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT source, topic, last_ts, seen_ids FROM source_watermarks WHERE ts_basis IS NULL"
+            ).fetchall()
+        if not rows:
+            return 0
+        updates = []
+        for row in rows:
+            source = row['source']
+            seen = json.loads(row['seen_ids'] or '{}')
+            if source == 'hackernews':
+                column, keys = 'hn_url', {f"https://news.ycombinator.com/item?id={item_id}": item_id for item_id in seen}
+            elif source.startswith('arxiv/'):
+                column, keys = 'arxiv_id', {item_id: item_id for item_id in seen}
             else:
+                column, keys = 'url', {item_id: item_id for item_id in seen}
+            stored: Dict[str, int] = {}
+            lookup = list(keys)
+            with self._connect() as conn:
+                for start in range(0, len(lookup), 500):
+                    chunk = lookup[start:start + 500]
+                    placeholders = ','.join('?' for _ in chunk)
+                    for match in conn.execute(
+                        f"SELECT {column} AS key, published_ts FROM articles "
+                        f"WHERE {column} IN ({placeholders}) AND published_ts IS NOT NULL",
+                        chunk,
+                    ):
+                        stored[keys[match['key']]] = int(match['published_ts'])
+            fixed = {
+                item_id: stored.get(item_id, min(int(ts), utc_epoch(datetime.fromtimestamp(int(ts)))))
+                for item_id, ts in seen.items()
+            }
+            last_ts = int(row['last_ts'] or 0)
+            if fixed:
+                last_ts = max(fixed.values())
+            elif last_ts:
+                last_ts = min(last_ts, utc_epoch(datetime.fromtimestamp(last_ts)))
+            updates.append((last_ts, json.dumps(fixed), source, row['topic']))
+        self._write(lambda cur: cur.executemany(
+            "UPDATE source_watermarks SET last_ts = ?, seen_ids = ?, ts_basis = 'utc' WHERE source = ? AND topic = ?",
+            updates,
+        ))
+        print(f"🕒 Converted {len(updates)} saved watermarks to UTC epochs")
+        return len(updates)
+
+    def content_storage_stats(self) -> Dict[str, Any]:
+        """
+        Logical vs stored bytes of crawled bodies, plus DB file usage
+        """
+        with self._connect() as conn:
+            rows, logical = conn.execute(
+                """
+                SELECT COUNT(*), COALESCE(SUM(b.raw_size), 0)
+                FROM crawled_content cc JOIN content_blobs b ON b.hash = cc.content_hash
+                """
+            ).fetchone()
+            blobs, unique_raw, stored = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(raw_size), 0), COALESCE(SUM(stored_size), 0) FROM content_blobs"
+            ).fetchone()
+            inline = conn.execute(
+                "SELECT COALESCE(SUM(LENGTH(CAST(markdown_content AS BLOB))), 0) FROM crawled_content"
+            ).fetchone()[0]
+            codecs = {row[0]: row[1] for row in conn.execute("SELECT codec, COUNT(*) FROM content_blobs GROUP BY codec")}
+            page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+            page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+            freelist = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        return {
+            'crawled_rows': int(rows),
+            'blobs': int(blobs),
+            'codecs': codecs,
+            'logical_bytes': int(logical),
+            'unique_bytes': int(unique_raw),
+            'stored_bytes': int(stored),
+            'inline_bytes': int(inline),
+            'db_bytes': int(page_size * page_count),
+            'db_free_bytes': int(page_size * freelist),
+        }
+
+    def fetch_articles_for_embedding(self, pending_only: bool = False) -> List[sqlite3.Row]:
+        """
+        All rows to (re)embed at once; prefer iter_articles_for_embedding for large corpora
+        """
+        return [row for batch in self.iter_articles_for_embedding(pending_only=pending_only) for row in batch]
+
+    def iter_articles_for_embedding(self, pending_only: bool = False, batch_size: int = 200) -> Iterator[List[sqlite3.Row]]:
+        """
+        Yield rows to (re)embed in pages of `batch_size`, keyset-paginated on article id so
+        each page is a fresh indexed range query and only one page of markdown is in memory.
+        With pending_only, only articles never embedded or whose metadata/crawled content
+        changed since their last embedding.
+        """
+        pending_sql = """
+                AND (a.embedded_at IS NULL
+                     OR a.updated_at > a.embedded_at
+                     OR cc.updated_at > a.embedded_at)
+        """ if pending_only else ""
+        last_id = 0
+        while True:
+            with self._connect() as conn:
+                cur = conn.cursor()
                 cur.execute(
-                    """
-                    INSERT INTO crawled_content (
-                        article_id, url, markdown_content, word_count, crawled_at, updated_at
-                    ) VALUES (?, ?, ?, ?, ?, ?)
+                    f"""
+                    SELECT a.id, a.url, a.title, a.source, a.topic, a.description, a.abstract, a.content_hash,
+                           a.published_ts,
+                           COALESCE(decompress_content(b.codec, b.data), cc.markdown_content, '') AS markdown_content
+                    FROM articles a
+                    LEFT JOIN crawled_content cc ON cc.article_id = a.id
+                    LEFT JOIN content_blobs b ON b.hash = cc.content_hash
+                    WHERE a.id > ? {pending_sql}
+                    ORDER BY a.id
+                    LIMIT ?
                     """,
-                    (article_id, url, markdown, int(word_count or 0), crawled_at or now, now),
+                    (last_id, int(batch_size)),
                 )
-            conn.commit()
+                rows = cur.fetchall()
+            if not rows:
+                return
+            yield rows
+            last_id = rows[-1]['id']
 
-    def fetch_articles_for_embedding(self) -> List[sqlite3.Row]:
+    def mark_embedded(self, items: List[Tuple[int, str]]) -> None:
+        """
+        Record (article_id, content_hash) pairs as embedded now
+        """
+        if not items:
+            return
+        now = datetime.utcnow().isoformat()
+        self._write(lambda cur: cur.executemany(
+            "UPDATE articles SET content_hash = ?, embedded_at = ? WHERE id = ?",
+            [(content_hash, now, article_id) for article_id, content_hash in items],
+        ))
+
+    def reset_embedding_state(self) -> None:
+        """
+        Forget embedding markers so every article is treated as pending (full reindex)
+        """
+        self._write(lambda cur: cur.execute("UPDATE articles SET content_hash = NULL, embedded_at = NULL"))
+
+    def get_watermarks(self, topic: str) -> Dict[str, Watermark]:
+        with self._connect() as conn:
+            cur = conn.cursor()
+            cur.execute("SELECT source, last_ts, seen_ids FROM source_watermarks WHERE topic = ?", (topic,))
+            return {
+                row['source']: Watermark(last_ts=row['last_ts'], seen_ids=json.loads(row['seen_ids'] or '{}'))
+                for row in cur.fetchall()
+            }
+
+    def save_watermarks(self, topic: str, watermarks: Dict[str, Watermark]) -> None:
+        """
+        Persist all watermarks for a topic in one transaction (all or nothing)
+        """
+        if not watermarks:
+            return
+        now = datetime.utcnow().isoformat()
+        self._write(lambda cur: cur.executemany(
+            """
+            INSERT INTO source_watermarks (source, topic, last_ts, seen_ids, updated_at, ts_basis)
+            VALUES (?, ?, ?, ?, ?, 'utc')
+            ON CONFLICT(source, topic) DO UPDATE SET
+                last_ts = MAX(last_ts, excluded.last_ts),
+                seen_ids = excluded.seen_ids,
+                updated_at = excluded.updated_at,
+                ts_basis = excluded.ts_basis
+            """,
+            [(source, topic, mark.last_ts, json.dumps(mark.seen_ids), now) for source, mark in watermarks.items()],
+        ))
+
+    def _filter_sql(self, source: Optional[str] = None, topic: Optional[str] = None,
+                    since_ts: Optional[int] = None) -> Tuple[str, List[Any]]:
+        """
+        AND-able SQL conditions on alias `a` (articles) for the search filters
+        """
+        clauses: List[str] = []
+        params: List[Any] = []
+        if source:
+            clauses.append("a.source = ?")
+            params.append(source)
+        if topic:
+            clauses.append("a.topic = ?")
+            params.append(topic)
+        if since_ts is not None:
+            clauses.append("a.published_ts >= ?")
+            params.append(int(since_ts))
+        return " AND ".join(clauses), params
+
+    def filter_article_urls(self, source: Optional[str] = None, topic: Optional[str] = None,
+                            since_ts: Optional[int] = None, limit: int = 1000) -> Optional[List[str]]:
+        """
+        URLs of articles matching the filters, or None if more than `limit` match
+        (i.e. the filter is not selective enough to be worth a candidate-ID prefilter)
+        """
+        where_sql, params = self._filter_sql(source, topic, since_ts)
         with self._connect() as conn:
             cur = conn.cursor()
             cur.execute(
-                """
-                SELECT a.url, a.title, a.source, a.description, a.abstract,
-                       COALESCE(cc.markdown_content, '') AS markdown_content
-                FROM articles a
-                LEFT JOIN crawled_content cc ON cc.article_id = a.id
-                ORDER BY a.published_date DESC
-                """
+                f"SELECT a.url FROM articles a {'WHERE ' + where_sql if where_sql else ''} LIMIT ?",
+                params + [int(limit) + 1],
             )
-            return cur.fetchall()
+            urls = [row['url'] for row in cur.fetchall()]
+        return urls if len(urls) <= limit else None
+
+    def keyword_search(self, query: str, limit: int = 20, match_all: bool = True, source: Optional[str] = None,
+                       topic: Optional[str] = None, since_ts: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        BM25-ranked full-text search. Each whitespace-separated term is matched as a phrase
+        (so 'CVE-2024-1234' or 'gpt-4o' match exactly); match_all=False ORs the terms.
+        source/topic/since_ts filters are applied in the same query.
+        Returns [{url, title, source, bm25}] best first (lower bm25 is better).
+        """
+        if not self.fts_enabled:
+            raise RuntimeError("SQLite FTS5 is not available in this Python build")
+        terms = ['"' + term.replace('"', '""') + '"' for term in query.split()]
+        if not terms:
+            return []
+        match = (' AND ' if match_all else ' OR ').join(terms)
+        filter_sql, filter_params = self._filter_sql(source, topic, since_ts)
+        with self._connect() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                f"""
+                SELECT a.url, a.title, a.source, bm25(articles_fts, 10.0, 2.0, 2.0, 1.0) AS score
+                FROM articles_fts
+                JOIN articles a ON a.id = articles_fts.rowid
+                WHERE articles_fts MATCH ? {'AND ' + filter_sql if filter_sql else ''}
+                ORDER BY score
+                LIMIT ?
+                """,
+                [match] + filter_params + [int(limit)],
+            )
+            return [
+                {'url': row['url'], 'title': row['title'] or '', 'source': row['source'] or '', 'bm25': float(row['score'])}
+                for row in cur.fetchall()
+            ]
+
+    def aggregate_signals_by_topic(self, topics: List[str], days: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        aggregate_signals for many topics with one GROUP BY topic over the rollup
+        (topics with no rows get zeros)
+        """
+        unique = list(dict.fromkeys(topics))
+        totals = {topic: {'articles': 0, 'hn_points': 0, 'hn_comments': 0, 'crawled_count': 0} for topic in unique}
+        start_day = _signal_day(int(time.time()) - int(days * 86400)) if days is not None else None
+        with self._connect() as conn:
+            for start in range(0, len(unique), 500):
+                chunk = unique[start:start + 500]
+                placeholders = ','.join('?' * len(chunk))
+                params: List[Any] = list(chunk)
+                day_sql = ""
+                if start_day is not None:
+                    day_sql = "AND day >= ?"
+                    params.append(start_day)
+                cur = conn.execute(
+                    f"""
+                    SELECT topic, SUM(articles), SUM(points), SUM(comments), SUM(crawled)
+                    FROM daily_signals
+                    WHERE topic IN ({placeholders}) {day_sql}
+                    GROUP BY topic
+                    """,
+                    params,
+                )
+                for topic, articles, points, comments, crawled in cur.fetchall():
+                    totals[topic] = {'articles': int(articles or 0), 'hn_points': int(points or 0),
+                                     'hn_comments': int(comments or 0), 'crawled_count': int(crawled or 0)}
+        return totals
+
+    def daily_signal_series(self, start_day: int, topics: Optional[List[str]] = None) -> List[sqlite3.Row]:
+        """
+        Per (topic, UTC day) totals from day `start_day` on, summed over sources, for the
+        given topics (all topics if None). Days with no activity are absent.
+        """
+        sql = """
+            SELECT topic, day, SUM(articles) AS articles, SUM(points) AS points,
+                   SUM(comments) AS comments, SUM(crawled) AS crawled
+            FROM daily_signals WHERE day >= ? {topic_sql}
+            GROUP BY topic, day
+        """
+        with self._connect() as conn:
+            if topics is None:
+                return conn.execute(sql.format(topic_sql=''), (int(start_day),)).fetchall()
+            rows: List[sqlite3.Row] = []
+            unique = list(dict.fromkeys(topics))
+            for start in range(0, len(unique), 500):
+                chunk = unique[start:start + 500]
+                placeholders = ','.join('?' * len(chunk))
+                rows.extend(conn.execute(sql.format(topic_sql=f"AND topic IN ({placeholders})"),
+                                         [int(start_day)] + chunk).fetchall())
+            return rows
 
     def aggregate_signals(self, topic: Optional[str] = None, days: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Article/points/comments/crawled totals from the daily_signals rollup. `days` covers
+        whole UTC days (today plus the preceding days back to now - days), so the cost is
+        O(days x sources) whatever the article count; crawled counts follow the same scope.
+        """
         where_clauses = []
         params: List[Any] = []
         if topic:
             where_clauses.append("topic = ?")
             params.append(topic)
         if days is not None:
-            where_clauses.append("COALESCE(published_date, created_at) >= ?")
-            cutoff = datetime.utcnow().timestamp() - days * 86400
-            # Using created_at/published_date ISO strings; conservative filter
-            iso_cutoff = datetime.utcfromtimestamp(cutoff).isoformat()
-            params.append(iso_cutoff)
+            where_clauses.append("day >= ?")
+            params.append(_signal_day(int(time.time()) - int(days * 86400)))
 
         where_sql = ("WHERE " + " AND ".join(where_clauses)) if where_clauses else ""
         with self._connect() as conn:
             cur = conn.cursor()
-            cur.execute(f"SELECT COUNT(*) FROM articles {where_sql}", params)
-            total = cur.fetchone()[0]
-
-            cur.execute(f"SELECT SUM(points), SUM(comments_count) FROM articles {where_sql}", params)
-            row = cur.fetchone()
-            total_points = row[0] or 0
-            total_comments = row[1] or 0
-
-            cur.execute(f"SELECT COUNT(*) FROM crawled_content", [])
-            crawled = cur.fetchone()[0]
+            cur.execute(
+                f"SELECT SUM(articles), SUM(points), SUM(comments), SUM(crawled) FROM daily_signals {where_sql}",
+                params,
+            )
+            total, total_points, total_comments, crawled = (value or 0 for value in cur.fetchone())
 
         return {
             'articles': int(total),
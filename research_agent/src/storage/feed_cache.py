@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Persistent conditional-GET cache for RSS/Atom feeds.
+
+Stores ETag / Last-Modified and the parsed entries per feed URL in a small SQLite
+file (next to research.db). Requests send If-None-Match / If-Modified-Since; on a
+304 the cached entries are returned without downloading or reparsing the feed.
+Per-feed counters track hit rate and bytes saved, both over the cache's lifetime (stored)
+and for the current process (run_stats).
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+import feedparser
+
+
+class FeedCache:
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        # url -> this process's requests / not_modified / bytes_downloaded / bytes_saved
+        self._run: Dict[str, Dict[str, int]] = {}
+        self._init_schema()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _init_schema(self) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS feed_cache (
+                    url TEXT PRIMARY KEY,
+                    etag TEXT,
+                    last_modified TEXT,
+                    entries_json TEXT,
+                    body_bytes INTEGER DEFAULT 0,
+                    fetched_at TEXT,
+                    requests INTEGER DEFAULT 0,
+                    not_modified INTEGER DEFAULT 0,
+                    bytes_downloaded INTEGER DEFAULT 0,
+                    bytes_saved INTEGER DEFAULT 0
+                )
+                """
+            )
+            conn.commit()
+
+    def fetch_entries(self, session, url: str, timeout: float = 10) -> List[Any]:
+        """
+        Conditionally fetch `url` with a requests-compatible session and return feed entries.
+
+        Entries come back as feedparser.FeedParserDict objects either way, so callers can
+        keep using attribute access (entry.title, entry.published_parsed, ...).
+        """
+        cached = self._get(url)
+        headers = {}
+        if cached is not None:
+            if cached['etag']:
+                headers['If-None-Match'] = cached['etag']
+            if cached['last_modified']:
+                headers['If-Modified-Since'] = cached['last_modified']
+
+        response = session.get(url, headers=headers, timeout=timeout)
+
+        if response.status_code == 304 and cached is not None:
+            self._record_not_modified(url, cached['body_bytes'] or 0)
+            return [_jsonable_to_entry(e) for e in json.loads(cached['entries_json'] or '[]')]
+
+        response.raise_for_status()
+        body = response.content
+        parsed = feedparser.parse(body, response_headers=dict(response.headers))
+        self._store(
+            url=url,
+            etag=response.headers.get('ETag'),
+            last_modified=response.headers.get('Last-Modified'),
+            entries=parsed.entries,
+            body_bytes=len(body),
+        )
+        return parsed.entries
+
+    def run_stats(self) -> List[Dict[str, Any]]:
+        """
+        Per-feed counters for requests made by this process only (same fields as stats)
+        """
+        with self._lock:
+            run = {url: dict(counts) for url, counts in self._run.items()}
+        return [
+            {
+                'url': url,
+                **counts,
+                'hit_rate': (counts['not_modified'] / counts['requests']) if counts['requests'] else 0.0,
+            }
+            for url, counts in sorted(run.items())
+        ]
+
+    def _count_run(self, url: str, not_modified: int, bytes_downloaded: int, bytes_saved: int) -> None:
+        # Called with self._lock held
+        counts = self._run.setdefault(url, {'requests': 0, 'not_modified': 0, 'bytes_downloaded': 0, 'bytes_saved': 0})
+        counts['requests'] += 1
+        counts['not_modified'] += not_modified
+        counts['bytes_downloaded'] += bytes_downloaded
+        counts['bytes_saved'] += bytes_saved
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """
+        Lifetime per-feed counters: requests, 304 hits, hit rate, bytes downloaded and saved
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                """
+                SELECT url, requests, not_modified, bytes_downloaded, bytes_saved, fetched_at
+                FROM feed_cache ORDER BY url
+                """
+            ).fetchall()
+        out = []
+        for row in rows:
+            requests_made = row['requests'] or 0
+            hits = row['not_modified'] or 0
+            out.append({
+                'url': row['url'],
+                'requests': requests_made,
+                'not_modified': hits,
+                'hit_rate': (hits / requests_made) if requests_made else 0.0,
+                'bytes_downloaded': row['bytes_downloaded'] or 0,
+                'bytes_saved': row['bytes_saved'] or 0,
+                'fetched_at': row['fetched_at'],
+            })
+        return out
+
+    def _get(self, url: str) -> Optional[sqlite3.Row]:
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT etag, last_modified, entries_json, body_bytes FROM feed_cache WHERE url = ?",
+                (url,),
+            ).fetchone()
+
+    def _record_not_modified(self, url: str, body_bytes: int) -> None:
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                """
+                UPDATE feed_cache SET
+                    requests = requests + 1,
+                    not_modified = not_modified + 1,
+                    bytes_saved = bytes_saved + ?
+                WHERE url = ?
+                """,
+                (int(body_bytes), url),
+            )
+            conn.commit()
+            self._count_run(url, not_modified=1, bytes_downloaded=0, bytes_saved=int(body_bytes))
+
+    def _store(self, url: str, etag: Optional[str], last_modified: Optional[str],
+               entries: List[Any], body_bytes: int) -> None:
+        entries_json = json.dumps([_entry_to_jsonable(e) for e in entries], ensure_ascii=False)
+        now = datetime.utcnow().isoformat()
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                """
+                INSERT INTO feed_cache (
+                    url, etag, last_modified, entries_json, body_bytes, fetched_at,
+                    requests, not_modified, bytes_downloaded, bytes_saved
+                ) VALUES (?, ?, ?, ?, ?, ?, 1, 0, ?, 0)
+                ON CONFLICT(url) DO UPDATE SET
+                    etag = excluded.etag,
+                    last_modified = excluded.last_modified,
+                    entries_json = excluded.entries_json,
+                    body_bytes = excluded.body_bytes,
+                    fetched_at = excluded.fetched_at,
+                    requests = requests + 1,
+                    bytes_downloaded = bytes_downloaded + excluded.body_bytes
+                """,
+                (url, etag, last_modified, entries_json, int(body_bytes), now, int(body_bytes)),
+            )
+            conn.commit()
+            self._count_run(url, not_modified=0, bytes_downloaded=int(body_bytes), bytes_saved=0)
+
+
+def _entry_to_jsonable(value: Any) -> Any:
+    # feedparser entries are dicts of str/list/dict plus time.struct_time for *_parsed fields
+    if isinstance(value, time.struct_time):
+        return list(value)
+    if isinstance(value, dict):
+        return {k: _entry_to_jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_entry_to_jsonable(v) for v in value]
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+
+def _jsonable_to_entry(value: Any) -> Any:
+    if isinstance(value, dict):
+        return feedparser.FeedParserDict({k: _jsonable_to_entry(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return [_jsonable_to_entry(v) for v in value]
+    return value
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+TTL cache for JSON API responses (social signal collection).
+
+Response bodies are stored per request URL in a small SQLite file (next to research.db)
+with an expiry time; a lookup within the TTL returns the stored JSON without touching
+the network. Hit/miss counters are kept per process for the run summary.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+class ResponseCache:
+    def __init__(self, db_path: str, ttl_seconds: float = 3600):
+        self.db_path = db_path
+        self.ttl_seconds = float(ttl_seconds)
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._init_schema()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _init_schema(self) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS response_cache (
+                    url TEXT PRIMARY KEY,
+                    body TEXT,
+                    fetched_at REAL,
+                    expires_at REAL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_response_cache_expires ON response_cache(expires_at)")
+            conn.commit()
+
+    def get(self, url: str) -> Optional[Any]:
+        """
+        Cached JSON for `url` if stored within the TTL, else None
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT body FROM response_cache WHERE url = ? AND expires_at > ?", (url, time.time())
+            ).fetchone()
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(row['body'])
+
+    def put(self, url: str, payload: Any, ttl_seconds: Optional[float] = None) -> None:
+        now = time.time()
+        ttl = self.ttl_seconds if ttl_seconds is None else float(ttl_seconds)
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                """
+                INSERT INTO response_cache (url, body, fetched_at, expires_at) VALUES (?, ?, ?, ?)
+                ON CONFLICT(url) DO UPDATE SET
+                    body = excluded.body,
+                    fetched_at = excluded.fetched_at,
+                    expires_at = excluded.expires_at
+                """,
+                (url, json.dumps(payload, ensure_ascii=False), now, now + ttl),
+            )
+            conn.commit()
+
+    def purge_expired(self) -> int:
+        with self._lock, self._connect() as conn:
+            deleted = conn.execute("DELETE FROM response_cache WHERE expires_at <= ?", (time.time(),)).rowcount
+            conn.commit()
+        return deleted
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {'hits': self.hits, 'misses': self.misses, 'hit_rate': (self.hits / lookups) if lookups else 0.0}
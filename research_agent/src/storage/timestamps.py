@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+Timestamp conventions shared by storage and scrapers: stored ISO strings are naive UTC,
+and every comparison happens on UTC epoch seconds.
+"""
+
+from datetime import datetime, timezone
+from typing import Optional
+
+
+def iso_to_epoch(value: Optional[str]) -> int:
+    """
+    Epoch seconds for an ISO timestamp (naive values are taken as UTC); 0 if missing/invalid
+    """
+    if not value:
+        return 0
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return 0
+    return utc_epoch(parsed)
+
+
+def utc_epoch(value: datetime) -> int:
+    """
+    Epoch seconds for a datetime, reading naive values as UTC (not local time)
+    """
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp())
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Per-(source, topic) high-water marks for incremental ingest.
+
+A watermark remembers the newest item timestamp seen for a source key plus the IDs of
+recent items, so a scraper can skip everything it has already ingested. Source keys are
+per feed: 'hackernews', 'arxiv/<category>', or the RSS source name.
+"""
+
+from typing import Dict, Any, Collection, Iterable, Optional, Tuple
+
+from .timestamps import iso_to_epoch
+
+
+class Watermark:
+    # Recent item IDs kept to dedupe items that share (or lack) a timestamp
+    MAX_SEEN_IDS = 1000
+
+    def __init__(self, last_ts: int = 0, seen_ids: Optional[Dict[str, int]] = None):
+        self.last_ts = int(last_ts or 0)
+        self.seen_ids: Dict[str, int] = dict(seen_ids or {})
+
+    def is_new(self, item_id: str, ts: float) -> bool:
+        """
+        True if the item is at/after the watermark and not already seen
+        """
+        if item_id and item_id in self.seen_ids:
+            return False
+        return int(ts) >= self.last_ts
+
+    def advanced(self, items: Iterable[Tuple[str, float]]) -> "Watermark":
+        """
+        Return a new watermark moved forward past `items` ((item_id, ts) pairs)
+        """
+        seen = dict(self.seen_ids)
+        last_ts = self.last_ts
+        for item_id, ts in items:
+            ts = int(ts)
+            last_ts = max(last_ts, ts)
+            if item_id:
+                seen[item_id] = ts
+        if len(seen) > self.MAX_SEEN_IDS:
+            newest = sorted(seen.items(), key=lambda kv: kv[1], reverse=True)[:self.MAX_SEEN_IDS]
+            seen = dict(newest)
+        return Watermark(last_ts=last_ts, seen_ids=seen)
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, Watermark) and self.last_ts == other.last_ts and self.seen_ids == other.seen_ids
+
+
+def watermark_entry(article: Dict[str, Any]) -> Optional[Tuple[str, str, float]]:
+    """
+    Map a scraped article to (source key, item id, UTC epoch ts), or None if it has no timestamp.
+    Stored ISO stamps are naive UTC, so they must not be read as local time.
+    """
+    source = article.get('source') or ''
+    if source == 'hackernews':
+        key, item_id, stamp = 'hackernews', str(article.get('story_id') or ''), article.get('created_at')
+    elif source == 'arxiv':
+        key, item_id, stamp = f"arxiv/{article.get('category', '')}", str(article.get('arxiv_id') or ''), article.get('published_date')
+    else:
+        key, item_id, stamp = source, str(article.get('url') or ''), article.get('published_date')
+    if not key:
+        return None
+    if article.get('published_ts') is not None:
+        return key, item_id, int(article['published_ts'])
+    ts = iso_to_epoch(stamp)
+    if not ts:
+        return None
+    return key, item_id, ts
+
+
+def advance_watermarks(watermarks: Dict[str, Watermark], articles: Iterable[Dict[str, Any]]) -> Dict[str, Watermark]:
+    """
+    Return the watermarks (only the keys that moved) advanced past the given articles
+    """
+    observed: Dict[str, list] = {}
+    for article in articles:
+        entry = watermark_entry(article)
+        if entry:
+            key, item_id, ts = entry
+            observed.setdefault(key, []).append((item_id, ts))
+    advanced = {}
+    for key, items in observed.items():
+        new_mark = watermarks.get(key, Watermark()).advanced(items)
+        if new_mark != watermarks.get(key):
+            advanced[key] = new_mark
+    return advanced
+
+
+def watermarks_to_save(stored: Dict[str, Watermark], pending: Dict[str, Watermark],
+                       incomplete: Collection[str] = ()) -> Tuple[Dict[str, Watermark], Dict[str, Watermark]]:
+    """
+    Split the pending watermarks that moved into (to save, held back). Keys in `incomplete`
+    (sources whose fetch failed or was partial this run) are held back, so the items they
+    missed are fetched again next run.
+    """
+    save, held = {}, {}
+    for key, mark in pending.items():
+        if stored.get(key) == mark:
+            continue
+        (held if key in incomplete else save)[key] = mark
+    return save, held
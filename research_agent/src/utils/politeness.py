@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Per-host politeness helpers shared by the scrapers and the content crawler.
+
+Concurrency is bounded per host (so we never hammer one site) and consecutive
+requests to the same host are spaced by a minimum delay, while requests to
+different hosts proceed independently.
+"""
+
+import asyncio
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+
+def host_of(url: str) -> str:
+    """Return a normalized host key for rate limiting ('' if unparsable)."""
+    try:
+        host = (urlparse(url).hostname or '').lower()
+    except ValueError:
+        return ''
+    return host[4:] if host.startswith('www.') else host
+
+
+class HostThrottle:
+    """
+    Thread-safe per-host limiter for blocking (requests/feedparser) code; same semantics
+    as AsyncHostThrottle.
+
+    Usage:
+        with throttle.slot(url):
+            ...
+        lease = throttle.acquire(url)  # when another thread may need to free the slot
+        ...
+        lease.release()
+    """
+
+    def __init__(self, per_host_concurrency: int = 1, per_host_delay: float = 1.0,
+                 overrides: Optional[Dict[str, float]] = None):
+        self.per_host_concurrency = max(1, int(per_host_concurrency))
+        self.per_host_delay = max(0.0, float(per_host_delay))
+        self.overrides = {k.lower(): float(v) for k, v in (overrides or {}).items()}
+        self._lock = threading.Lock()
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._next_start: Dict[str, float] = {}
+
+    def acquire(self, url: str) -> "HostLease":
+        """
+        Wait for a slot on the url's host (concurrency, then spacing) and return its lease
+        """
+        host = host_of(url)
+        with self._lock:
+            semaphore = self._semaphores.setdefault(host, threading.BoundedSemaphore(self.per_host_concurrency))
+        semaphore.acquire()
+        try:
+            with self._lock:
+                now = time.monotonic()
+                start_at = max(now, self._next_start.get(host, 0.0))
+                self._next_start[host] = start_at + self.overrides.get(host, self.per_host_delay)
+            if start_at > now:
+                time.sleep(start_at - now)
+        except BaseException:
+            semaphore.release()
+            raise
+        return HostLease(semaphore)
+
+    @contextmanager
+    def slot(self, url: str):
+        lease = self.acquire(url)
+        try:
+            yield lease
+        finally:
+            lease.release()
+
+
+class HostLease:
+    """
+    A held HostThrottle slot; release() is idempotent and may be called from any thread
+    """
+
+    def __init__(self, semaphore: threading.BoundedSemaphore):
+        self._semaphore = semaphore
+        self._lock = threading.Lock()
+        self._released = False
+
+    def release(self) -> None:
+        with self._lock:
+            if self._released:
+                return
+            self._released = True
+        self._semaphore.release()
+
+
+class AsyncHostThrottle:
+    """
+    asyncio per-host limiter: at most `per_host_concurrency` in-flight requests per host,
+    and at least `per_host_delay` seconds between request starts on the same host.
+
+    Usage:
+        async with throttle.slot(url):
+            ...
+        async with throttle.slot(url, gate=global_limit):  # also bounded by a shared semaphore
+            ...
+    """
+
+    def __init__(self, per_host_concurrency: int = 2, per_host_delay: float = 1.0,
+                 overrides: Optional[Dict[str, float]] = None):
+        self.per_host_concurrency = max(1, int(per_host_concurrency))
+        self.per_host_delay = max(0.0, float(per_host_delay))
+        # Optional host -> delay overrides (e.g. slower for github API)
+        self.overrides = {k.lower(): float(v) for k, v in (overrides or {}).items()}
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._next_start: Dict[str, float] = {}
+
+    def _delay_for(self, host: str) -> float:
+        return self.overrides.get(host, self.per_host_delay)
+
+    def slot(self, url: str, gate: Optional[asyncio.Semaphore] = None) -> "_AsyncHostSlot":
+        """
+        `gate` (e.g. a global concurrency limit) is acquired only once the host's turn has
+        come, so a slot sleeping out its per-host delay never holds a gate permit that a
+        ready request to another host could use
+        """
+        host = host_of(url)
+        if host not in self._semaphores:
+            self._semaphores[host] = asyncio.Semaphore(self.per_host_concurrency)
+            self._locks[host] = asyncio.Lock()
+        return _AsyncHostSlot(self, host, gate)
+
+    async def _wait_turn(self, host: str) -> None:
+        # Serialize the "reserve next start time" step so spacing holds under concurrency
+        async with self._locks[host]:
+            loop = asyncio.get_running_loop()
+            now = loop.time()
+            start_at = max(now, self._next_start.get(host, 0.0))
+            self._next_start[host] = start_at + self._delay_for(host)
+        wait = start_at - now
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def _mark_started(self, host: str) -> None:
+        # A request that queued for the gate after its turn starts late; keep the next one spaced from it
+        now = asyncio.get_running_loop().time()
+        self._next_start[host] = max(self._next_start.get(host, 0.0), now + self._delay_for(host))
+
+
+class _AsyncHostSlot:
+    def __init__(self, throttle: AsyncHostThrottle, host: str, gate: Optional[asyncio.Semaphore] = None):
+        self.throttle = throttle
+        self.host = host
+        self.gate = gate
+
+    async def __aenter__(self):
+        await self.throttle._semaphores[self.host].acquire()
+        try:
+            await self.throttle._wait_turn(self.host)
+            if self.gate is not None:
+                await self.gate.acquire()
+                self.throttle._mark_started(self.host)
+        except BaseException:
+            self.throttle._semaphores[self.host].release()
+            raise
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if self.gate is not None:
+            self.gate.release()
+        self.throttle._semaphores[self.host].release()
+        return False
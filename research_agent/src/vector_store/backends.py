@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+Vector index backends behind VectorStore.
+
+- ChromaBackend: Chroma PersistentClient collection with an HNSW cosine index.
+- NumpyBackend: exact cosine top-k over a memory-mapped float16/int8 matrix. For tens of
+  thousands of chunks a vectorized scan is fast and avoids Chroma's startup and per-call
+  overhead. Rows are append-only; `ids.jsonl` records every upsert/delete and is replayed
+  on open (an upsert appends a new row and retires the old one; `compact()` reclaims them).
+  Writers take an exclusive lock on `write.lock` (flock) and replay the log first if
+  another process has changed it, so concurrent ingests never claim the same rows.
+
+Both take float32 embeddings and return Chroma-shaped query results
+({'ids', 'metadatas', 'distances'}, one list per query, cosine distance = 1 - similarity),
+and both understand the `where` filters produced by filters.build_where.
+"""
+
+import json
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows: writers are then only serialized in-process
+    fcntl = None
+
+COLLECTION_NAME = 'research_articles'
+BACKENDS = ('chroma', 'numpy')
+
+
+class ChromaBackend:
+    name = 'chroma'
+
+    def __init__(self, persist_directory: str):
+        import chromadb
+        # Use new PersistentClient for on-disk storage (Chroma >= 1.0)
+        self.client = chromadb.PersistentClient(path=persist_directory)
+        self.collection = self.client.get_or_create_collection(name=COLLECTION_NAME, metadata={"hnsw:space": "cosine"})
+
+    def upsert(self, ids: List[str], embeddings: np.ndarray, metadatas: List[Dict[str, Any]],
+               documents: Optional[List[str]] = None) -> None:
+        self.collection.upsert(ids=ids, embeddings=np.asarray(embeddings).tolist(),
+                               metadatas=metadatas, documents=documents)
+
+    def delete_urls(self, urls: List[str]) -> None:
+        self.collection.delete(where={'url': {'$in': urls}})
+
+    def query(self, embeddings: np.ndarray, n_results: int, where: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        kwargs = {'where': where} if where else {}
+        raw = self.collection.query(query_embeddings=np.asarray(embeddings).tolist(), n_results=n_results,
+                                    include=['metadatas', 'distances'], **kwargs)
+        return {'ids': raw['ids'], 'metadatas': raw['metadatas'], 'distances': raw['distances']}
+
+    def count(self) -> int:
+        return self.collection.count()
+
+    def reset(self) -> None:
+        self.client.delete_collection(name=COLLECTION_NAME)
+        self.collection = self.client.get_or_create_collection(name=COLLECTION_NAME, metadata={"hnsw:space": "cosine"})
+
+
+class NumpyBackend:
+    name = 'numpy'
+    INITIAL_CAPACITY = 1024
+    SCAN_BLOCK_ROWS = 4096
+    INT8_SCALE = 127.0
+
+    def __init__(self, persist_directory: str, dim: int, dtype: str = 'float16'):
+        if dtype not in ('float16', 'int8'):
+            raise ValueError(f"unsupported numpy backend dtype: {dtype}")
+        self.dim = int(dim)
+        self.dtype = np.dtype(dtype)
+        self.dir = Path(persist_directory) / f"numpy_{self.dtype.name}_{self.dim}"
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.matrix_path = self.dir / 'vectors.bin'
+        self.ids_path = self.dir / 'ids.jsonl'
+        self.lock_path = self.dir / 'write.lock'
+        self._lock = threading.Lock()
+        self._matrix = None
+        self._load()
+
+    # ---- storage ----
+
+    def _load(self) -> None:
+        self._row_ids: List[str] = []
+        self._row_meta: List[Dict[str, Any]] = []
+        self._id_to_row: Dict[str, int] = {}
+        live: List[bool] = []
+        self._log_state = None
+        if self.ids_path.exists():
+            with open(self.ids_path, 'r', encoding='utf-8') as f:
+                # Taken before reading: a line appended meanwhile makes the state stale, not lost
+                self._log_state = self._file_state(os.fstat(f.fileno()))
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        break  # torn final line from an interrupted write
+                    old = self._id_to_row.pop(record['id'], None)
+                    if old is not None:
+                        live[old] = False
+                    if record.get('deleted'):
+                        continue
+                    row = len(self._row_ids)
+                    self._row_ids.append(record['id'])
+                    self._row_meta.append(record.get('meta') or {})
+                    self._id_to_row[record['id']] = row
+                    live.append(True)
+        self._live = np.array(live, dtype=bool)
+        self._columns: Dict[str, np.ndarray] = {}
+        capacity = self.matrix_path.stat().st_size // self._row_bytes() if self.matrix_path.exists() else 0
+        self._open_matrix(max(capacity, len(self._row_ids), self.INITIAL_CAPACITY))
+        self._norms = self._compute_norms(0, len(self._row_ids))
+
+    @staticmethod
+    def _file_state(st: os.stat_result):
+        return st.st_ino, st.st_size
+
+    def _current_log_state(self):
+        try:
+            return self._file_state(self.ids_path.stat())
+        except FileNotFoundError:
+            return None
+
+    @contextmanager
+    def _write_lock(self):
+        """
+        Exclusive across threads and processes; reloads first if another process wrote
+        """
+        with self._lock, open(self.lock_path, 'a') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            if self._current_log_state() != self._log_state:
+                self._load()
+            yield
+            # Released when lock_file closes
+
+    def _row_bytes(self) -> int:
+        return self.dim * self.dtype.itemsize
+
+    def _open_matrix(self, capacity: int) -> None:
+        if self._matrix is not None:
+            self._matrix.flush()
+            self._matrix = None
+        with open(self.matrix_path, 'ab') as f:
+            if f.tell() < capacity * self._row_bytes():
+                f.truncate(capacity * self._row_bytes())
+        self._matrix = np.memmap(self.matrix_path, dtype=self.dtype, mode='r+', shape=(capacity, self.dim))
+
+    def _compute_norms(self, start: int, stop: int) -> np.ndarray:
+        norms = np.empty(stop - start, dtype=np.float32)
+        for block in range(start, stop, self.SCAN_BLOCK_ROWS):
+            end = min(block + self.SCAN_BLOCK_ROWS, stop)
+            rows = self._matrix[block:end].astype(np.float32)
+            norms[block - start:end - start] = np.linalg.norm(rows, axis=1)
+        norms[norms == 0] = 1.0
+        return norms
+
+    def _encode_rows(self, embeddings: np.ndarray) -> np.ndarray:
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = vectors / np.where(norms == 0, 1.0, norms)
+        if self.dtype == np.int8:
+            # Per-row scale so each row uses the full int8 range; cosine ignores the scale
+            # because scores are divided by the stored row's own norm
+            peak = np.abs(vectors).max(axis=1, keepdims=True)
+            return np.rint(vectors * (self.INT8_SCALE / np.where(peak == 0, 1.0, peak))).astype(np.int8)
+        return vectors.astype(self.dtype)
+
+    def _append_log(self, records: List[Dict[str, Any]]) -> None:
+        with open(self.ids_path, 'a', encoding='utf-8') as f:
+            f.write(''.join(json.dumps(r, ensure_ascii=False) + '\n' for r in records))
+            f.flush()
+            os.fsync(f.fileno())
+            self._log_state = self._file_state(os.fstat(f.fileno()))
+
+    # ---- backend interface ----
+
+    def upsert(self, ids: List[str], embeddings: np.ndarray, metadatas: List[Dict[str, Any]],
+               documents: Optional[List[str]] = None) -> None:
+        # Documents are not stored: the text lives in SQLite, search only needs metadata
+        if not ids:
+            return
+        rows = self._encode_rows(embeddings)
+        with self._write_lock():
+            start = len(self._row_ids)
+            stop = start + len(ids)
+            if stop > self._matrix.shape[0]:
+                self._open_matrix(max(stop, self._matrix.shape[0] * 2))
+            # Vectors first, then the log line that makes them visible
+            self._matrix[start:stop] = rows
+            self._matrix.flush()
+            self._append_log([{'id': i, 'meta': m} for i, m in zip(ids, metadatas)])
+            live = np.ones(len(ids), dtype=bool)
+            for offset, item_id in enumerate(ids):
+                old = self._id_to_row.get(item_id)
+                if old is not None:
+                    if old >= start:
+                        live[old - start] = False  # duplicate id within this batch
+                    else:
+                        self._live[old] = False
+                self._id_to_row[item_id] = start + offset
+            self._row_ids.extend(ids)
+            self._row_meta.extend(metadatas)
+            self._live = np.concatenate([self._live, live])
+            self._norms = np.concatenate([self._norms, self._compute_norms(start, stop)])
+            self._columns = {}
+
+    def delete_urls(self, urls: List[str]) -> None:
+        wanted = set(urls)
+        with self._write_lock():
+            doomed = [row for row in np.flatnonzero(self._live) if self._row_meta[row].get('url') in wanted]
+            if not doomed:
+                return
+            self._append_log([{'id': self._row_ids[row], 'deleted': True} for row in doomed])
+            for row in doomed:
+                self._live[row] = False
+                self._id_to_row.pop(self._row_ids[row], None)
+
+    def query(self, embeddings: np.ndarray, n_results: int, where: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        queries = np.asarray(embeddings, dtype=np.float32)
+        queries = queries / np.maximum(np.linalg.norm(queries, axis=1, keepdims=True), 1e-12)
+        with self._lock:
+            mask = self._live & self._where_mask(where) if where else self._live
+            candidates = np.flatnonzero(mask)
+            n = min(int(n_results), candidates.size)
+            empty = {'ids': [[] for _ in queries], 'metadatas': [[] for _ in queries], 'distances': [[] for _ in queries]}
+            if n == 0:
+                return empty
+            scores = np.empty((len(queries), candidates.size), dtype=np.float32)
+            contiguous = candidates.size == len(self._row_ids)  # nothing filtered or retired: scan slices
+            for block in range(0, candidates.size, self.SCAN_BLOCK_ROWS):
+                end = min(block + self.SCAN_BLOCK_ROWS, candidates.size)
+                rows = self._matrix[block:end] if contiguous else self._matrix[candidates[block:end]]
+                norms = self._norms[block:end] if contiguous else self._norms[candidates[block:end]]
+                scores[:, block:end] = (queries @ rows.astype(np.float32).T) / norms
+            # Exact top-n per query: O(N) partition, then sort only the n winners
+            top = np.argpartition(-scores, n - 1, axis=1)[:, :n]
+            top_scores = np.take_along_axis(scores, top, axis=1)
+            order = np.argsort(-top_scores, axis=1)
+            top = np.take_along_axis(top, order, axis=1)
+            top_scores = np.take_along_axis(top_scores, order, axis=1)
+            result_rows = candidates[top]
+            return {
+                'ids': [[self._row_ids[r] for r in rows] for rows in result_rows],
+                'metadatas': [[self._row_meta[r] for r in rows] for rows in result_rows],
+                'distances': [(1.0 - s).astype(float).tolist() for s in top_scores],
+            }
+
+    def count(self) -> int:
+        return int(self._live.sum())
+
+    def reset(self) -> None:
+        with self._write_lock():
+            if self._matrix is not None:
+                self._matrix.flush()
+                self._matrix = None
+            self.matrix_path.unlink(missing_ok=True)
+            self.ids_path.unlink(missing_ok=True)
+            self._load()
+
+    def compact(self) -> int:
+        """
+        Rewrite the matrix and id log with live rows only; returns the number of rows reclaimed
+        """
+        with self._write_lock():
+            keep = np.flatnonzero(self._live)
+            reclaimed = len(self._row_ids) - keep.size
+            if reclaimed == 0:
+                return 0
+            tmp_matrix = self.matrix_path.with_suffix('.bin.tmp')
+            tmp_ids = self.ids_path.with_suffix('.jsonl.tmp')
+            packed = np.memmap(tmp_matrix, dtype=self.dtype, mode='w+',
+                               shape=(max(keep.size, self.INITIAL_CAPACITY), self.dim))
+            for block in range(0, keep.size, self.SCAN_BLOCK_ROWS):
+                rows = keep[block:block + self.SCAN_BLOCK_ROWS]
+                packed[block:block + rows.size] = self._matrix[rows]
+            packed.flush()
+            del packed
+            with open(tmp_ids, 'w', encoding='utf-8') as f:
+                for row in keep:
+                    f.write(json.dumps({'id': self._row_ids[row], 'meta': self._row_meta[row]}, ensure_ascii=False) + '\n')
+            self._matrix.flush()
+            self._matrix = None
+            os.replace(tmp_matrix, self.matrix_path)
+            os.replace(tmp_ids, self.ids_path)
+            self._load()
+            return reclaimed
+
+    # ---- metadata filters ----
+
+    def _column(self, field: str) -> np.ndarray:
+        column = self._columns.get(field)
+        if column is None:
+            column = np.empty(len(self._row_meta), dtype=object)
+            column[:] = [meta.get(field) for meta in self._row_meta]
+            self._columns[field] = column
+        return column
+
+    def _where_mask(self, where: Dict[str, Any]) -> np.ndarray:
+        """
+        Evaluate a Chroma-style where clause ($and/$or, $eq/$ne/$in/$nin/$gt/$gte/$lt/$lte)
+        """
+        mask = np.ones(len(self._row_ids), dtype=bool)
+        for key, value in where.items():
+            if key == '$and':
+                for clause in value:
+                    mask &= self._where_mask(clause)
+            elif key == '$or':
+                any_mask = np.zeros(len(self._row_ids), dtype=bool)
+                for clause in value:
+                    any_mask |= self._where_mask(clause)
+                mask &= any_mask
+            else:
+                conditions = value if isinstance(value, dict) else {'$eq': value}
+                for op, operand in conditions.items():
+                    mask &= self._compare(self._column(key), op, operand)
+        return mask
+
+    @staticmethod
+    def _compare(column: np.ndarray, op: str, operand: Any) -> np.ndarray:
+        if op in ('$in', '$nin'):
+            members = set(operand)
+            hit = np.fromiter((value in members for value in column), dtype=bool, count=len(column))
+            return hit if op == '$in' else ~hit
+        if op == '$eq':
+            return column == operand
+        if op == '$ne':
+            return column != operand
+        numbers = np.array([value if isinstance(value, (int, float)) else np.nan for value in column], dtype=np.float64)
+        with np.errstate(invalid='ignore'):
+            if op == '$gt':
+                return numbers > operand
+            if op == '$gte':
+                return numbers >= operand
+            if op == '$lt':
+                return numbers < operand
+            if op == '$lte':
+                return numbers <= operand
+        raise ValueError(f"unsupported where operator: {op}")
+
+
+def make_backend(name: str, persist_directory: str, dim: int, numpy_dtype: str = 'float16'):
+    if name == 'chroma':
+        return ChromaBackend(persist_directory)
+    if name == 'numpy':
+        return NumpyBackend(persist_directory, dim=dim, dtype=numpy_dtype)
+    raise ValueError(f"unknown vector backend: {name} (choose from {', '.join(BACKENDS)})")
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Token-length-aware batching for embedding.
+
+Documents range from a title-only HN story (a few dozen word pieces) to crawled chunks at
+the model's 256-token limit; a batch is padded to its longest member. Texts are sorted by
+tokenized length and packed into batches whose padded size (rows x longest row) stays under
+a token budget, so short texts go through in large batches and long ones in small batches.
+Embeddings come back in the caller's original order.
+"""
+
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+UNSORTED_BATCH_SIZE = 32  # SentenceTransformer.encode default, used for the padding comparison
+
+
+class EncodeStats:
+    def __init__(self):
+        self.texts = 0
+        self.batches = 0
+        self.tokens = 0
+        self.padded_tokens = 0
+        self.unsorted_padded_tokens = 0  # what fixed-size batches in input order would have cost
+        self.seconds = 0.0
+
+    def merge(self, other: Dict[str, Any]) -> None:
+        for name, value in other.items():
+            setattr(self, name, getattr(self, name) + value)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'texts': self.texts,
+            'batches': self.batches,
+            'tokens': self.tokens,
+            'padded_tokens': self.padded_tokens,
+            'unsorted_padded_tokens': self.unsorted_padded_tokens,
+            'seconds': self.seconds,
+        }
+
+    def padding_ratio(self, padded: Optional[int] = None) -> float:
+        padded = self.padded_tokens if padded is None else padded
+        return (padded - self.tokens) / padded if padded else 0.0
+
+    def summary(self) -> str:
+        rate = self.tokens / self.seconds if self.seconds else 0.0
+        return (f"{self.texts} texts in {self.batches} batches, {rate:,.0f} tokens/s, "
+                f"padding {self.padding_ratio():.1%} (unsorted would be "
+                f"{self.padding_ratio(self.unsorted_padded_tokens):.1%})")
+
+
+def token_lengths(model, texts: Sequence[str]) -> List[int]:
+    """
+    Word-piece counts (with special tokens, truncated at the model's max length)
+    """
+    encoded = model.tokenizer(list(texts), add_special_tokens=True, truncation=True,
+                              max_length=model.max_seq_length, return_attention_mask=False,
+                              return_token_type_ids=False)
+    return [len(ids) for ids in encoded['input_ids']]
+
+
+def word_token_counter(tokenizer, cache_size: int = 200_000):
+    """
+    Chunker `count_tokens` from an encoder tokenizer: word pieces per whitespace-separated
+    word, without special tokens. Memoized, since chunk text repeats the same words a lot.
+    """
+    cache: Dict[str, int] = {}
+
+    def count(words: Sequence[str]) -> List[int]:
+        missing = [word for word in dict.fromkeys(words) if word not in cache]
+        if missing:
+            encoded = tokenizer(missing, add_special_tokens=False, return_attention_mask=False,
+                                return_token_type_ids=False)
+            if len(cache) + len(missing) > cache_size:
+                cache.clear()
+            cache.update(zip(missing, (len(ids) for ids in encoded['input_ids'])))
+        return [cache[word] for word in words]
+
+    return count
+
+
+def plan_length_batches(lengths: Sequence[int], token_budget: int, max_batch: int) -> List[List[int]]:
+    """
+    Group indices into batches, longest first, so that len(batch) * longest <= token_budget
+    (always at least one text per batch) and len(batch) <= max_batch
+    """
+    order = sorted(range(len(lengths)), key=lambda i: lengths[i], reverse=True)
+    batches: List[List[int]] = []
+    current: List[int] = []
+    longest = 0
+    for i in order:
+        candidate_longest = max(longest, lengths[i])
+        if current and (len(current) >= max_batch or (len(current) + 1) * candidate_longest > token_budget):
+            batches.append(current)
+            current, candidate_longest = [], lengths[i]
+        current.append(i)
+        longest = candidate_longest
+    if current:
+        batches.append(current)
+    return batches
+
+
+def padded_cost(lengths: Sequence[int], batches: Sequence[Sequence[int]]) -> int:
+    return sum(len(batch) * max(lengths[i] for i in batch) for batch in batches if batch)
+
+
+def encode_length_bucketed(model, texts: Sequence[str], token_budget: int = 8192, max_batch: int = 256,
+                           stats: Optional[EncodeStats] = None) -> np.ndarray:
+    """
+    Encode `texts` with `model` (a SentenceTransformer) in length-sorted, token-budgeted
+    batches and return float32 embeddings in the original order
+    """
+    if not texts:
+        return np.zeros((0, model.get_sentence_embedding_dimension()), dtype=np.float32)
+    lengths = token_lengths(model, texts)
+    batches = plan_length_batches(lengths, token_budget, max_batch)
+    out = np.empty((len(texts), model.get_sentence_embedding_dimension()), dtype=np.float32)
+    started = time.perf_counter()
+    for batch in batches:
+        vectors = model.encode([texts[i] for i in batch], batch_size=len(batch),
+                               show_progress_bar=False, convert_to_numpy=True)
+        out[batch] = vectors
+    if stats is not None:
+        unsorted = [range(start, min(start + UNSORTED_BATCH_SIZE, len(texts)))
+                    for start in range(0, len(texts), UNSORTED_BATCH_SIZE)]
+        stats.merge({
+            'texts': len(texts),
+            'batches': len(batches),
+            'tokens': sum(lengths),
+            'padded_tokens': padded_cost(lengths, batches),
+            'unsorted_padded_tokens': padded_cost(lengths, unsorted),
+            'seconds': time.perf_counter() - started,
+        })
+    return out
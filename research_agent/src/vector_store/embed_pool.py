@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Multi-process embedding pool for large backfills/reindexes.
+
+Each worker process loads its own encoder copy (torch SentenceTransformer or ONNX Runtime
+session) limited to its share of the cores, so N workers keep N groups of cores busy instead of one encode call
+saturating a single process. Batches are submitted ahead (bounded) and collected in
+submission order, so callers can stream results straight into ordered upserts.
+"""
+
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+import numpy as np
+
+from .batching import EncodeStats, encode_length_bucketed
+from .encoders import load_encoder
+
+T = TypeVar('T')
+
+_worker_model = None
+_worker_budget = (8192, 256)
+
+
+def _init_worker(model_name: str, threads: int, token_budget: int, max_encode_batch: int,
+                 engine: str, encoder_dir: Optional[str]) -> None:
+    global _worker_model, _worker_budget
+    _worker_budget = (token_budget, max_encode_batch)
+    # Must be set before torch spins up its thread pools in this process
+    os.environ['OMP_NUM_THREADS'] = str(threads)
+    os.environ['MKL_NUM_THREADS'] = str(threads)
+    os.environ['TOKENIZERS_PARALLELISM'] = 'false'
+    if engine == 'torch':
+        import torch
+        torch.set_num_threads(threads)
+        try:
+            torch.set_num_interop_threads(1)
+        except RuntimeError:
+            pass  # already initialized in this process
+    _worker_model = load_encoder(model_name, engine=engine, encoder_dir=encoder_dir, threads=threads)
+
+
+def _encode_in_worker(texts: List[str]) -> Tuple[np.ndarray, Dict[str, Any]]:
+    stats = EncodeStats()
+    token_budget, max_batch = _worker_budget
+    vectors = encode_length_bucketed(_worker_model, texts, token_budget=token_budget, max_batch=max_batch, stats=stats)
+    return vectors, stats.as_dict()
+
+
+class EmbeddingPool:
+    def __init__(self, model_name: str, workers: int, threads_per_worker: Optional[int] = None,
+                 token_budget: int = 8192, max_encode_batch: int = 256, engine: str = 'torch',
+                 encoder_dir: Optional[str] = None):
+        self.workers = max(1, int(workers))
+        self.stats = EncodeStats()
+        cores = os.cpu_count() or 1
+        self.threads_per_worker = max(1, int(threads_per_worker or cores // self.workers))
+        # spawn, not fork: forking a process that already initialized torch threads can deadlock
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(model_name, self.threads_per_worker, token_budget, max_encode_batch, engine, encoder_dir),
+        )
+
+    def submit(self, texts: List[str]) -> Future:
+        return self._executor.submit(_encode_in_worker, list(texts))
+
+    def map_ordered(self, batches: Iterable[Tuple[T, List[str]]], max_in_flight: Optional[int] = None
+                    ) -> Iterator[Tuple[T, np.ndarray]]:
+        """
+        Encode (tag, texts) batches across the pool; yield (tag, embeddings) in input order.
+        At most `max_in_flight` batches (default 2 per worker) are outstanding at once.
+        """
+        limit = max(1, int(max_in_flight or self.workers * 2))
+        in_flight: Deque[Tuple[T, Future]] = deque()
+        for tag, texts in batches:
+            in_flight.append((tag, self.submit(texts)))
+            if len(in_flight) >= limit:
+                yield self._collect(*in_flight.popleft())
+        while in_flight:
+            yield self._collect(*in_flight.popleft())
+
+    def _collect(self, tag, future: Future):
+        vectors, stats = future.result()
+        self.stats.merge(stats)
+        return tag, vectors
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self) -> 'EmbeddingPool':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
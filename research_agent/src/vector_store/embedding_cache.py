@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Persistent on-disk embedding cache keyed by model name + hash of the normalized text.
+
+Vectors live in a memory-mapped float16 (or float32) matrix file; a small SQLite index
+maps text keys to matrix rows and tracks last use. When the matrix would exceed
+`max_bytes`, the least recently used rows are evicted and their slots reused.
+Several processes may share a cache: slots are allocated and written under a SQLite
+write lock (BEGIN IMMEDIATE), and a reader remaps the matrix when another process has
+grown it past the rows it has mapped.
+Lives outside vector_store/ so it survives `clean --vectors`.
+"""
+
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+
+class EmbeddingCache:
+    INITIAL_CAPACITY = 1024
+
+    def __init__(self, cache_dir: str, model_name: str, dim: int, dtype: str = 'float16',
+                 max_bytes: int = 512 * 1024 * 1024):
+        self.model_name = model_name
+        self.dim = int(dim)
+        self.dtype = np.dtype(dtype)
+        self.row_bytes = self.dim * self.dtype.itemsize
+        self.max_rows = max(1, int(max_bytes) // self.row_bytes)
+        self.hits = 0
+        self.misses = 0
+
+        safe_model = re.sub(r'[^A-Za-z0-9_.-]+', '_', model_name)
+        self.dir = Path(cache_dir) / safe_model
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.matrix_path = self.dir / f"vectors.{self.dtype.name}.{self.dim}.bin"
+        self.index_path = self.dir / f"index.{self.dtype.name}.{self.dim}.sqlite"
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.index_path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, slot INTEGER UNIQUE, last_used REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_last_used ON entries(last_used)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER)")
+        self._conn.commit()
+        self._matrix = None
+        self._open_matrix(max(self._capacity_on_disk(), min(self.INITIAL_CAPACITY, self.max_rows)))
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        return ' '.join((text or '').split())
+
+    def key_for(self, text: str) -> str:
+        payload = f"{self.model_name}\n{self.normalize(text)}".encode('utf-8')
+        return hashlib.sha256(payload).hexdigest()
+
+    def get_many(self, texts: Sequence[str]) -> List[Optional[np.ndarray]]:
+        """
+        Cached float32 vectors for `texts` (None where missing), refreshing LRU stamps
+        """
+        keys = [self.key_for(t) for t in texts]
+        out: List[Optional[np.ndarray]] = [None] * len(keys)
+        with self._lock:
+            slots = {}
+            for start in range(0, len(keys), 500):
+                chunk = list(set(keys[start:start + 500]))
+                placeholders = ','.join('?' * len(chunk))
+                for key, slot in self._conn.execute(
+                        f"SELECT key, slot FROM entries WHERE key IN ({placeholders})", chunk):
+                    slots[key] = slot
+            for i, key in enumerate(keys):
+                slot = slots.get(key)
+                if slot is not None:
+                    self._ensure_mapped(slot)
+                    out[i] = np.asarray(self._matrix[slot], dtype=np.float32)
+            if slots:
+                now = time.time()
+                self._conn.executemany("UPDATE entries SET last_used = ? WHERE key = ?",
+                                       [(now, key) for key in slots])
+                self._conn.commit()
+        found = sum(1 for v in out if v is not None)
+        self.hits += found
+        self.misses += len(out) - found
+        return out
+
+    def put_many(self, texts: Sequence[str], embeddings: np.ndarray) -> None:
+        embeddings = np.asarray(embeddings)
+        if len(texts) == 0:
+            return
+        rows = {}
+        for text, vector in zip(texts, embeddings):
+            rows[self.key_for(text)] = vector
+        if len(rows) > self.max_rows:
+            # Cannot hold them all; keep the tail (most recently produced)
+            rows = dict(list(rows.items())[-self.max_rows:])
+        with self._lock:
+            # Hold the index's write lock from lookup to commit, so another process cannot
+            # claim the same slots or read a row before its vector is written
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                placeholders = ','.join('?' * len(rows))
+                existing = {key: slot for key, slot in self._conn.execute(
+                    f"SELECT key, slot FROM entries WHERE key IN ({placeholders})", list(rows))}
+                new_keys = [key for key in rows if key not in existing]
+                slots = self._allocate_slots(len(new_keys), protect=set(existing))
+                now = time.time()
+                assignments = list(existing.items()) + list(zip(new_keys, slots))
+                for key, slot in assignments:
+                    self._ensure_mapped(slot)
+                    self._matrix[slot] = rows[key].astype(self.dtype, copy=False)
+                self._matrix.flush()
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO entries (key, slot, last_used) VALUES (?, ?, ?)",
+                    [(key, slot, now) for key, slot in assignments],
+                )
+                self._conn.commit()
+            except BaseException:
+                self._conn.rollback()
+                raise
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        return {
+            'entries': int(entries),
+            'bytes_on_disk': self.matrix_path.stat().st_size if self.matrix_path.exists() else 0,
+            'max_entries': self.max_rows,
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._matrix is not None:
+                self._matrix.flush()
+                self._matrix = None
+            self._conn.close()
+
+    def _capacity_on_disk(self) -> int:
+        if not self.matrix_path.exists():
+            return 0
+        return self.matrix_path.stat().st_size // self.row_bytes
+
+    def _open_matrix(self, capacity: int) -> None:
+        capacity = max(1, min(int(capacity), self.max_rows))
+        if self._matrix is not None:
+            self._matrix.flush()
+            self._matrix = None
+        with open(self.matrix_path, 'ab') as f:
+            if f.tell() < capacity * self.row_bytes:
+                f.truncate(capacity * self.row_bytes)
+        self._matrix = np.memmap(self.matrix_path, dtype=self.dtype, mode='r+', shape=(capacity, self.dim))
+
+    def _ensure_mapped(self, slot: int) -> None:
+        """
+        Remap the matrix if `slot` lies past the mapped rows (grown by another process)
+        """
+        if slot >= self._matrix.shape[0]:
+            self._open_matrix(max(slot + 1, self._capacity_on_disk()))
+
+    def _get_meta(self, name: str, default: int = 0) -> int:
+        row = self._conn.execute("SELECT value FROM meta WHERE name = ?", (name,)).fetchone()
+        return int(row[0]) if row else default
+
+    def _allocate_slots(self, count: int, protect: set) -> List[int]:
+        """
+        Hand out `count` free rows: unused tail rows first (growing the file up to the
+        size cap), then rows reclaimed from least recently used entries. Must run inside
+        the caller's write transaction.
+        """
+        if count == 0:
+            return []
+        next_slot = self._get_meta('next_slot', 0)
+        fresh = min(count, self.max_rows - next_slot)
+        slots = list(range(next_slot, next_slot + fresh))
+        if fresh:
+            next_slot += fresh
+            self._conn.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('next_slot', ?)", (next_slot,))
+            if next_slot > self._matrix.shape[0]:
+                self._open_matrix(max(next_slot, self._matrix.shape[0] * 2, self._capacity_on_disk()))
+        needed = count - fresh
+        if needed:
+            victims = []
+            for key, slot in self._conn.execute("SELECT key, slot FROM entries ORDER BY last_used ASC"):
+                if key in protect:
+                    continue
+                victims.append((key, slot))
+                if len(victims) == needed:
+                    break
+            self._conn.executemany("DELETE FROM entries WHERE key = ?", [(key,) for key, _ in victims])
+            slots.extend(slot for _, slot in victims)
+        return slots
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Selectable sentence encoder engines behind VectorStore.encode.
+
+- torch: SentenceTransformer (PyTorch), the reference.
+- onnx / onnx-int8: the same model exported once to ONNX (optionally int8 dynamic
+  quantized) and run on onnxruntime's CPU provider with a `tokenizers` fast tokenizer.
+  At runtime this needs neither torch nor transformers, which is most of the startup cost.
+
+OnnxEncoder mirrors the SentenceTransformer surface the rest of the code uses
+(`encode`, `tokenizer(...)`, `max_seq_length`, `get_sentence_embedding_dimension`), and
+reproduces all-MiniLM-L6-v2's pipeline: mean pooling over the attention mask, then L2
+normalization.
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+MODEL_NAME = 'sentence-transformers/all-MiniLM-L6-v2'
+ENGINES = ('torch', 'onnx', 'onnx-int8')
+MODEL_DIMS = {MODEL_NAME: 384}  # known output sizes, so callers can size indexes without loading the model
+
+
+class _TokenizerAdapter:
+    """
+    Call-compatible subset of a transformers tokenizer over a `tokenizers.Tokenizer`
+    """
+
+    def __init__(self, tokenizer, max_length: int):
+        self._tokenizer = tokenizer
+        self._tokenizer.enable_truncation(max_length=max_length)
+        self.max_length = max_length
+
+    def __call__(self, texts: Sequence[str], add_special_tokens: bool = True, **_ignored) -> Dict[str, List[List[int]]]:
+        encodings = self._tokenizer.encode_batch(list(texts), add_special_tokens=add_special_tokens)
+        return {'input_ids': [e.ids for e in encodings]}
+
+    def encode_padded(self, texts: Sequence[str]) -> Dict[str, np.ndarray]:
+        encodings = self._tokenizer.encode_batch(list(texts), add_special_tokens=True)
+        width = max(len(e.ids) for e in encodings)
+        batch = {name: np.zeros((len(encodings), width), dtype=np.int64)
+                 for name in ('input_ids', 'attention_mask', 'token_type_ids')}
+        for row, e in enumerate(encodings):
+            batch['input_ids'][row, :len(e.ids)] = e.ids
+            batch['attention_mask'][row, :len(e.ids)] = e.attention_mask
+            batch['token_type_ids'][row, :len(e.ids)] = e.type_ids
+        return batch
+
+
+class OnnxEncoder:
+    def __init__(self, model_dir: str, quantized: bool = False, threads: Optional[int] = None):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        model_dir = Path(model_dir)
+        config = json.loads((model_dir / 'encoder.json').read_text())
+        self.max_seq_length = int(config['max_seq_length'])
+        self._dim = int(config['dim'])
+        self.normalize = bool(config.get('normalize', True))
+        self.tokenizer = _TokenizerAdapter(Tokenizer.from_file(str(model_dir / 'tokenizer.json')), self.max_seq_length)
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            options.intra_op_num_threads = int(threads)
+            options.inter_op_num_threads = 1
+        model_file = model_dir / ('model.int8.onnx' if quantized else 'model.onnx')
+        self.session = ort.InferenceSession(str(model_file), sess_options=options, providers=['CPUExecutionProvider'])
+        self._input_names = [i.name for i in self.session.get_inputs()]
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self._dim
+
+    def encode(self, texts: Sequence[str], batch_size: int = 32, show_progress_bar: bool = False,
+               convert_to_numpy: bool = True) -> np.ndarray:
+        out = np.zeros((len(texts), self._dim), dtype=np.float32)
+        for start in range(0, len(texts), batch_size):
+            batch = self.tokenizer.encode_padded(texts[start:start + batch_size])
+            hidden = self.session.run(None, {name: batch[name] for name in self._input_names})[0]
+            mask = batch['attention_mask'][:, :, None].astype(np.float32)
+            pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            if self.normalize:
+                pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+            out[start:start + len(pooled)] = pooled
+        return out
+
+
+def onnx_model_dir(encoder_dir: str, model_name: str) -> Path:
+    return Path(encoder_dir) / re.sub(r'[^A-Za-z0-9_.-]+', '_', model_name)
+
+
+def export_onnx(model_name: str, model_dir: str, quantize: bool = True) -> Path:
+    """
+    One-time export of a SentenceTransformer's transformer to ONNX (plus tokenizer and
+    pooling config). Needs torch/transformers; the exported model does not.
+    """
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    model_dir = Path(model_dir)
+    model_dir.mkdir(parents=True, exist_ok=True)
+    st_model = SentenceTransformer(model_name, device='cpu')
+    transformer = st_model[0].auto_model.eval()
+    tokenizer = st_model.tokenizer
+    tokenizer.save_pretrained(str(model_dir))
+
+    sample = tokenizer(['export sample'], return_tensors='pt')
+    input_names = [name for name in ('input_ids', 'attention_mask', 'token_type_ids') if name in sample]
+    dynamic_axes = {name: {0: 'batch', 1: 'sequence'} for name in input_names}
+    dynamic_axes['last_hidden_state'] = {0: 'batch', 1: 'sequence'}
+    with torch.no_grad():
+        torch.onnx.export(
+            transformer, tuple(sample[name] for name in input_names), str(model_dir / 'model.onnx'),
+            input_names=input_names, output_names=['last_hidden_state'], dynamic_axes=dynamic_axes,
+            opset_version=14, do_constant_folding=True,
+        )
+    (model_dir / 'encoder.json').write_text(json.dumps({
+        'model_name': model_name,
+        'max_seq_length': st_model.max_seq_length,
+        'dim': st_model.get_sentence_embedding_dimension(),
+        'normalize': any(type(module).__name__ == 'Normalize' for module in st_model),
+    }, indent=2))
+    if quantize:
+        quantize_onnx(str(model_dir))
+    return model_dir
+
+
+def quantize_onnx(model_dir: str) -> Path:
+    """
+    Dynamic int8 quantization of the exported weights (activations stay float)
+    """
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    model_dir = Path(model_dir)
+    quantize_dynamic(str(model_dir / 'model.onnx'), str(model_dir / 'model.int8.onnx'), weight_type=QuantType.QInt8)
+    return model_dir / 'model.int8.onnx'
+
+
+def load_encoder(model_name: str, engine: str = 'torch', encoder_dir: Optional[str] = None,
+                 threads: Optional[int] = None) -> Any:
+    """
+    Return a SentenceTransformer-compatible encoder for `engine`, exporting the ONNX
+    model into `encoder_dir` on first use
+    """
+    if engine == 'torch':
+        from sentence_transformers import SentenceTransformer
+        return SentenceTransformer(model_name)
+    if engine not in ENGINES:
+        raise ValueError(f"unknown encoder engine: {engine} (choose from {', '.join(ENGINES)})")
+    if not encoder_dir:
+        raise ValueError("encoder_dir is required for ONNX engines")
+    model_dir = onnx_model_dir(encoder_dir, model_name)
+    quantized = engine == 'onnx-int8'
+    if not (model_dir / 'model.onnx').exists():
+        print(f"📦 Exporting {model_name} to ONNX in {model_dir} (one-time)")
+        export_onnx(model_name, str(model_dir), quantize=False)
+    if quantized and not (model_dir / 'model.int8.onnx').exists():
+        print(f"📦 Quantizing {model_dir / 'model.onnx'} to int8 (one-time)")
+        quantize_onnx(str(model_dir))
+    return OnnxEncoder(str(model_dir), quantized=quantized, threads=threads)
+
+
+def load_tokenizer(model_name: str, engine: str = 'torch', encoder_dir: Optional[str] = None) -> Any:
+    """
+    Just the encoder's tokenizer (for measuring chunk sizes) without loading model weights:
+    the exported tokenizer.json for ONNX engines, else the Hugging Face tokenizer
+    """
+    if engine != 'torch' and encoder_dir:
+        tokenizer_file = onnx_model_dir(encoder_dir, model_name) / 'tokenizer.json'
+        if tokenizer_file.exists():
+            from tokenizers import Tokenizer
+            config = json.loads((tokenizer_file.parent / 'encoder.json').read_text())
+            return _TokenizerAdapter(Tokenizer.from_file(str(tokenizer_file)), int(config['max_seq_length']))
+    from transformers import AutoTokenizer
+    return AutoTokenizer.from_pretrained(model_name)
+
+
+def encoder_dimension(model_name: str, engine: str = 'torch', encoder_dir: Optional[str] = None) -> Optional[int]:
+    """
+    Embedding size without loading the model (exported ONNX config, else MODEL_DIMS); None if unknown
+    """
+    if engine != 'torch' and encoder_dir:
+        config = onnx_model_dir(encoder_dir, model_name) / 'encoder.json'
+        if config.exists():
+            return int(json.loads(config.read_text())['dim'])
+    return MODEL_DIMS.get(model_name)
+
+
+def cache_model_key(model_name: str, engine: str) -> str:
+    """
+    Embedding-cache namespace: engines produce slightly different vectors, so they must not share entries
+    """
+    return model_name if engine == 'torch' else f"{model_name}@{engine}"
@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+Search filters pushed down into the indexes: Chroma `where` clauses over the metadata
+written at ingest, or a SQLite-resolved candidate set for very selective filters.
+Standard library only, so the CLI can build filters without loading Chroma.
+"""
+
+from typing import List, Dict, Any, Optional
+
+
+def build_where(source: Optional[str] = None, topic: Optional[str] = None, since_ts: Optional[int] = None,
+                urls: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+    """
+    Chroma `where` clause over the metadata written at ingest (source, topic, published_ts),
+    optionally restricted to a prefiltered candidate set of parent urls.
+    """
+    conditions: List[Dict[str, Any]] = []
+    if urls is not None:
+        # Candidate ids already satisfy the filters (resolved in SQLite)
+        conditions.append({'url': {'$in': urls}})
+    else:
+        if source:
+            conditions.append({'source': {'$eq': source}})
+        if topic:
+            conditions.append({'topic': {'$eq': topic}})
+        if since_ts is not None:
+            conditions.append({'published_ts': {'$gte': int(since_ts)}})
+    if not conditions:
+        return None
+    return conditions[0] if len(conditions) == 1 else {'$and': conditions}
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Hybrid retrieval: fuse BM25 (SQLite FTS5) and dense (Chroma) rankings with
+reciprocal rank fusion (RRF): score(d) = sum over rankings of 1 / (k + rank(d)).
+"""
+
+from typing import List, Dict, Any
+
+RRF_K = 60
+
+
+def reciprocal_rank_fusion(rankings: List[List[Dict[str, Any]]], k: int = RRF_K, limit: int = 5) -> List[Dict[str, Any]]:
+    """
+    Fuse ranked hit lists (each hit has at least 'url') into one list ordered by RRF score.
+    The first occurrence of a url provides its title/source; per-ranking ranks are kept.
+    """
+    fused: Dict[str, Dict[str, Any]] = {}
+    for ranking_index, ranking in enumerate(rankings):
+        for rank, hit in enumerate(ranking, 1):
+            url = hit.get('url', '')
+            entry = fused.setdefault(url, {
+                'url': url,
+                'title': hit.get('title', ''),
+                'source': hit.get('source', ''),
+                'heading': hit.get('heading', ''),
+                'rrf': 0.0,
+                'ranks': [None] * len(rankings),
+            })
+            if entry['ranks'][ranking_index] is None:
+                entry['ranks'][ranking_index] = rank
+                entry['rrf'] += 1.0 / (k + rank)
+    return sorted(fused.values(), key=lambda hit: hit['rrf'], reverse=True)[:limit]
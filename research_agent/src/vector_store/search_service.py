@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Warm search daemon: keeps a VectorStore (Chroma client + embedding model) loaded in a
+long-lived localhost HTTP process so `cli.py search` skips the multi-second startup.
+
+Concurrent requests are micro-batched: queries arriving within a few milliseconds of
+each other are embedded with a single encode call. The index is reopened every
+`refresh_seconds` and after a failed query, so ingests and `--reindex` runs in other
+processes become visible without restarting the daemon.
+
+Protocol (JSON over HTTP on 127.0.0.1):
+  GET  /health                          -> {"ok": true}
+  POST /search {"queries": [...], "k": 5, "where": {...}} -> {"results": [[hit, ...], ...]}
+
+This module only imports the standard library at import time, so the client side
+(`query_daemon`) stays cheap for the CLI.
+"""
+
+import json
+import queue
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+
+class _PendingSearch:
+    def __init__(self, queries: List[str], k: int, where: Optional[Dict[str, Any]] = None):
+        self.queries = queries
+        self.k = k
+        self.where = where
+        self.done = threading.Event()
+        self.results: Optional[List[List[Dict[str, Any]]]] = None
+        self.error: Optional[str] = None
+
+
+class SearchDaemon:
+    def __init__(self, vector_store, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                 max_batch: int = 64, max_wait_ms: float = 5.0, refresh_seconds: float = 60.0):
+        self.vector_store = vector_store
+        self.refresh_seconds = max(0.0, float(refresh_seconds))
+        self._opened_at = time.monotonic()
+        self.host = host
+        self.port = port
+        self.max_batch = max(1, int(max_batch))
+        self.max_wait = max(0.0, max_wait_ms / 1000.0)
+        self._queue: "queue.Queue[_PendingSearch]" = queue.Queue()
+        self._stop = threading.Event()
+        self.batches = 0
+        self.queries_served = 0
+
+    def submit(self, queries: List[str], k: int, where: Optional[Dict[str, Any]] = None) -> List[List[Dict[str, Any]]]:
+        pending = _PendingSearch(queries, k, where)
+        self._queue.put(pending)
+        pending.done.wait()
+        if pending.error:
+            raise RuntimeError(pending.error)
+        return pending.results or []
+
+    def _batch_loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                first = self._queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            batch = [first]
+            size = len(first.queries)
+            deadline = time.monotonic() + self.max_wait
+            while size < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                batch.append(item)
+                size += len(item.queries)
+            # Requests with different filters can't share a collection query
+            groups: Dict[str, List[_PendingSearch]] = {}
+            for item in batch:
+                groups.setdefault(json.dumps(item.where, sort_keys=True), []).append(item)
+            if self.refresh_seconds and time.monotonic() - self._opened_at >= self.refresh_seconds:
+                self._reopen()
+            for group in groups.values():
+                self._run_batch(group)
+
+    def _reopen(self) -> bool:
+        try:
+            self.vector_store.reopen()
+        except Exception as e:
+            print(f"⚠️ Search daemon could not reopen the vector index: {e}")
+            return False
+        finally:
+            self._opened_at = time.monotonic()
+        return True
+
+    def _run_batch(self, batch: List[_PendingSearch]) -> None:
+        all_queries = [q for item in batch for q in item.queries]
+        k = max(item.k for item in batch)
+        try:
+            # One encode + one collection query for every waiting request
+            try:
+                results = self.vector_store.search(all_queries, k=k, where=batch[0].where)
+            except Exception:
+                # Most likely a stale handle (collection dropped by a reindex): reopen and retry once
+                if not self._reopen():
+                    raise
+                results = self.vector_store.search(all_queries, k=k, where=batch[0].where)
+            offset = 0
+            for item in batch:
+                item.results = [hits[:item.k] for hits in results[offset:offset + len(item.queries)]]
+                offset += len(item.queries)
+        except Exception as e:
+            for item in batch:
+                item.error = str(e)
+        finally:
+            self.batches += 1
+            self.queries_served += len(all_queries)
+            for item in batch:
+                item.done.set()
+
+    def serve_forever(self) -> None:
+        daemon = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _reply(self, status: int, payload: Dict[str, Any]) -> None:
+                body = json.dumps(payload).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                if self.path == '/health':
+                    self._reply(200, {'ok': True, 'batches': daemon.batches, 'queries': daemon.queries_served})
+                else:
+                    self._reply(404, {'error': 'not found'})
+
+            def do_POST(self):
+                if self.path != '/search':
+                    self._reply(404, {'error': 'not found'})
+                    return
+                try:
+                    length = int(self.headers.get('Content-Length', 0))
+                    request = json.loads(self.rfile.read(length) or b'{}')
+                    queries = [str(q) for q in request.get('queries', [])]
+                    k = int(request.get('k', 5))
+                    where = request.get('where') or None
+                except (ValueError, TypeError) as e:
+                    self._reply(400, {'error': f'bad request: {e}'})
+                    return
+                try:
+                    self._reply(200, {'results': daemon.submit(queries, k, where) if queries else []})
+                except Exception as e:
+                    self._reply(500, {'error': str(e)})
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((self.host, self.port), Handler)
+        server.daemon_threads = True
+        worker = threading.Thread(target=self._batch_loop, name='search-batcher', daemon=True)
+        worker.start()
+        print(f"🟢 Search daemon listening on http://{self.host}:{self.port} "
+              f"(micro-batch ≤{self.max_batch} queries / {self.max_wait * 1000:.0f} ms)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print("\n🛑 Search daemon stopping")
+        finally:
+            self._stop.set()
+            server.server_close()
+
+
+def query_daemon(queries: List[str], k: int = 5, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                 timeout: float = 30.0, where: Optional[Dict[str, Any]] = None) -> Optional[List[List[Dict[str, Any]]]]:
+    """
+    Ask a running daemon; returns None if none is reachable (connection refused on
+    localhost fails immediately) or it answers with an error, so callers can fall back
+    to in-process search.
+    """
+    payload = json.dumps({'queries': queries, 'k': k, 'where': where}).encode('utf-8')
+    request = urllib.request.Request(f"http://{host}:{port}/search", data=payload,
+                                     headers={'Content-Type': 'application/json'})
+    # Never route localhost traffic through an HTTP(S)_PROXY from the environment
+    opener = urllib.request.build_opener(urllib.request.ProxyHandler({}))
+    try:
+        with opener.open(request, timeout=timeout) as resp:
+            return json.loads(resp.read())['results']
+    except urllib.error.HTTPError as e:
+        print(f"⚠️ Search daemon error ({e.code}): {e.read().decode('utf-8', 'replace')}; searching in-process")
+        return None
+    except (urllib.error.URLError, OSError, ValueError, KeyError):
+        return None
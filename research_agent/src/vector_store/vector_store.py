@@ -1,31 +1,189 @@
 #!/usr/bin/env python3
 """
-Chroma vector store wrapper with SentenceTransformers embeddings
+Vector store wrapper: a sentence encoder (SentenceTransformers, or ONNX Runtime via
+encoders.py) over a pluggable index backend (Chroma by default, or the exact NumPy scan
+in backends.py)
 """
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Tuple, Optional
 from pathlib import Path
 
-import chromadb
-from sentence_transformers import SentenceTransformer
+import numpy as np
+
+from .backends import make_backend
+from .batching import EncodeStats, encode_length_bucketed
+from .embedding_cache import EmbeddingCache
+from .encoders import MODEL_NAME, cache_model_key, encoder_dimension, load_encoder, load_tokenizer
 
 
 class VectorStore:
-    def __init__(self, persist_directory: str):
+    def __init__(self, persist_directory: str, embedding_cache_dir: Optional[str] = None,
+                 embedding_cache_mb: int = 512, backend: str = 'chroma', numpy_dtype: str = 'float16',
+                 token_budget: int = 8192, max_encode_batch: int = 256, engine: str = 'torch',
+                 encoder_dir: Optional[str] = None):
         self.persist_directory = persist_directory
+        self.token_budget = token_budget
+        self.max_encode_batch = max_encode_batch
+        self.encode_stats = EncodeStats()
         Path(persist_directory).mkdir(parents=True, exist_ok=True)
-        # Use new PersistentClient for on-disk storage (Chroma >= 1.0)
-        self.client = chromadb.PersistentClient(path=persist_directory)
-        self.collection = self.client.get_or_create_collection(name="research_articles", metadata={"hnsw:space": "cosine"})
-        self.model = SentenceTransformer('sentence-transformers/all-MiniLM-L6-v2')
+        self.engine = engine
+        self.encoder_dir = encoder_dir or str(Path(persist_directory) / 'onnx')
+        # The encoder loads on first in-process encode: with an EmbeddingPool the workers
+        # hold the models and this process never needs one
+        self._model = None
+        self._tokenizer = None
+        self._dim = encoder_dimension(MODEL_NAME, engine=engine, encoder_dir=self.encoder_dir)
+        self.backend_name = backend
+        self.numpy_dtype = numpy_dtype
+        self.backend = make_backend(backend, persist_directory, dim=self.embedding_dim(), numpy_dtype=numpy_dtype)
+        self.embedding_cache = None
+        if embedding_cache_dir:
+            self.embedding_cache = EmbeddingCache(embedding_cache_dir, model_name=cache_model_key(MODEL_NAME, engine),
+                                                  dim=self.embedding_dim(),
+                                                  max_bytes=embedding_cache_mb * 1024 * 1024)
+
+    @property
+    def model(self):
+        if self._model is None:
+            self._model = load_encoder(MODEL_NAME, engine=self.engine, encoder_dir=self.encoder_dir)
+        return self._model
+
+    @property
+    def tokenizer(self):
+        """
+        The encoder's tokenizer; reuses a loaded model's, otherwise loads only the tokenizer
+        """
+        if self._model is not None:
+            return self._model.tokenizer
+        if self._tokenizer is None:
+            self._tokenizer = load_tokenizer(MODEL_NAME, engine=self.engine, encoder_dir=self.encoder_dir)
+        return self._tokenizer
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed texts as a float32 matrix, serving repeats from the embedding cache when enabled
+        """
+        if self.embedding_cache is None:
+            return self._model_encode(texts)
+        cached = self.embedding_cache.get_many(texts)
+        missing = [i for i, vector in enumerate(cached) if vector is None]
+        if missing:
+            fresh = self._model_encode([texts[i] for i in missing])
+            self.embedding_cache.put_many([texts[i] for i in missing], fresh)
+            for i, vector in zip(missing, fresh):
+                cached[i] = vector
+        return np.vstack(cached).astype(np.float32, copy=False) if cached else np.zeros((0, self.embedding_dim()), dtype=np.float32)
+
+    def _model_encode(self, texts: List[str]) -> np.ndarray:
+        return encode_length_bucketed(self.model, texts, token_budget=self.token_budget,
+                                      max_batch=self.max_encode_batch, stats=self.encode_stats)
+
+    def embedding_dim(self) -> int:
+        if self._dim is None:
+            self._dim = self.model.get_sentence_embedding_dimension()
+        return self._dim
 
     def add_documents(self, ids: List[str], documents: List[str], metadatas: List[Dict[str, Any]]):
-        embeddings = self.model.encode(documents, show_progress_bar=False, convert_to_numpy=True).tolist()
-        self.collection.add(ids=ids, documents=documents, metadatas=metadatas, embeddings=embeddings)
+        self.upsert_documents(ids=ids, documents=documents, metadatas=metadatas)
+
+    def upsert_documents(self, ids: List[str], documents: List[str], metadatas: List[Dict[str, Any]]):
+        # Upsert overwrites existing ids so changed documents get new vectors
+        self.backend.upsert(ids=ids, embeddings=self.encode(documents), metadatas=metadatas, documents=documents)
+
+    def index_documents(self, items: Iterable[Tuple[str, str, Dict[str, Any]]], batch_size: int = 64,
+                        embed_pool=None) -> int:
+        """
+        Encode and upsert a stream of (id, document, metadata) in fixed-size batches,
+        so only one batch of text is held in memory at a time. Returns the count indexed.
+
+        With an EmbeddingPool, cache misses are encoded across worker processes while
+        earlier batches are upserted; batches still land in input order.
+        """
+        if embed_pool is not None:
+            return self._index_documents_pooled(items, batch_size, embed_pool)
+        indexed = 0
+        for ids, documents, metadatas in _iter_batches(items, batch_size):
+            self.upsert_documents(ids=ids, documents=documents, metadatas=metadatas)
+            indexed += len(ids)
+        return indexed
+
+    def _index_documents_pooled(self, items, batch_size: int, embed_pool) -> int:
+        def pending():
+            for ids, documents, metadatas in _iter_batches(items, batch_size):
+                cached = self.embedding_cache.get_many(documents) if self.embedding_cache else [None] * len(documents)
+                missing = [i for i, vector in enumerate(cached) if vector is None]
+                yield (ids, documents, metadatas, cached, missing), [documents[i] for i in missing]
+
+        indexed = 0
+        for (ids, documents, metadatas, cached, missing), fresh in embed_pool.map_ordered(pending()):
+            if missing and self.embedding_cache is not None:
+                self.embedding_cache.put_many([documents[i] for i in missing], fresh)
+            for i, vector in zip(missing, fresh):
+                cached[i] = vector
+            self.backend.upsert(ids=ids, embeddings=np.vstack(cached).astype(np.float32, copy=False),
+                                metadatas=metadatas, documents=documents)
+            indexed += len(ids)
+        return indexed
+
+    def delete_parents(self, urls: List[str], batch_size: int = 500):
+        """Remove every vector (chunks and legacy whole-document entries) of the given articles."""
+        for start in range(0, len(urls), batch_size):
+            self.backend.delete_urls(urls[start:start + batch_size])
+
+    def reset(self):
+        """Drop and recreate the index (full rebuild)."""
+        self.backend.reset()
+
+    def reopen(self):
+        """Reopen the index from disk (picks up writes and rebuilds made by other processes)."""
+        self.backend = make_backend(self.backend_name, self.persist_directory, dim=self.embedding_dim(),
+                                    numpy_dtype=self.numpy_dtype)
+
+    def query(self, query_texts: List[str], n_results: int = 5, where: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        return self.backend.query(self.encode(query_texts), n_results=n_results, where=where)
+
+    def search(self, query_texts: List[str], k: int = 5, oversample: int = 4,
+               where: Optional[Dict[str, Any]] = None) -> List[List[Dict[str, Any]]]:
+        """
+        Query and collapse chunk hits back to unique articles (best chunk per article).
+        `where` is a Chroma metadata filter (see filters.build_where), applied inside the index.
+
+        Returns one ranked list of up to k hits per query:
+        {url, title, source, distance, chunk_index, heading}.
+        """
+        raw = self.query(query_texts=query_texts, n_results=max(k, k * oversample), where=where)
+        return [collapse_chunk_hits(metas, distances, k)
+                for metas, distances in zip(raw['metadatas'], raw['distances'])]
 
-    def query(self, query_texts: List[str], n_results: int = 5) -> Dict[str, Any]:
-        query_embeddings = self.model.encode(query_texts, show_progress_bar=False, convert_to_numpy=True).tolist()
-        return self.collection.query(query_embeddings=query_embeddings, n_results=n_results)
 
+def _iter_batches(items: Iterable[Tuple[str, str, Dict[str, Any]]], batch_size: int):
+    ids: List[str] = []
+    documents: List[str] = []
+    metadatas: List[Dict[str, Any]] = []
+    for item_id, document, metadata in items:
+        ids.append(item_id)
+        documents.append(document)
+        metadatas.append(metadata)
+        if len(ids) >= batch_size:
+            yield ids, documents, metadatas
+            ids, documents, metadatas = [], [], []
+    if ids:
+        yield ids, documents, metadatas
 
 
+def collapse_chunk_hits(metadatas: List[Dict[str, Any]], distances: List[float], k: int) -> List[Dict[str, Any]]:
+    best: Dict[str, Dict[str, Any]] = {}
+    for meta, distance in zip(metadatas, distances):
+        meta = meta or {}
+        url = meta.get('url', '')
+        if url in best and best[url]['distance'] <= distance:
+            continue
+        best[url] = {
+            'url': url,
+            'title': meta.get('title', ''),
+            'source': meta.get('source', ''),
+            'distance': float(distance),
+            'chunk_index': meta.get('chunk_index', 0),
+            'heading': meta.get('heading', ''),
+        }
+    return sorted(best.values(), key=lambda hit: hit['distance'])[:k]
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Shared fixtures. Tests import the app the way cli.py does (`from src... import`), so the
+research_agent directory goes on sys.path.
+"""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from src.storage.db import DatabaseManager
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "research.db")
+
+
+@pytest.fixture
+def db(db_path):
+    manager = DatabaseManager(db_path)
+    yield manager
+    manager.close()
+
+
+LEGACY_SCHEMA = """
+CREATE TABLE articles (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    url TEXT UNIQUE, title TEXT, source TEXT, author TEXT, created_at TEXT, published_date TEXT,
+    points INTEGER, comments_count INTEGER, description TEXT, abstract TEXT, category TEXT,
+    arxiv_id TEXT, hn_url TEXT, topic TEXT, inserted_at TEXT, updated_at TEXT
+);
+CREATE TABLE crawled_content (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    article_id INTEGER, url TEXT, markdown_content TEXT, word_count INTEGER, crawled_at TEXT, updated_at TEXT,
+    UNIQUE(article_id),
+    FOREIGN KEY(article_id) REFERENCES articles(id) ON DELETE CASCADE
+);
+CREATE INDEX idx_articles_topic ON articles(topic);
+CREATE INDEX idx_articles_source ON articles(source);
+CREATE INDEX idx_articles_published ON articles(published_date);
+"""
+
+
+@pytest.fixture
+def legacy_db(db_path):
+    """
+    Factory for a DB in the original schema (inline markdown, no published_ts, no rollup):
+    legacy_db(articles=[{column: value}], crawled=[{column: value}]) -> db_path
+    """
+    def create(articles=(), crawled=()):
+        conn = sqlite3.connect(db_path)
+        with conn:
+            conn.executescript(LEGACY_SCHEMA)
+            for table, rows in (('articles', articles), ('crawled_content', crawled)):
+                for row in rows:
+                    columns = ', '.join(row)
+                    placeholders = ', '.join('?' * len(row))
+                    conn.execute(f"INSERT INTO {table} ({columns}) VALUES ({placeholders})", list(row.values()))
+        conn.close()
+        return db_path
+
+    return create
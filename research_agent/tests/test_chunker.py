@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Chunk sizes stay within the encoder's word-piece limit, prefix and special tokens included.
+"""
+
+import math
+
+from src.processors.chunker import SPECIAL_TOKENS, approx_token_counts, count_text_tokens, iter_markdown_chunks
+from src.processors.preprocess import iter_document_chunks
+from src.vector_store.batching import word_token_counter
+
+
+def strict_counts(words):
+    # Harsher than the heuristic: one piece per 3 characters of every word
+    return [max(1, math.ceil(len(word) / 3)) for word in words]
+
+
+def long_markdown(sections=6, words_per_section=400):
+    parts = []
+    for s in range(sections):
+        parts.append(f"## Section {s}: internationalization considerations")
+        parts.append(' '.join(f"token{s}_{i}-value" for i in range(words_per_section)))
+    return '\n\n'.join(parts)
+
+
+def test_every_document_chunk_fits_the_model_limit():
+    title = "A fairly long article title about retrieval-augmented generation pipelines"
+    summary = "Summary words " * 300  # over the budget on its own
+    chunks = list(iter_document_chunks(title, summary, long_markdown(), max_tokens=128, overlap_tokens=16,
+                                       count_tokens=strict_counts))
+    assert len(chunks) > 10
+    assert [chunk['index'] for chunk in chunks] == list(range(len(chunks)))
+    for chunk in chunks:
+        assert count_text_tokens(chunk['text'], strict_counts) + SPECIAL_TOKENS <= 128, chunk['text'][:80]
+        assert chunk['text'].startswith(f"Title: {title}")
+
+
+def test_long_summary_is_split_across_leading_chunks():
+    chunks = list(iter_document_chunks("T", "word " * 500, None, max_tokens=64, overlap_tokens=8,
+                                       count_tokens=strict_counts))
+    assert len(chunks) > 1
+    assert all(chunk['text'].startswith("Title: T\n\nSummary: ") for chunk in chunks)
+
+
+def test_content_chunks_reserve_room_for_their_prefix():
+    heading = "A very long section heading " * 5
+    markdown = f"# {heading}\n\n" + ' '.join(f"w{i}" for i in range(2000))
+    for chunk in iter_document_chunks("Title words here", None, markdown, max_tokens=100, overlap_tokens=10,
+                                      count_tokens=strict_counts):
+        assert count_text_tokens(chunk['text'], strict_counts) + SPECIAL_TOKENS <= 100
+
+
+def test_windows_overlap_and_cover_every_word():
+    words = [f"w{i}" for i in range(500)]
+    chunks = list(iter_markdown_chunks(' '.join(words), max_tokens=50, overlap_tokens=10, count_tokens=strict_counts))
+    seen = []
+    for previous, current in zip(chunks, chunks[1:]):
+        prev_words, cur_words = previous['text'].split(), current['text'].split()
+        assert prev_words[-1] in cur_words  # consecutive windows share their boundary
+        assert cur_words[0] != prev_words[0]  # and always move forward
+    for chunk in chunks:
+        assert count_text_tokens(chunk['text'], strict_counts) <= 50
+        seen.extend(chunk['text'].split())
+    assert set(seen) == set(words)
+
+
+def test_small_sections_are_packed_together():
+    markdown = "# A\n\none two\n\n# B\n\nthree four\n\n# C\n\nfive six"
+    chunks = list(iter_markdown_chunks(markdown, max_tokens=100, count_tokens=strict_counts))
+    assert len(chunks) == 1
+    assert chunks[0]['heading'] == 'A'
+    assert chunks[0]['text'] == "one two three four five six"
+
+
+def test_approx_token_counts_splits_punctuation_and_digit_runs():
+    # letters: 1 piece per 4 chars; digits: 1 per 2; each punctuation mark: 1
+    assert approx_token_counts(["hello", "a,b", "2024-01-01", "!!!"]) == [2, 3, 6, 3]
+    assert count_text_tokens("") == 0
+
+
+def test_word_token_counter_counts_word_pieces_and_memoizes():
+    calls = []
+
+    def tokenizer(words, add_special_tokens, return_attention_mask, return_token_type_ids):
+        assert add_special_tokens is False
+        calls.append(list(words))
+        return {'input_ids': [[0] * len(word) for word in words]}
+
+    count = word_token_counter(tokenizer)
+    assert count(["ab", "abc", "ab"]) == [2, 3, 2]
+    assert count(["abc", "abcd"]) == [3, 4]
+    assert calls == [["ab", "abc"], ["abcd"]]
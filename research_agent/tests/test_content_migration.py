@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Crawled markdown stored inline by older versions moves into compressed content_blobs on open.
+"""
+
+from src.storage.content_store import content_hash, decompress_text
+from src.storage.db import DatabaseManager
+
+BODY = "# Heading\n\n" + "Some crawled markdown text. " * 200
+OTHER = "# Other\n\nA different body."
+
+
+def legacy_rows():
+    articles = [{'url': f"https://example.com/{i}", 'title': f"a{i}", 'source': 'wired',
+                 'published_date': '2024-01-01T00:00:00', 'topic': 'AI', 'updated_at': '2024-01-01T00:00:00'}
+                for i in range(1, 5)]
+    crawled = [{'article_id': i, 'url': f"https://example.com/{i}", 'markdown_content': body, 'word_count': 3,
+                'crawled_at': '2024-01-02T00:00:00', 'updated_at': '2024-01-02T00:00:00'}
+               for i, body in ((1, BODY), (2, BODY), (3, OTHER))]
+    return articles, crawled
+
+
+def test_inline_content_moves_to_deduplicated_blobs(legacy_db):
+    articles, crawled = legacy_rows()
+    db = DatabaseManager(legacy_db(articles, crawled))
+    try:
+        with db._connect() as conn:
+            rows = {row['article_id']: row for row in conn.execute("SELECT * FROM crawled_content")}
+            blobs = {row['hash']: row for row in conn.execute("SELECT * FROM content_blobs")}
+        assert all(row['markdown_content'] is None for row in rows.values())
+        assert rows[1]['content_hash'] == rows[2]['content_hash'] == content_hash(BODY)
+        assert set(blobs) == {content_hash(BODY), content_hash(OTHER)}  # identical bodies stored once
+        body_blob = blobs[content_hash(BODY)]
+        assert decompress_text(body_blob['codec'], body_blob['data']) == BODY
+        assert body_blob['stored_size'] < body_blob['raw_size']
+        # Migration is not a content change: nothing becomes pending for re-embedding because of it
+        assert {row['updated_at'] for row in rows.values()} == {'2024-01-02T00:00:00'}
+
+        markdown = {row['url']: row['markdown_content'] for batch in db.iter_articles_for_embedding() for row in batch}
+        assert markdown == {'https://example.com/1': BODY, 'https://example.com/2': BODY,
+                            'https://example.com/3': OTHER, 'https://example.com/4': ''}
+        stats = db.content_storage_stats()
+        assert (stats['crawled_rows'], stats['blobs'], stats['inline_bytes']) == (3, 2, 0)
+    finally:
+        db.close()
+
+
+def test_rewriting_content_drops_orphan_blobs(legacy_db):
+    articles, crawled = legacy_rows()
+    db = DatabaseManager(legacy_db(articles, crawled))
+    try:
+        db.upsert_crawled_content(3, 'https://example.com/3', "# Replaced", 1, None)
+        with db._connect() as conn:
+            hashes = {row[0] for row in conn.execute("SELECT hash FROM content_blobs")}
+        assert hashes == {content_hash(BODY), content_hash("# Replaced")}
+    finally:
+        db.close()
+
+
+def test_migration_is_idempotent(legacy_db):
+    articles, crawled = legacy_rows()
+    path = legacy_db(articles, crawled)
+    DatabaseManager(path).close()
+    db = DatabaseManager(path)
+    try:
+        assert db.content_storage_stats()['blobs'] == 2
+        markdown = {row['url']: row['markdown_content'] for batch in db.iter_articles_for_embedding() for row in batch}
+        assert markdown['https://example.com/1'] == BODY
+    finally:
+        db.close()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+The incrementally maintained daily_signals rollup always equals a full rebuild.
+"""
+
+import time
+
+from src.storage.db import DatabaseManager
+
+DAY = 86400
+
+
+def rollup(db):
+    with db._connect() as conn:
+        return sorted(tuple(row) for row in conn.execute(
+            "SELECT topic, source, day, articles, points, comments, crawled FROM daily_signals"
+        ))
+
+
+def assert_matches_rebuild(db):
+    incremental = rollup(db)
+    db.rebuild_daily_signals()
+    assert incremental == rollup(db)
+    return incremental
+
+
+def article(n, ts, source='hackernews', points=1, comments=0, **extra):
+    return dict({'url': f"https://example.com/{n}", 'title': f"story {n}", 'source': source,
+                 'published_ts': ts, 'points': points, 'comments_count': comments}, **extra)
+
+
+def test_upserts_and_crawls_match_a_rebuild(db):
+    now = int(time.time())
+    db.bulk_upsert_articles([article(i, now - (i % 5) * DAY, points=i, comments=2 * i) for i in range(20)], topic='AI')
+    db.bulk_upsert_articles([article(100 + i, now - i * DAY, source='wired') for i in range(3)], topic='Robots')
+    db.bulk_upsert_articles([{'url': 'https://example.com/undated', 'title': 'no date', 'source': 'wired'}], topic='AI')
+    rows = assert_matches_rebuild(db)
+    assert any(row[2] == -1 for row in rows)  # undated articles land in the -1 bucket
+
+    # Points/comments updates, a topic change and a move to another day
+    db.bulk_upsert_articles([article(1, now - 1 * DAY, points=500, comments=40)], topic='AI')
+    db.bulk_upsert_articles([article(2, now - 2 * DAY, points=2)], topic='Robots')
+    db.bulk_upsert_articles([article(3, now - 9 * DAY, points=3)], topic='AI')
+    # Nulls keep the stored values (no points/comments/topic in this upsert)
+    db.bulk_upsert_articles([{'url': 'https://example.com/4', 'title': 'renamed'}])
+    assert_matches_rebuild(db)
+
+    ids = db.bulk_upsert_articles([article(i, now - (i % 5) * DAY, points=i, comments=2 * i) for i in range(5)], topic='AI')
+    items = [{'article_id': article_id, 'url': url, 'markdown': f"# body {article_id}", 'word_count': 2,
+              'crawled_at': None} for url, article_id in ids.items()]
+    db.bulk_upsert_crawled_content(items)
+    db.bulk_upsert_crawled_content(items[:2])  # recrawl: still one crawled row per article
+    rows = assert_matches_rebuild(db)
+    assert sum(row[6] for row in rows) == 5
+
+
+def test_aggregates_read_the_rollup(db):
+    now = int(time.time())
+    db.bulk_upsert_articles([article(i, now - i * DAY, points=10, comments=1) for i in range(10)], topic='AI')
+    db.bulk_upsert_articles([article(50, now, source='wired', points=0)], topic='Robots')
+    totals = db.aggregate_signals(topic='AI')
+    assert (totals['articles'], totals['hn_points'], totals['hn_comments']) == (10, 100, 10)
+    assert db.aggregate_signals(topic='AI', days=3)['articles'] == 4  # whole UTC days: today and the 3 before
+    by_topic = db.aggregate_signals_by_topic(['AI', 'Robots', 'Missing'])
+    assert by_topic['Robots']['articles'] == 1
+    assert by_topic['Missing'] == {'articles': 0, 'hn_points': 0, 'hn_comments': 0, 'crawled_count': 0}
+
+
+def test_missing_rollup_is_rebuilt_on_open(db_path):
+    db = DatabaseManager(db_path)
+    db.bulk_upsert_articles([article(i, int(time.time()), points=i) for i in range(4)], topic='AI')
+    expected = rollup(db)
+    db._write(lambda cur: cur.execute("DROP TABLE daily_signals"))
+    db.close()
+
+    reopened = DatabaseManager(db_path)
+    try:
+        assert rollup(reopened) == expected
+    finally:
+        reopened.close()
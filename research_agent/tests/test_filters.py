@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Search filters pushed down into SQLite (candidate urls, FTS5 query) and the vector index
+(`where` clauses, evaluated here by the NumPy backend).
+"""
+
+import numpy as np
+import pytest
+
+from src.vector_store.backends import NumpyBackend
+from src.vector_store.filters import build_where
+
+
+def test_build_where_shapes():
+    assert build_where() is None
+    assert build_where(source='wired') == {'source': {'$eq': 'wired'}}
+    assert build_where(source='wired', topic='AI', since_ts=5) == {'$and': [
+        {'source': {'$eq': 'wired'}}, {'topic': {'$eq': 'AI'}}, {'published_ts': {'$gte': 5}},
+    ]}
+    # A prefiltered candidate set replaces the field conditions it was resolved from
+    assert build_where(source='wired', urls=['u1']) == {'url': {'$in': ['u1']}}
+    assert build_where(urls=[]) == {'url': {'$in': []}}
+
+
+@pytest.fixture
+def articles(db):
+    db.bulk_upsert_articles([
+        {'url': f"https://x/{i}", 'title': f"vector search note {i}", 'source': 'wired' if i % 2 else 'hackernews',
+         'published_ts': 1000 + i}
+        for i in range(10)
+    ], topic='AI')
+    db.bulk_upsert_articles([{'url': 'https://y/1', 'title': 'vector search elsewhere', 'source': 'wired',
+                              'published_ts': 5000}], topic='Robots')
+    return db
+
+
+def test_filter_article_urls_resolves_selective_filters(articles):
+    assert sorted(articles.filter_article_urls(source='wired', topic='AI', since_ts=1005)) == \
+        ['https://x/5', 'https://x/7', 'https://x/9']
+    assert articles.filter_article_urls(topic='Missing') == []
+    # Not selective enough for a candidate list: the caller falls back to a `where` clause
+    assert articles.filter_article_urls(topic='AI', limit=5) is None
+
+
+def test_keyword_search_applies_filters_in_the_same_query(articles):
+    if not articles.fts_enabled:
+        pytest.skip("SQLite build without FTS5")
+    results = articles.keyword_search('vector search', limit=20, source='wired', since_ts=1005)
+    assert sorted(hit['url'] for hit in results) == ['https://x/5', 'https://x/7', 'https://x/9', 'https://y/1']
+    results = articles.keyword_search('vector search', limit=20, topic='Robots')
+    assert [hit['url'] for hit in results] == ['https://y/1']
+
+
+@pytest.fixture
+def backend(tmp_path):
+    index = NumpyBackend(str(tmp_path / 'vectors'), dim=4)
+    rng = np.random.default_rng(0)
+    ids, metadatas = [], []
+    for i in range(12):
+        for chunk in range(2):
+            ids.append(f"https://x/{i}#{chunk}")
+            metadatas.append({'url': f"https://x/{i}", 'source': 'wired' if i % 2 else 'hackernews',
+                              'topic': 'AI' if i < 8 else 'Robots', 'published_ts': 1000 + i, 'chunk_index': chunk})
+    index.upsert(ids, rng.normal(size=(len(ids), 4)).astype(np.float32), metadatas)
+    return index
+
+
+def result_urls(results):
+    return {meta['url'] for meta in results['metadatas'][0]}
+
+
+def test_numpy_backend_applies_where_before_top_k(backend):
+    query = np.ones((1, 4), dtype=np.float32)
+    results = backend.query(query, n_results=50, where=build_where(source='wired', topic='AI', since_ts=1003))
+    assert result_urls(results) == {'https://x/3', 'https://x/5', 'https://x/7'}
+    assert all(meta['published_ts'] >= 1003 for meta in results['metadatas'][0])
+
+    # Top-k is taken among the matches only, so a selective filter still fills k results
+    assert len(backend.query(query, n_results=4, where=build_where(topic='Robots'))['ids'][0]) == 4
+
+    results = backend.query(query, n_results=50, where=build_where(urls=['https://x/0', 'https://x/11']))
+    assert result_urls(results) == {'https://x/0', 'https://x/11'}
+    assert backend.query(query, n_results=5, where=build_where(urls=[]))['ids'] == [[]]
+
+
+def test_numpy_backend_where_matches_an_unfiltered_scan(backend):
+    query = np.random.default_rng(1).normal(size=(2, 4)).astype(np.float32)
+    where = build_where(source='hackernews')
+    filtered = backend.query(query, n_results=5, where=where)
+    everything = backend.query(query, n_results=backend.count())
+    for q in range(2):
+        expected = [i for i, meta in zip(everything['ids'][q], everything['metadatas'][q])
+                    if meta['source'] == 'hackernews'][:5]
+        assert filtered['ids'][q] == expected
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Reciprocal rank fusion of BM25 and dense rankings, and the FTS5 keyword side it fuses.
+"""
+
+import pytest
+
+from src.vector_store.hybrid import RRF_K, reciprocal_rank_fusion
+
+
+def hits(*urls):
+    return [{'url': url, 'title': url.upper(), 'source': 'wired'} for url in urls]
+
+
+def test_rrf_scores_are_summed_reciprocal_ranks():
+    fused = reciprocal_rank_fusion([hits('a', 'b', 'c'), hits('b', 'd')], limit=10)
+    scores = {hit['url']: hit['rrf'] for hit in fused}
+    assert scores['b'] == pytest.approx(1 / (RRF_K + 2) + 1 / (RRF_K + 1))
+    assert scores['a'] == pytest.approx(1 / (RRF_K + 1))
+    assert scores['d'] == pytest.approx(1 / (RRF_K + 2))
+    assert [hit['url'] for hit in fused] == ['b', 'a', 'd', 'c']
+    assert {hit['url']: hit['ranks'] for hit in fused}['d'] == [None, 2]
+
+
+def test_rrf_counts_a_url_once_per_ranking_and_applies_the_limit():
+    # Several chunks of one article can come back from the dense side: only the best rank counts
+    fused = reciprocal_rank_fusion([hits('a', 'a', 'b'), []], limit=1)
+    assert len(fused) == 1
+    assert fused[0]['url'] == 'a'
+    assert fused[0]['ranks'] == [1, None]
+    assert fused[0]['rrf'] == pytest.approx(1 / (RRF_K + 1))
+
+
+def test_rrf_keeps_the_first_title_and_source_seen():
+    fused = reciprocal_rank_fusion([[{'url': 'a', 'title': 'BM25 title', 'source': 'hn'}],
+                                    [{'url': 'a', 'title': 'dense title', 'source': 'hn', 'heading': 'Intro'}]])
+    assert fused[0]['title'] == 'BM25 title'
+    assert fused[0]['ranks'] == [1, 1]
+
+
+def test_keyword_search_ranks_title_matches_first(db):
+    if not db.fts_enabled:
+        pytest.skip("SQLite build without FTS5")
+    db.bulk_upsert_articles([
+        {'url': 'https://x/1', 'title': 'Vector databases compared', 'source': 'wired', 'published_ts': 100},
+        {'url': 'https://x/2', 'title': 'Weekly roundup', 'description': 'notes on vector databases',
+         'source': 'wired', 'published_ts': 100},
+        {'url': 'https://x/3', 'title': 'Unrelated', 'source': 'wired', 'published_ts': 100},
+    ], topic='AI')
+    results = db.keyword_search('vector databases')
+    assert [hit['url'] for hit in results] == ['https://x/1', 'https://x/2']
+    assert db.keyword_search('gpt-4o') == []
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+published_ts backfill for rows written before the column existed (legacy HN created_at was
+naive local time, everything else naive UTC), and the matching watermark conversion.
+"""
+
+import json
+import sqlite3
+import time
+
+import pytest
+
+from src.storage.db import DatabaseManager
+
+
+@pytest.fixture
+def new_york_tz(monkeypatch):
+    monkeypatch.setenv('TZ', 'America/New_York')
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+LEGACY_ARTICLES = [
+    # 07:00 local in New York (EST, UTC-5) is 12:00 UTC
+    {'url': 'https://hn/1', 'source': 'hackernews', 'created_at': '2024-01-15T07:00:00', 'points': 10,
+     'hn_url': 'https://news.ycombinator.com/item?id=1', 'topic': 'AI'},
+    {'url': 'https://arxiv/1', 'source': 'arxiv', 'published_date': '2024-01-15T07:00:00',
+     'arxiv_id': '2401.1', 'topic': 'AI'},
+    {'url': 'https://wired/1', 'source': 'wired', 'published_date': '2024-01-15T23:30:00', 'topic': 'AI'},
+    {'url': 'https://wired/undated', 'source': 'wired', 'topic': 'AI'},
+]
+
+
+def published(db):
+    with db._connect() as conn:
+        return {row['url']: (row['published_ts'], row['created_at'])
+                for row in conn.execute("SELECT url, published_ts, created_at FROM articles")}
+
+
+def test_backfill_reads_legacy_hn_times_as_local(legacy_db, new_york_tz):
+    path = legacy_db(LEGACY_ARTICLES)
+    db = DatabaseManager(path)
+    try:
+        rows = published(db)
+        assert rows['https://hn/1'] == (1705320000, '2024-01-15T12:00:00')  # rewritten as UTC
+        assert rows['https://arxiv/1'][0] == 1705302000  # already UTC
+        assert rows['https://wired/1'][0] == 1705361400
+        assert rows['https://wired/undated'][0] is None
+    finally:
+        db.close()
+
+    # Reopening does not shift the converted HN time again
+    db = DatabaseManager(path)
+    try:
+        assert published(db)['https://hn/1'] == (1705320000, '2024-01-15T12:00:00')
+    finally:
+        db.close()
+
+
+def test_backfill_rebuilds_the_rollup_by_utc_day(legacy_db, new_york_tz):
+    db = DatabaseManager(legacy_db(LEGACY_ARTICLES))
+    try:
+        series = {(row['topic'], row['day']): row['articles'] for row in db.daily_signal_series(start_day=-1)}
+        day = 1705320000 // 86400
+        assert series == {('AI', day): 3, ('AI', -1): 1}
+        assert db.aggregate_signals(topic='AI')['hn_points'] == 10
+    finally:
+        db.close()
+
+
+def test_new_rows_get_published_ts_at_upsert(db):
+    db.bulk_upsert_articles([
+        {'url': 'https://hn/2', 'source': 'hackernews', 'created_at': '2024-01-15T12:00:00', 'published_ts': 1705320000},
+        {'url': 'https://rss/2', 'source': 'wired', 'published_date': '2024-01-15T12:00:00+00:00'},
+        {'url': 'https://rss/3', 'source': 'wired', 'published_date': '2024-01-15T12:00:00'},
+    ])
+    assert {url: ts for url, (ts, _) in published(db).items()} == {
+        'https://hn/2': 1705320000, 'https://rss/2': 1705320000, 'https://rss/3': 1705320000,
+    }
+
+
+def test_legacy_watermarks_are_converted_to_utc(legacy_db, new_york_tz):
+    path = legacy_db(LEGACY_ARTICLES)
+    # Saved before ts_basis existed: the HN seen ID was timed by reading 12:00 UTC as local time
+    local_reading = 1705320000 + 5 * 3600
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.execute("CREATE TABLE source_watermarks (source TEXT, topic TEXT, last_ts INTEGER, seen_ids TEXT, "
+                     "updated_at TEXT, PRIMARY KEY(source, topic))")
+        conn.execute("INSERT INTO source_watermarks VALUES ('hackernews', 'AI', ?, ?, NULL)",
+                     (local_reading, json.dumps({'1': local_reading})))
+        conn.execute("INSERT INTO source_watermarks VALUES ('wired', 'AI', ?, '{}', NULL)", (local_reading,))
+    conn.close()
+
+    db = DatabaseManager(path)
+    try:
+        marks = db.get_watermarks('AI')
+        assert marks['hackernews'].seen_ids == {'1': 1705320000}  # re-timed from the stored article
+        assert marks['hackernews'].last_ts == 1705320000
+        assert marks['wired'].last_ts == local_reading - 5 * 3600  # never moved forward
+    finally:
+        db.close()
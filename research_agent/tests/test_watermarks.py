@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Watermark advance/skip semantics, including sources whose fetch failed or was partial.
+"""
+
+import time
+
+import pytest
+
+from src.scrapers import rss_scrapers
+from src.scrapers.rss_scrapers import RSSScrapers
+from src.storage.watermarks import Watermark, advance_watermarks, watermark_entry, watermarks_to_save
+
+
+def hn(story_id, ts):
+    return {'source': 'hackernews', 'story_id': story_id, 'published_ts': ts,
+            'url': f"https://example.com/{story_id}", 'title': story_id}
+
+
+def test_is_new_skips_seen_ids_and_older_items():
+    mark = Watermark(last_ts=100, seen_ids={'a': 100})
+    assert not mark.is_new('a', 100)
+    assert mark.is_new('b', 100)  # same second, different item
+    assert not mark.is_new('c', 99)
+    assert mark.is_new('', 150)
+
+
+def test_advanced_moves_forward_only_and_caps_seen_ids(monkeypatch):
+    monkeypatch.setattr(Watermark, 'MAX_SEEN_IDS', 3)
+    mark = Watermark(last_ts=50).advanced([('a', 10), ('b', 60), ('c', 70), ('d', 80)])
+    assert mark.last_ts == 80
+    assert set(mark.seen_ids) == {'b', 'c', 'd'}  # the newest ones are kept
+    assert Watermark(last_ts=50).advanced([('a', 10)]).last_ts == 50
+
+
+def test_watermark_entry_keys_per_feed():
+    assert watermark_entry(hn('1', 5)) == ('hackernews', '1', 5)
+    arxiv = {'source': 'arxiv', 'category': 'cs.AI', 'arxiv_id': '2401.1', 'published_date': '2024-01-02T00:00:00'}
+    assert watermark_entry(arxiv) == ('arxiv/cs.AI', '2401.1', 1704153600)
+    rss = {'source': 'wired', 'url': 'https://wired.com/x', 'published_date': '2024-01-02T00:00:00'}
+    assert watermark_entry(rss) == ('wired', 'https://wired.com/x', 1704153600)
+    assert watermark_entry({'source': 'wired', 'url': 'u'}) is None  # no timestamp
+
+
+def test_advance_watermarks_returns_only_moved_keys():
+    stored = {'hackernews': Watermark(100, {'1': 100}), 'wired': Watermark(500)}
+    moved = advance_watermarks(stored, [hn('1', 100), hn('2', 200)])
+    assert set(moved) == {'hackernews'}
+    assert moved['hackernews'].last_ts == 200
+    assert advance_watermarks(stored, [hn('1', 100)]) == {}
+
+
+def test_watermarks_to_save_holds_back_incomplete_sources():
+    stored = {'hackernews': Watermark(100), 'wired': Watermark(100), 'techcrunch': Watermark(100)}
+    pending = dict(stored, hackernews=Watermark(200), wired=Watermark(300), **{'arxiv/cs.AI': Watermark(400)})
+    save, held = watermarks_to_save(stored, pending, incomplete={'hackernews', 'techcrunch'})
+    assert set(save) == {'wired', 'arxiv/cs.AI'}
+    assert set(held) == {'hackernews'}  # techcrunch did not move, so there is nothing to hold
+
+
+def test_save_watermarks_round_trip_and_never_moves_back(db):
+    db.save_watermarks('AI', {'hackernews': Watermark(200, {'1': 200})})
+    db.save_watermarks('AI', {'hackernews': Watermark(150, {'0': 150})})
+    assert db.get_watermarks('AI')['hackernews'].last_ts == 200
+    assert db.get_watermarks('other') == {}
+
+
+def test_failed_rss_feed_is_reported_incomplete(monkeypatch):
+    monkeypatch.setattr(rss_scrapers.time, 'sleep', lambda seconds: None)
+
+    class FlakyRSS(RSSScrapers):
+        def parse_rss_feed(self, source_name, rss_url, topic, days=7, watermark=None):
+            if source_name == 'wired':
+                raise IOError("connection reset")
+            return [{'source': source_name, 'url': f"https://{source_name}/1", 'published_ts': int(time.time())}]
+
+    incomplete = set()
+    articles = FlakyRSS().parse_rss_feeds('ai', incomplete_sources=incomplete)
+    assert incomplete == {'wired'}
+    pending = advance_watermarks({}, articles)
+    save, held = watermarks_to_save({}, pending, incomplete)
+    assert set(save) == {'techcrunch', 'mit_tech_review'}
+    assert held == {}
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.data
+
+
+class FakeAlgolia:
+    """
+    search_by_date stand-in: two pages per time slice; page 1 fails when `fail_page` is set
+    """
+
+    def __init__(self, fail_page=False):
+        self.fail_page = fail_page
+        self.endpoints = set()
+
+    def get(self, url, params=None, timeout=None):
+        self.endpoints.add(url.rsplit('/', 1)[-1])
+        lo = int(params['numericFilters'].split(',')[0].split('>=')[1])
+        page = params.get('page', 0)
+        if self.fail_page and page == 1:
+            raise IOError("HTTP 502")
+        hit = {'objectID': f"{lo}-{page}", 'title': 't', 'url': f"https://example.com/{lo}/{page}",
+               'created_at_i': lo + 1}
+        return FakeResponse({'nbHits': 2, 'nbPages': 2, 'hits': [hit]})
+
+
+@pytest.fixture
+def hn_scraper():
+    api_scrapers = pytest.importorskip("src.scrapers.api_scrapers")
+    scraper = api_scrapers.APIScrapers.__new__(api_scrapers.APIScrapers)
+    scraper.timeout = 1
+    return scraper
+
+
+def test_incremental_hn_pages_by_date_from_the_watermark(hn_scraper):
+    hn_scraper.session = FakeAlgolia()
+    incomplete = set()
+    since = int(time.time()) - 30 * 3600
+    articles = hn_scraper.fetch_hackernews('ai', days=7, watermark=Watermark(since), incomplete_sources=incomplete)
+    assert hn_scraper.session.endpoints == {'search_by_date'}
+    assert len(articles) == 4  # two 24h slices x two pages
+    assert min(a['published_ts'] for a in articles) > since
+    assert incomplete == set()
+
+
+def test_failed_hn_pages_hold_the_watermark(hn_scraper):
+    hn_scraper.session = FakeAlgolia(fail_page=True)
+    incomplete = set()
+    since = int(time.time()) - 30 * 3600
+    articles = hn_scraper.fetch_hackernews('ai', watermark=Watermark(since), incomplete_sources=incomplete)
+    assert articles and incomplete == {'hackernews'}
+
+    incomplete = set()
+    batches = list(hn_scraper.iter_hackernews_backfill('ai', days=1, incomplete_sources=incomplete))
+    assert batches and incomplete == {'hackernews'}